@@ -10,7 +10,14 @@ from app.core.config import settings
 from db.database import Base
 
 # Import all models so Alembic can see them
-from app.models import Todo, Priority, User, Status  # noqa: F401
+from app.models import (  # noqa: F401
+    Todo,
+    Priority,
+    User,
+    Status,
+    UserCounter,
+    TodoTombstone,
+)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,176 @@
+"""Add user counters
+
+Keeps per-user counts of todos (total, completed, per status and per
+priority), priorities and statuses in user_counters. Statement-level
+triggers with transition tables apply one grouped delta per statement, so
+bulk imports and bulk updates cost one upsert per touched counter instead
+of one per row.
+
+Revision ID: 2c75de78683a
+Revises: d733a60ca089
+Create Date: 2026-10-19 09:59:53.534962
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c75de78683a'
+down_revision: Union[str, Sequence[str], None] = 'd733a60ca089'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Counter deltas contributed by one todo row; {rows} is a transition table
+TODO_DELTAS = """
+    SELECT user_key, 'todos' AS kind, '' AS ref, {sign} AS delta FROM {rows}
+    UNION ALL
+    SELECT user_key, 'completed', '', {sign} FROM {rows} WHERE completed
+    UNION ALL
+    SELECT user_key, 'status', status, {sign} FROM {rows} WHERE status IS NOT NULL
+    UNION ALL
+    SELECT user_key, 'priority', priority, {sign} FROM {rows}
+"""
+
+APPLY_DELTAS = """
+    INSERT INTO user_counters AS c (user_key, kind, ref, count)
+    SELECT user_key, kind, ref, SUM(delta)
+    FROM ({deltas}) d
+    -- Skip users deleted in the same statement (they have no counters left)
+    WHERE EXISTS (SELECT 1 FROM users u WHERE u.key = d.user_key)
+    GROUP BY user_key, kind, ref
+    HAVING SUM(delta) <> 0
+    ON CONFLICT (user_key, kind, ref) DO UPDATE SET count = c.count + EXCLUDED.count
+"""
+
+
+def _todo_counter_function() -> str:
+    inserted = APPLY_DELTAS.format(deltas=TODO_DELTAS.format(sign=1, rows="new_rows"))
+    deleted = APPLY_DELTAS.format(deltas=TODO_DELTAS.format(sign=-1, rows="old_rows"))
+    updated = APPLY_DELTAS.format(
+        deltas=TODO_DELTAS.format(sign=1, rows="new_rows")
+        + " UNION ALL "
+        + TODO_DELTAS.format(sign=-1, rows="old_rows")
+    )
+    return f"""
+        CREATE FUNCTION todos_update_counters() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {inserted};
+            ELSIF TG_OP = 'DELETE' THEN
+                {deleted};
+            ELSE
+                {updated};
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+
+def _lookup_counter_function(table: str, kind: str) -> str:
+    def deltas(sign, rows):
+        return f"SELECT user_key, '{kind}' AS kind, '' AS ref, {sign} AS delta FROM {rows}"
+
+    return f"""
+        CREATE FUNCTION {table}_update_counters() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {APPLY_DELTAS.format(deltas=deltas(1, "new_rows"))};
+            ELSE
+                {APPLY_DELTAS.format(deltas=deltas(-1, "old_rows"))};
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+
+def _create_statement_triggers(table: str, events: Sequence[str]):
+    for event in events:
+        referencing = {
+            "INSERT": "NEW TABLE AS new_rows",
+            "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+            "DELETE": "OLD TABLE AS old_rows",
+        }[event]
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_counters_{event.lower()}
+            AFTER {event} ON {table}
+            REFERENCING {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION {table}_update_counters()
+            """
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "user_counters",
+        sa.Column("user_key", sa.String(length=36), nullable=False),
+        sa.Column("kind", sa.String(length=16), nullable=False),
+        sa.Column("ref", sa.String(length=36), nullable=False, server_default=""),
+        sa.Column("count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["user_key"], ["users.key"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_key", "kind", "ref"),
+    )
+
+    op.execute(_todo_counter_function())
+    _create_statement_triggers("todos", ["INSERT", "UPDATE", "DELETE"])
+    op.execute(_lookup_counter_function("priorities", "priorities"))
+    _create_statement_triggers("priorities", ["INSERT", "DELETE"])
+    op.execute(_lookup_counter_function("statuses", "statuses"))
+    _create_statement_triggers("statuses", ["INSERT", "DELETE"])
+
+    # TRUNCATE fires no DELETE triggers; drop the affected counters instead
+    op.execute(
+        """
+        CREATE FUNCTION user_counters_truncate() RETURNS trigger AS $$
+        BEGIN
+            IF TG_TABLE_NAME = 'todos' THEN
+                DELETE FROM user_counters
+                WHERE kind IN ('todos', 'completed', 'status', 'priority');
+            ELSE
+                DELETE FROM user_counters WHERE kind = TG_TABLE_NAME;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in ("todos", "priorities", "statuses"):
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_counters_truncate
+            AFTER TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION user_counters_truncate()
+            """
+        )
+
+    # Backfill from the current rows
+    op.execute(
+        APPLY_DELTAS.format(
+            deltas=TODO_DELTAS.format(sign=1, rows="todos")
+            + " UNION ALL SELECT user_key, 'priorities', '', 1 FROM priorities"
+            + " UNION ALL SELECT user_key, 'statuses', '', 1 FROM statuses"
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("todos", "priorities", "statuses"):
+        op.execute(f"DROP TRIGGER trg_{table}_counters_truncate ON {table}")
+    op.execute("DROP FUNCTION user_counters_truncate()")
+    for table, events in (
+        ("statuses", ["insert", "delete"]),
+        ("priorities", ["insert", "delete"]),
+        ("todos", ["insert", "update", "delete"]),
+    ):
+        for event in events:
+            op.execute(f"DROP TRIGGER trg_{table}_counters_{event} ON {table}")
+        op.execute(f"DROP FUNCTION {table}_update_counters()")
+    op.drop_table("user_counters")
@@ -0,0 +1,113 @@
+"""Add open todo counters
+
+Counts the open todos per status and per priority in user_counters next to
+the totals, so listings can show both without aggregating todos. The todos
+counter function is replaced with one that also emits 'status_open' and
+'priority_open' deltas; completing or reopening a todo moves it between them
+through the UPDATE trigger like any other change.
+
+Revision ID: 3e8b41c7d2a9
+Revises: 5c5f8e7ad0f6
+Create Date: 2026-10-19 11:12:40.318207
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3e8b41c7d2a9"
+down_revision: Union[str, Sequence[str], None] = "5c5f8e7ad0f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Counter deltas contributed by one todo row; {rows} is a transition table
+TODO_DELTAS = """
+    SELECT user_key, 'todos' AS kind, '' AS ref, {sign} AS delta FROM {rows}
+    UNION ALL
+    SELECT user_key, 'completed', '', {sign} FROM {rows} WHERE completed
+    UNION ALL
+    SELECT user_key, 'status', status, {sign} FROM {rows} WHERE status IS NOT NULL
+    UNION ALL
+    SELECT user_key, 'priority', priority, {sign} FROM {rows}
+"""
+
+OPEN_DELTAS = """
+    SELECT user_key, 'status_open' AS kind, status AS ref, {sign} AS delta FROM {rows}
+    WHERE status IS NOT NULL AND NOT completed
+    UNION ALL
+    SELECT user_key, 'priority_open', priority, {sign} FROM {rows} WHERE NOT completed
+"""
+
+APPLY_DELTAS = """
+    INSERT INTO user_counters AS c (user_key, kind, ref, count)
+    SELECT user_key, kind, ref, SUM(delta)
+    FROM ({deltas}) d
+    -- Skip users deleted in the same statement (they have no counters left)
+    WHERE EXISTS (SELECT 1 FROM users u WHERE u.key = d.user_key)
+    GROUP BY user_key, kind, ref
+    HAVING SUM(delta) <> 0
+    ON CONFLICT (user_key, kind, ref) DO UPDATE SET count = c.count + EXCLUDED.count
+"""
+
+TODO_KINDS = ["todos", "completed", "status", "priority"]
+OPEN_KINDS = ["status_open", "priority_open"]
+
+
+def _todo_counter_function(deltas: str) -> str:
+    def rows(sign, name):
+        return deltas.format(sign=sign, rows=name)
+
+    inserted = APPLY_DELTAS.format(deltas=rows(1, "new_rows"))
+    deleted = APPLY_DELTAS.format(deltas=rows(-1, "old_rows"))
+    updated = APPLY_DELTAS.format(
+        deltas=rows(1, "new_rows") + " UNION ALL " + rows(-1, "old_rows")
+    )
+    return f"""
+        CREATE OR REPLACE FUNCTION todos_update_counters() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                {inserted};
+            ELSIF TG_OP = 'DELETE' THEN
+                {deleted};
+            ELSE
+                {updated};
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+
+def _truncate_function(todo_kinds: list[str]) -> str:
+    kinds = ", ".join(f"'{kind}'" for kind in todo_kinds)
+    return f"""
+        CREATE OR REPLACE FUNCTION user_counters_truncate() RETURNS trigger AS $$
+        BEGIN
+            IF TG_TABLE_NAME = 'todos' THEN
+                DELETE FROM user_counters WHERE kind IN ({kinds});
+            ELSE
+                DELETE FROM user_counters WHERE kind = TG_TABLE_NAME;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(_todo_counter_function(TODO_DELTAS + " UNION ALL " + OPEN_DELTAS))
+    op.execute(_truncate_function(TODO_KINDS + OPEN_KINDS))
+    # Backfill from the current rows
+    op.execute(APPLY_DELTAS.format(deltas=OPEN_DELTAS.format(sign=1, rows="todos")))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(_todo_counter_function(TODO_DELTAS))
+    op.execute(_truncate_function(TODO_KINDS))
+    op.execute("DELETE FROM user_counters WHERE kind IN ('status_open', 'priority_open')")
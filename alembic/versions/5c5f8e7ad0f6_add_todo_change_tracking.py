@@ -0,0 +1,161 @@
+"""Add todo change tracking
+
+Every insert or update of a todo takes the next value of todo_change_seq,
+and every delete leaves a tombstone in todo_tombstones with its own sequence
+value, so clients can ask for everything that changed after a sequence value.
+The trigger takes a per-user transaction lock before drawing the value, so a
+user's changes commit in sequence order and a client never skips a change
+that committed late.
+
+Raw asyncpg UPDATEs never fired SQLAlchemy's onupdate, so updated_at is now
+set by triggers on todos, priorities, statuses and users.
+
+Revision ID: 5c5f8e7ad0f6
+Revises: b1ec01cabfb9
+Create Date: 2026-10-19 10:06:32.447860
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c5f8e7ad0f6"
+down_revision: Union[str, Sequence[str], None] = "b1ec01cabfb9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Tables whose updated_at is only maintained by set_updated_at()
+UPDATED_AT_TABLES = ["priorities", "statuses", "users"]
+
+# Serializes the changes of one user until commit
+CHANGE_LOCK = "pg_advisory_xact_lock(hashtext('todo_changes'), hashtext({user_key}))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE SEQUENCE todo_change_seq AS bigint")
+    # A volatile default fills existing rows in id order without firing triggers
+    op.add_column(
+        "todos",
+        sa.Column(
+            "change_seq",
+            sa.BigInteger(),
+            server_default=sa.text("nextval('todo_change_seq')"),
+            nullable=False,
+        ),
+    )
+    op.alter_column("todos", "change_seq", server_default=None)
+    op.create_index("ix_todo_user_change_seq", "todos", ["user_key", "change_seq"])
+
+    op.create_table(
+        "todo_tombstones",
+        sa.Column("key", sa.String(length=36), nullable=False),
+        sa.Column("user_key", sa.String(length=36), nullable=False),
+        sa.Column("change_seq", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_key"], ["users.key"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index(
+        "ix_todo_tombstone_user_change_seq",
+        "todo_tombstones",
+        ["user_key", "change_seq"],
+    )
+
+    op.execute(
+        f"""
+        CREATE FUNCTION todos_track_changes() RETURNS trigger AS $$
+        BEGIN
+            PERFORM {CHANGE_LOCK.format(user_key="NEW.user_key")};
+            NEW.change_seq := nextval('todo_change_seq');
+            IF TG_OP = 'UPDATE' THEN
+                NEW.updated_at := now();
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Only columns clients see; sort key syncs don't count as changes
+    op.execute(
+        """
+        CREATE TRIGGER trg_todos_track_changes
+        BEFORE INSERT OR UPDATE OF title, description, completed, priority, status
+        ON todos
+        FOR EACH ROW EXECUTE FUNCTION todos_track_changes()
+        """
+    )
+
+    # Users that are being deleted take their tombstones with them
+    op.execute(
+        f"""
+        CREATE FUNCTION todos_record_tombstones() RETURNS trigger AS $$
+        BEGIN
+            PERFORM {CHANGE_LOCK.format(user_key="u.user_key")}
+            FROM (SELECT DISTINCT user_key FROM deleted_rows ORDER BY user_key) u;
+            INSERT INTO todo_tombstones (key, user_key, change_seq)
+            SELECT d.key, d.user_key, nextval('todo_change_seq')
+            FROM deleted_rows d
+            WHERE EXISTS (SELECT 1 FROM users u WHERE u.key = d.user_key)
+            ON CONFLICT (key) DO UPDATE
+            SET user_key = EXCLUDED.user_key,
+                change_seq = EXCLUDED.change_seq,
+                deleted_at = EXCLUDED.deleted_at;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_todos_record_tombstones
+        AFTER DELETE ON todos
+        REFERENCING OLD TABLE AS deleted_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION todos_record_tombstones()
+        """
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at := now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in UPDATED_AT_TABLES:
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_set_updated_at
+            BEFORE UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION set_updated_at()
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in UPDATED_AT_TABLES:
+        op.execute(f"DROP TRIGGER trg_{table}_set_updated_at ON {table}")
+    op.execute("DROP FUNCTION set_updated_at()")
+    op.execute("DROP TRIGGER trg_todos_record_tombstones ON todos")
+    op.execute("DROP FUNCTION todos_record_tombstones()")
+    op.execute("DROP TRIGGER trg_todos_track_changes ON todos")
+    op.execute("DROP FUNCTION todos_track_changes()")
+    op.drop_index("ix_todo_tombstone_user_change_seq", table_name="todo_tombstones")
+    op.drop_table("todo_tombstones")
+    op.drop_index("ix_todo_user_change_seq", table_name="todos")
+    op.drop_column("todos", "change_seq")
+    op.execute("DROP SEQUENCE todo_change_seq")
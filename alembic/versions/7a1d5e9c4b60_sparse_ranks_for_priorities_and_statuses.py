@@ -0,0 +1,150 @@
+"""Sparse ranks for priorities and statuses
+
+Replaces the dense "order" column of priorities and statuses with a sparse
+bigint rank. The API still exposes a dense order, computed from the rank
+(see app/utils/ordering.py), but moving a row now takes a rank between its
+new neighbours and writes only that row, instead of renumbering every row
+of the user and, through the sort key triggers, all of their todos.
+
+The (user_key, rank) unique constraints are deferrable so the occasional
+respacing of a user's ranks can let them pass each other. The todo sort
+key copies hold ranks now and become bigint too.
+
+Revision ID: 7a1d5e9c4b60
+Revises: 3e8b41c7d2a9
+Create Date: 2026-10-19 11:48:05.902114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7a1d5e9c4b60"
+down_revision: Union[str, Sequence[str], None] = "3e8b41c7d2a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+RANK_GAP = 1 << 16
+
+# Table, todos column, rank constraint
+RANKED_TABLES = [
+    ("priorities", "priority", "uq_priority_user_rank"),
+    ("statuses", "status", "uq_status_user_rank"),
+]
+
+
+def _sort_key_functions(column: str) -> list[str]:
+    """The d733a60ca089 sort key functions, copying column instead of "order"."""
+    functions = [
+        f"""
+        CREATE OR REPLACE FUNCTION todos_set_sort_keys() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' OR NEW.priority IS DISTINCT FROM OLD.priority THEN
+                SELECT p."{column}" INTO NEW.priority_order
+                FROM priorities p
+                WHERE p.key = NEW.priority;
+            END IF;
+            IF TG_OP = 'INSERT' OR NEW.status IS DISTINCT FROM OLD.status THEN
+                SELECT s."{column}" INTO NEW.status_order
+                FROM statuses s
+                WHERE s.key = NEW.status;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    ]
+    for table, todo_column, _ in RANKED_TABLES:
+        functions.append(
+            f"""
+            CREATE OR REPLACE FUNCTION {table}_sync_todo_order() RETURNS trigger AS $$
+            BEGIN
+                UPDATE todos
+                SET {todo_column}_order = NEW."{column}"
+                WHERE user_key = NEW.user_key
+                AND {todo_column} = NEW.key;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+    return functions
+
+
+def _sync_trigger(table: str, column: str) -> str:
+    return f"""
+        CREATE TRIGGER trg_{table}_sync_todo_order
+        AFTER UPDATE OF "{column}" ON {table}
+        FOR EACH ROW
+        WHEN (OLD."{column}" IS DISTINCT FROM NEW."{column}")
+        EXECUTE FUNCTION {table}_sync_todo_order()
+    """
+
+
+def _change_order_column(table: str, old: str, new: str, type_) -> None:
+    # A column in a trigger definition can't change type, so the trigger goes
+    op.execute(f"DROP TRIGGER trg_{table}_sync_todo_order ON {table}")
+    op.alter_column(
+        table,
+        old,
+        new_column_name=new,
+        type_=type_,
+        existing_nullable=False,
+    )
+    op.execute(_sync_trigger(table, new))
+
+
+def _renumber(table: str, column: str, step: int):
+    op.execute(
+        f"""
+        UPDATE {table} t
+        SET "{column}" = r.position * {step}
+        FROM (
+            SELECT id, ROW_NUMBER() OVER (PARTITION BY user_key ORDER BY "{column}", id)
+                AS position
+            FROM {table}
+        ) r
+        WHERE t.id = r.id
+        """
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for _, todo_column, _ in RANKED_TABLES:
+        op.alter_column("todos", f"{todo_column}_order", type_=sa.BigInteger())
+    op.drop_constraint("uq_priority_user_order", "priorities", type_="unique")
+    for table, _, _ in RANKED_TABLES:
+        _change_order_column(table, "order", "rank", sa.BigInteger())
+    for function in _sort_key_functions("rank"):
+        op.execute(function)
+    for table, _, constraint in RANKED_TABLES:
+        # Statuses had no unique order, so ties are broken by id
+        _renumber(table, "rank", RANK_GAP)
+        op.create_unique_constraint(
+            constraint,
+            table,
+            ["user_key", "rank"],
+            deferrable=True,
+            initially="IMMEDIATE",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, _, constraint in RANKED_TABLES:
+        op.drop_constraint(constraint, table, type_="unique")
+        _renumber(table, "rank", 1)
+        _change_order_column(table, "rank", "order", sa.Integer())
+    for function in _sort_key_functions("order"):
+        op.execute(function)
+    op.create_unique_constraint(
+        "uq_priority_user_order", "priorities", ["user_key", "order"]
+    )
+    for _, todo_column, _ in RANKED_TABLES:
+        op.alter_column("todos", f"{todo_column}_order", type_=sa.Integer())
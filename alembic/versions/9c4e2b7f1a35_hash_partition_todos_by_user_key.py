@@ -0,0 +1,327 @@
+"""Hash partition todos by user_key
+
+Every todo query filters on user_key, so todos becomes a table partitioned by
+HASH (user_key) and each query only touches the partition of its user. The
+indexes stay the same per partition, minus ix_todos_id and ix_todo_user_id,
+which the (user_key, id) primary key now covers. Unique constraints have to
+include the partition key, so key is unique per user; keys are server-side
+UUIDs, which keeps them unique overall.
+
+The rows move while the old table stays in use:
+
+1. todos_new is created with its partitions, keys and foreign keys.
+2. A row trigger on todos mirrors every write into todos_new.
+3. The rows are copied in batches of COPY_BATCH_SIZE, each in its own
+   transaction; rows the mirror already wrote are skipped.
+4. The secondary indexes are built one partition at a time, concurrently,
+   and attached to the partitioned index.
+5. todos is locked, rows a batch copied after their delete are removed again
+   (found through todo_tombstones), the old table is dropped and todos_new
+   takes its name, constraint and index names and triggers.
+
+Only the last step locks todos, and it does no work proportional to the
+table. The downgrade moves the rows back the same way.
+
+Revision ID: 9c4e2b7f1a35
+Revises: 7a1d5e9c4b60
+Create Date: 2026-10-19 14:06:31.550184
+
+"""
+
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c4e2b7f1a35"
+down_revision: Union[str, Sequence[str], None] = "7a1d5e9c4b60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITIONS = 16
+COPY_BATCH_SIZE = 5000
+DEADLOCK_DETECTED = "40P01"
+
+COLUMNS = [
+    "id",
+    "key",
+    "title",
+    "description",
+    "completed",
+    "priority",
+    "created_at",
+    "updated_at",
+    "user_key",
+    "status",
+    "priority_order",
+    "status_order",
+    "change_seq",
+]
+
+# Primary key and unique constraint, by layout
+PARTITIONED_KEYS = {
+    "pk_todos": "PRIMARY KEY (user_key, id)",
+    "uq_todos_user_key_key": "UNIQUE (user_key, key)",
+}
+UNPARTITIONED_KEYS = {
+    "pk_todos": "PRIMARY KEY (id)",
+    "uq_todos_key": "UNIQUE (key)",
+}
+
+FOREIGN_KEYS = {
+    "fk_todos_priority_priorities": "FOREIGN KEY (priority) REFERENCES priorities(key)",
+    "fk_todos_user_key_users": "FOREIGN KEY (user_key) REFERENCES users(key)",
+}
+
+# Secondary indexes of both layouts
+INDEXES = {
+    "ix_todo_user_key_status": "user_key, status",
+    "ix_todo_user_title": "user_key, title, id DESC",
+    "ix_todo_user_title_desc": "user_key, title DESC, id DESC",
+    "ix_todo_user_change_seq": "user_key, change_seq",
+    "ix_todo_user_priority_order_title": "user_key, priority_order, title",
+    "ix_todo_user_completed_priority_order": "user_key, completed, priority_order, id DESC",
+    "ix_todo_user_priority_order": "user_key, priority_order, id DESC",
+    "ix_todo_user_priority_status_order": "user_key, priority_order, status_order, id DESC",
+    "ix_todo_user_status_order": "user_key, status_order, id DESC",
+    "ix_todo_user_status_order_desc": "user_key, status_order DESC, id DESC",
+    "ix_todo_user_completed_status_order": "user_key, completed, status_order, id DESC",
+}
+# Covered by the primary key of the partitioned table
+UNPARTITIONED_INDEXES = {
+    "ix_todos_id": "id",
+    "ix_todo_user_id": "user_key, id",
+}
+
+TRIGGERS = [
+    """
+    CREATE TRIGGER trg_todos_set_sort_keys
+    BEFORE INSERT OR UPDATE OF priority, status ON todos
+    FOR EACH ROW EXECUTE FUNCTION todos_set_sort_keys()
+    """,
+    """
+    CREATE TRIGGER trg_todos_track_changes
+    BEFORE INSERT OR UPDATE OF title, description, completed, priority, status ON todos
+    FOR EACH ROW EXECUTE FUNCTION todos_track_changes()
+    """,
+    """
+    CREATE TRIGGER trg_todos_counters_insert
+    AFTER INSERT ON todos
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION todos_update_counters()
+    """,
+    """
+    CREATE TRIGGER trg_todos_counters_update
+    AFTER UPDATE ON todos
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION todos_update_counters()
+    """,
+    """
+    CREATE TRIGGER trg_todos_counters_delete
+    AFTER DELETE ON todos
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION todos_update_counters()
+    """,
+    """
+    CREATE TRIGGER trg_todos_counters_truncate
+    AFTER TRUNCATE ON todos
+    FOR EACH STATEMENT EXECUTE FUNCTION user_counters_truncate()
+    """,
+    """
+    CREATE TRIGGER trg_todos_notify_insert
+    AFTER INSERT ON todos
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION todos_notify_changes('created')
+    """,
+    """
+    CREATE TRIGGER trg_todos_notify_update
+    AFTER UPDATE ON todos
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION todos_notify_changes('updated')
+    """,
+    """
+    CREATE TRIGGER trg_todos_notify_delete
+    AFTER DELETE ON todos
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION todos_notify_changes('deleted')
+    """,
+    """
+    CREATE TRIGGER trg_todos_record_tombstones
+    AFTER DELETE ON todos
+    REFERENCING OLD TABLE AS deleted_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION todos_record_tombstones()
+    """,
+]
+
+
+def _conflict_columns(partitioned: bool) -> str:
+    return "user_key, id" if partitioned else "id"
+
+
+def _keys(partitioned: bool) -> dict[str, str]:
+    return PARTITIONED_KEYS if partitioned else UNPARTITIONED_KEYS
+
+
+def _indexes(partitioned: bool) -> dict[str, str]:
+    return INDEXES if partitioned else {**INDEXES, **UNPARTITIONED_INDEXES}
+
+
+def _drop_leftovers() -> None:
+    """Remove what an interrupted run left behind, so the move can start over."""
+    op.execute("DROP TRIGGER IF EXISTS trg_todos_mirror_writes ON todos")
+    op.execute("DROP FUNCTION IF EXISTS todos_mirror_writes()")
+    op.execute("DROP TABLE IF EXISTS todos_new")
+
+
+def _create_table(partitioned: bool) -> None:
+    partition_by = " PARTITION BY HASH (user_key)" if partitioned else ""
+    op.execute(
+        f"CREATE TABLE todos_new (LIKE todos INCLUDING DEFAULTS){partition_by}"
+    )
+    if partitioned:
+        for remainder in range(PARTITIONS):
+            op.execute(
+                f"""
+                CREATE TABLE todos_p{remainder:02d} PARTITION OF todos_new
+                FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})
+                """
+            )
+    # Index names are schema-wide, so these get their names at the swap
+    for name, definition in _keys(partitioned).items():
+        op.execute(f"ALTER TABLE todos_new ADD CONSTRAINT {name}_new {definition}")
+    for name, definition in FOREIGN_KEYS.items():
+        op.execute(f"ALTER TABLE todos_new ADD CONSTRAINT {name} {definition}")
+
+
+def _mirror_writes(partitioned: bool) -> None:
+    updates = ", ".join(
+        f"{column} = EXCLUDED.{column}"
+        for column in COLUMNS
+        if column not in ("id", "user_key")
+    )
+    op.execute(
+        f"""
+        CREATE FUNCTION todos_mirror_writes() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                DELETE FROM todos_new WHERE user_key = OLD.user_key AND id = OLD.id;
+            ELSE
+                INSERT INTO todos_new SELECT NEW.*
+                ON CONFLICT ({_conflict_columns(partitioned)}) DO UPDATE SET {updates};
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_todos_mirror_writes
+        AFTER INSERT OR UPDATE OR DELETE ON todos
+        FOR EACH ROW EXECUTE FUNCTION todos_mirror_writes()
+        """
+    )
+
+
+def _copy_batch(partitioned: bool, last_id: int) -> Optional[int]:
+    """Copy the rows after last_id and return the last id copied."""
+    return (
+        op.get_bind()
+        .execute(
+            sa.text(
+                f"""
+                WITH batch AS (
+                    SELECT * FROM todos WHERE id > :last_id ORDER BY id LIMIT :size
+                ), copied AS (
+                    INSERT INTO todos_new SELECT * FROM batch
+                    ON CONFLICT ({_conflict_columns(partitioned)}) DO NOTHING
+                )
+                SELECT MAX(id) FROM batch
+                """
+            ),
+            {"last_id": last_id, "size": COPY_BATCH_SIZE},
+        )
+        .scalar()
+    )
+
+
+def _copy_rows(partitioned: bool) -> None:
+    last_id = 0
+    while last_id is not None:
+        try:
+            last_id = _copy_batch(partitioned, last_id)
+        except sa.exc.OperationalError as e:
+            # The batch's foreign key checks can deadlock with writes to
+            # priorities; a batch is safe to run again
+            if getattr(e.orig, "pgcode", None) != DEADLOCK_DETECTED:
+                raise
+
+
+def _create_indexes(partitioned: bool) -> None:
+    for name, columns in _indexes(partitioned).items():
+        if not partitioned:
+            op.execute(f"CREATE INDEX CONCURRENTLY {name}_new ON todos_new ({columns})")
+            continue
+        op.execute(f"CREATE INDEX {name}_new ON ONLY todos_new ({columns})")
+        for remainder in range(PARTITIONS):
+            partition = f"{name}_p{remainder:02d}"
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY {partition}"
+                f" ON todos_p{remainder:02d} ({columns})"
+            )
+            op.execute(f"ALTER INDEX {name}_new ATTACH PARTITION {partition}")
+
+
+def _swap(partitioned: bool, copy_started: int) -> None:
+    op.execute("LOCK TABLE todos IN ACCESS EXCLUSIVE MODE")
+    # A batch can read a row before its delete and write it after the mirror
+    # found nothing to delete; every such delete left a tombstone
+    op.execute(
+        f"""
+        DELETE FROM todos_new n
+        USING todo_tombstones d
+        WHERE d.change_seq >= {copy_started}
+        AND n.user_key = d.user_key
+        AND n.key = d.key
+        AND NOT EXISTS (
+            SELECT 1 FROM todos t WHERE t.user_key = n.user_key AND t.id = n.id
+        )
+        """
+    )
+    op.execute("ALTER SEQUENCE todos_id_seq OWNED BY todos_new.id")
+    op.execute("DROP TABLE todos")
+    op.execute("DROP FUNCTION todos_mirror_writes()")
+    op.execute("ALTER TABLE todos_new RENAME TO todos")
+    for name in _keys(partitioned):
+        op.execute(f"ALTER TABLE todos RENAME CONSTRAINT {name}_new TO {name}")
+    for name in _indexes(partitioned):
+        op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+    op.execute("ANALYZE todos")
+
+
+def _move_rows(partitioned: bool) -> None:
+    _drop_leftovers()
+    _create_table(partitioned)
+    with op.get_context().autocommit_block():
+        copy_started = op.get_bind().execute(
+            sa.text("SELECT last_value FROM todo_change_seq")
+        ).scalar()
+        _mirror_writes(partitioned)
+        _copy_rows(partitioned)
+        _create_indexes(partitioned)
+    _swap(partitioned, copy_started)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _move_rows(partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _move_rows(partitioned=False)
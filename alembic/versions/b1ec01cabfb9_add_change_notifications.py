@@ -0,0 +1,78 @@
+"""Add change notifications
+
+Statement-level triggers on todos, priorities and statuses send one NOTIFY on
+the app_events channel per user and statement, carrying the changed keys
+(or null when a statement touched more than 100 rows of that user).
+
+Revision ID: b1ec01cabfb9
+Revises: 2c75de78683a
+Create Date: 2026-10-19 10:06:10.716466
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b1ec01cabfb9"
+down_revision: Union[str, Sequence[str], None] = "2c75de78683a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, event type sent to clients)
+TABLES = [("todos", "todo"), ("priorities", "priority"), ("statuses", "status")]
+ACTIONS = {"INSERT": "created", "UPDATE": "updated", "DELETE": "deleted"}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, event_type in TABLES:
+        op.execute(
+            f"""
+            CREATE FUNCTION {table}_notify_changes() RETURNS trigger AS $$
+            DECLARE
+                changed record;
+            BEGIN
+                FOR changed IN
+                    SELECT user_key, array_agg(key) AS keys
+                    FROM changed_rows
+                    GROUP BY user_key
+                LOOP
+                    PERFORM pg_notify(
+                        'app_events',
+                        json_build_object(
+                            'user_key', changed.user_key,
+                            'type', '{event_type}',
+                            'action', TG_ARGV[0],
+                            -- NOTIFY payloads are limited to 8000 bytes
+                            'keys', CASE WHEN cardinality(changed.keys) <= 100
+                                    THEN to_json(changed.keys) END
+                        )::text
+                    );
+                END LOOP;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+        for event, action in ACTIONS.items():
+            rows = "OLD" if event == "DELETE" else "NEW"
+            op.execute(
+                f"""
+                CREATE TRIGGER trg_{table}_notify_{event.lower()}
+                AFTER {event} ON {table}
+                REFERENCING {rows} TABLE AS changed_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION {table}_notify_changes('{action}')
+                """
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, _ in reversed(TABLES):
+        for event in ACTIONS:
+            op.execute(f"DROP TRIGGER trg_{table}_notify_{event.lower()} ON {table}")
+        op.execute(f"DROP FUNCTION {table}_notify_changes()")
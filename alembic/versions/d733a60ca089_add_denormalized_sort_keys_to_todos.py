@@ -0,0 +1,177 @@
+"""Add denormalized sort keys to todos
+
+Copies priorities.order and statuses.order onto todos as priority_order and
+status_order so every supported list sort can be served from an index
+without joining priorities or statuses. Triggers keep the copies in sync.
+
+Revision ID: d733a60ca089
+Revises: b4237f6c32a0
+Create Date: 2026-10-19 09:44:51.446782
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd733a60ca089'
+down_revision: Union[str, Sequence[str], None] = 'b4237f6c32a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, columns) for every sort in TodoService.ALLOWED_SORTS
+SORT_INDEXES = [
+    # incomplete-priority-desc
+    (
+        "ix_todo_user_completed_priority_order",
+        ["user_key", "completed", "priority_order", sa.text("id DESC")],
+    ),
+    # priority-desc
+    ("ix_todo_user_priority_order", ["user_key", "priority_order", sa.text("id DESC")]),
+    # priority-desc-text-asc
+    ("ix_todo_user_priority_order_title", ["user_key", "priority_order", "title"]),
+    # text-asc
+    ("ix_todo_user_title", ["user_key", "title", sa.text("id DESC")]),
+    # text-desc
+    ("ix_todo_user_title_desc", ["user_key", sa.text("title DESC"), sa.text("id DESC")]),
+    # created-desc (scanned backwards)
+    ("ix_todo_user_id", ["user_key", "id"]),
+    # status-desc
+    ("ix_todo_user_status_order", ["user_key", "status_order", sa.text("id DESC")]),
+    # status-asc
+    (
+        "ix_todo_user_status_order_desc",
+        ["user_key", sa.text("status_order DESC"), sa.text("id DESC")],
+    ),
+    # incomplete-status-desc
+    (
+        "ix_todo_user_completed_status_order",
+        ["user_key", "completed", "status_order", sa.text("id DESC")],
+    ),
+    # priority-status-desc
+    (
+        "ix_todo_user_priority_status_order",
+        ["user_key", "priority_order", "status_order", sa.text("id DESC")],
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("todos", sa.Column("priority_order", sa.Integer(), nullable=True))
+    op.add_column("todos", sa.Column("status_order", sa.Integer(), nullable=True))
+
+    # Backfill from the current priority and status order
+    op.execute(
+        """
+        UPDATE todos t
+        SET priority_order = p."order"
+        FROM priorities p
+        WHERE p.key = t.priority
+        """
+    )
+    op.execute(
+        """
+        UPDATE todos t
+        SET status_order = s."order"
+        FROM statuses s
+        WHERE s.key = t.status
+        """
+    )
+
+    # Copy the order onto a todo whenever it is created or reassigned
+    op.execute(
+        """
+        CREATE FUNCTION todos_set_sort_keys() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' OR NEW.priority IS DISTINCT FROM OLD.priority THEN
+                SELECT p."order" INTO NEW.priority_order
+                FROM priorities p
+                WHERE p.key = NEW.priority;
+            END IF;
+            IF TG_OP = 'INSERT' OR NEW.status IS DISTINCT FROM OLD.status THEN
+                SELECT s."order" INTO NEW.status_order
+                FROM statuses s
+                WHERE s.key = NEW.status;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_todos_set_sort_keys
+        BEFORE INSERT OR UPDATE OF priority, status ON todos
+        FOR EACH ROW EXECUTE FUNCTION todos_set_sort_keys()
+        """
+    )
+
+    # Push a changed priority or status order down to its todos
+    op.execute(
+        """
+        CREATE FUNCTION priorities_sync_todo_order() RETURNS trigger AS $$
+        BEGIN
+            UPDATE todos
+            SET priority_order = NEW."order"
+            WHERE user_key = NEW.user_key
+            AND priority = NEW.key;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_priorities_sync_todo_order
+        AFTER UPDATE OF "order" ON priorities
+        FOR EACH ROW
+        WHEN (OLD."order" IS DISTINCT FROM NEW."order")
+        EXECUTE FUNCTION priorities_sync_todo_order()
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION statuses_sync_todo_order() RETURNS trigger AS $$
+        BEGIN
+            UPDATE todos
+            SET status_order = NEW."order"
+            WHERE user_key = NEW.user_key
+            AND status = NEW.key;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_statuses_sync_todo_order
+        AFTER UPDATE OF "order" ON statuses
+        FOR EACH ROW
+        WHEN (OLD."order" IS DISTINCT FROM NEW."order")
+        EXECUTE FUNCTION statuses_sync_todo_order()
+        """
+    )
+
+    for name, columns in SORT_INDEXES:
+        op.create_index(name, "todos", columns, unique=False)
+    # Every new index starts with user_key, so the single-column one is redundant
+    op.drop_index("ix_todo_user_key", table_name="todos")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_todo_user_key", "todos", ["user_key"], unique=False)
+    for name, _ in reversed(SORT_INDEXES):
+        op.drop_index(name, table_name="todos")
+    op.execute("DROP TRIGGER trg_statuses_sync_todo_order ON statuses")
+    op.execute("DROP FUNCTION statuses_sync_todo_order()")
+    op.execute("DROP TRIGGER trg_priorities_sync_todo_order ON priorities")
+    op.execute("DROP FUNCTION priorities_sync_todo_order()")
+    op.execute("DROP TRIGGER trg_todos_set_sort_keys ON todos")
+    op.execute("DROP FUNCTION todos_set_sort_keys()")
+    op.drop_column("todos", "status_order")
+    op.drop_column("todos", "priority_order")
@@ -0,0 +1,167 @@
+from aiohttp import web
+from multidict import CIMultiDict
+from app.schemas.batch import (
+    BatchRequest,
+    BatchResponse,
+    BatchSubRequest,
+    BatchSubResponse,
+)
+from app.core.errors import AppError, QueryTimeoutError, ValidationError
+from app.middleware.database import _is_statement_timeout
+from app.middleware.error_handling import error_response
+from app.middleware.rate_limit import _get_canonical_path, check_rate_limit
+import json
+import logging
+from typing import List, Optional, Tuple
+from app.middleware.authentication import require_auth
+from app.utils.serialization import JSON_CONTENT_TYPE, read_body, respond
+from app.validators.body import parse_body
+import pydantic
+
+logger = logging.getLogger(__name__)
+
+# Streaming routes can't be buffered into a batch response, and batches don't nest
+BATCH_EXCLUDED_ROUTES = {
+    ("POST", "/api/v1/batch"),
+    ("GET", "/api/v1/events"),
+    ("GET", "/api/v1/todos/export"),
+    ("POST", "/api/v1/todos/import"),
+}
+# Routes that read in a transaction of their own (a repeatable-read snapshot),
+# which can't be nested in the transaction of a transactional batch
+TRANSACTION_EXCLUDED_ROUTES = {
+    ("GET", "/api/v1/todos/changes"),
+}
+
+
+class _Rollback(Exception):
+    """Ends a transactional batch after a sub-request failed."""
+
+
+async def _sub_request(template: web.Request, sub: BatchSubRequest) -> web.Request:
+    """
+    Build the request a route handler sees for a sub-request.
+
+    aiohttp has no public API for giving a cloned request a body of its own
+    or for resolving its route outside Application._handle, so this sets the
+    private _read_bytes and _match_info attributes. requirements.txt pins
+    aiohttp, and test_batch.TestSubRequest fails if they stop working.
+    """
+    headers = CIMultiDict(template.headers)
+    headers.popall("Content-Length", None)
+    # Sub-responses are embedded in the batch response, so they stay JSON
+    headers["Content-Type"] = JSON_CONTENT_TYPE
+    headers["Accept"] = JSON_CONTENT_TYPE
+    request = template.clone(method=sub.method, rel_url=sub.path, headers=headers)
+    # The batch body has been read already; give the handler its own body
+    request._read_bytes = (
+        b"" if sub.body is None else json.dumps(sub.body).encode("utf-8")
+    )
+
+    # What Application._handle does before running the middleware chain
+    match_info = await template.app.router.resolve(request)
+    match_info.add_app(template.app)
+    match_info.freeze()
+    request._match_info = match_info
+    return request
+
+
+async def _dispatch(
+    template: web.Request, sub: BatchSubRequest, transactional: bool = False
+) -> web.Response:
+    """
+    Run one sub-request through its route handler.
+
+    The sub-request shares the batch's authentication, request id and database
+    connection, so the middleware chain is skipped; only rate limits apply.
+    """
+    request = await _sub_request(template, sub)
+    match_info = request.match_info
+    if match_info.http_exception is not None:
+        return error_response(request, match_info.http_exception)
+    route = (request.method, _get_canonical_path(request))
+    if route in BATCH_EXCLUDED_ROUTES:
+        return error_response(
+            request,
+            ValidationError(
+                custom_message=f"{sub.method} {sub.path} cannot be batched"
+            ),
+        )
+    if transactional and route in TRANSACTION_EXCLUDED_ROUTES:
+        return error_response(
+            request,
+            ValidationError(
+                custom_message=f"{sub.method} {sub.path} cannot run in a transactional batch"
+            ),
+        )
+
+    rejected, _ = check_rate_limit(request)
+    if rejected is not None:
+        return rejected
+    try:
+        return await match_info.handler(request)
+    except Exception as e:
+        if _is_statement_timeout(e):
+            e = QueryTimeoutError()
+        return error_response(request, e)
+
+
+def _to_sub_response(sub: BatchSubRequest, response: web.Response) -> BatchSubResponse:
+    body: Optional[object] = None
+    if response.body:
+        if response.content_type == "application/json":
+            body = json.loads(response.body)
+        else:
+            body = response.body.decode(response.charset or "utf-8")
+    return BatchSubResponse(id=sub.id, status=response.status, body=body)
+
+
+async def _run_transaction(
+    db, template: web.Request, subs: List[BatchSubRequest]
+) -> Tuple[List[BatchSubResponse], bool]:
+    """Run sub-requests in one transaction, rolling back at the first failure."""
+    responses = []
+    try:
+        async with db.transaction():
+            for sub in subs:
+                response = await _dispatch(template, sub, transactional=True)
+                responses.append(_to_sub_response(sub, response))
+                if response.status >= 400:
+                    raise _Rollback()
+    except _Rollback:
+        return responses, False
+    return responses, True
+
+
+@require_auth()
+async def batch(request: web.Request):
+    db = request["conn"]
+    # aiohttp refuses to clone a request once its body has been read
+    template = request.clone()
+    try:
+        batch_request = parse_body(BatchRequest, await read_body(request))
+        if batch_request.transaction:
+            responses, committed = await _run_transaction(
+                db, template, batch_request.requests
+            )
+        else:
+            responses, committed = [], True
+            for sub in batch_request.requests:
+                response = await _dispatch(template, sub)
+                responses.append(_to_sub_response(sub, response))
+        return respond(
+            request,
+            BatchResponse(
+                responses=responses, committed=committed, success=True
+            ).model_dump(),
+            status=200,
+        )
+    except ValidationError as e:
+        logger.error(f"Validation error: {e}")
+        raise
+    except pydantic.ValidationError as e:
+        logger.error(f"Validation error: {e}")
+        raise ValidationError(e.errors())
+    except Exception as e:
+        logger.error(f"Error running batch: {e}")
+        raise AppError(e)
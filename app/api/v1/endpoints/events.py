@@ -0,0 +1,86 @@
+from aiohttp import web
+from app.services.auth_service import AuthService
+from app.middleware.cors import apply_cors_headers
+from app.middleware.logging import REQUEST_ID_HEADER, get_request_id
+from app.core.config import settings
+from app.core.errors import UnauthorizedError
+from app.schemas.token import StreamToken
+from app.utils.serialization import respond
+from datetime import datetime, timedelta, timezone
+import asyncio
+import json
+import logging
+from app.middleware.authentication import require_auth, stream_token_audience
+
+logger = logging.getLogger(__name__)
+
+
+def _format_event(event: dict) -> bytes:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode("utf-8")
+
+
+@require_auth()
+async def create_stream_token(request: web.Request):
+    """Issue a short-lived token an EventSource can pass in the query string."""
+    claims = request["claims"]
+    expires_delta = timedelta(seconds=settings.STREAM_TOKEN_EXPIRE_SECONDS)
+    token = AuthService.create_access_token(
+        data={"sub": claims.get("sub"), "uid": claims.get("uid")},
+        expires_delta=expires_delta,
+        audience=stream_token_audience(),
+    )
+    return respond(
+        request,
+        StreamToken(
+            token=token, expires_at=datetime.now(timezone.utc) + expires_delta
+        ).model_dump(),
+        status=201,
+    )
+
+
+@require_auth()
+async def stream_events(request: web.Request):
+    """Stream change events for the authenticated user as Server-Sent Events."""
+    # This route is not given a pooled connection (the stream is long-lived),
+    # so borrow one just for the user lookup
+    async with request.app["db_pool_monitor"].acquire() as db:
+        current_user = await AuthService.get_user(db, request["user"])
+    if not current_user:
+        raise UnauthorizedError("Unauthorized")
+
+    broker = request.app["event_broker"]
+    subscription = broker.subscribe(current_user["key"])
+    response = web.StreamResponse(
+        status=200,
+        headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            # Keep reverse proxies from buffering the stream
+            "X-Accel-Buffering": "no",
+            REQUEST_ID_HEADER: get_request_id(request),
+        },
+    )
+    apply_cors_headers(request, response)
+    try:
+        await response.prepare(request)
+        await response.write(b"retry: 5000\n\n")
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), settings.events_heartbeat_seconds
+                )
+            except asyncio.TimeoutError:
+                # Comment lines keep idle connections (and proxies) alive
+                await response.write(b": heartbeat\n\n")
+                continue
+            if event is None:
+                break
+            # write() waits for the transport to drain; meanwhile new events
+            # queue up and overflow into a resync instead of piling up
+            await response.write(_format_event(event))
+    except ConnectionResetError:
+        logger.info("Event stream closed by client")
+    finally:
+        broker.unsubscribe(subscription)
+    await response.write_eof()
+    return response
@@ -6,15 +6,23 @@ from app.utils.mapping import record_to_dict
 from app.schemas.priority import (
     PriorityResponse,
     PriorityListResponse,
-    PriorityCreate,
-    PriorityPatch,
-    PriorityUpdate,
     PriorityReorder,
 )
 from app.utils.pagination import build_pagination_link, parse_pagination
+from app.utils.serialization import read_body, respond
+from app.utils.fields import (
+    LISTING_INCLUDES,
+    PRIORITY_FIELDS,
+    add_todo_counts,
+    dump_record,
+    dump_records,
+    parse_fields,
+    parse_include,
+)
 from app.core.errors import AppError, NotFoundError, UnauthorizedError, ValidationError
 import logging
 from app.middleware.authentication import require_auth
+from app.validators.body import parse_body
 from app.validators.priority_validator import (
     PriorityCreateValidator,
     PriorityUpdateValidator,
@@ -36,11 +44,19 @@ async def get_priorities(request: web.Request):
         request.query.get("page"), request.query.get("size")
     )
     try:
+        fields = parse_fields(request.query.get("fields"), PRIORITY_FIELDS)
+        include = parse_include(request.query.get("include"), LISTING_INCLUDES)
         priorities = await PriorityService.get_priorities(
-            db, current_user["key"], skip, size
+            db,
+            current_user["key"],
+            skip,
+            size,
+            fields=fields,
+            with_counts="counts" in include,
         )
         if not priorities:
-            return web.json_response(
+            return respond(
+                request,
                 PriorityListResponse(
                     priorities=[],
                     total=0,
@@ -53,8 +69,11 @@ async def get_priorities(request: web.Request):
                 status=200,
             )
         total = await PriorityService.get_total_priorities(db, current_user["key"])
-        items = [PriorityResponse(**record_to_dict(p)) for p in priorities]
-        return web.json_response(
+        items = dump_records(priorities, PriorityResponse, fields)
+        if "counts" in include:
+            add_todo_counts(items, priorities)
+        return respond(
+            request,
             PriorityListResponse(
                 priorities=items,
                 total=total,
@@ -90,16 +109,13 @@ async def get_priority_by_key(request: web.Request):
     current_user = await AuthService.get_user(db, username)
     key = request.match_info["key"]
     try:
-        priority_id = await PriorityService.fetch_priority_id_by_key(
-            db, key, current_user["key"]
-        )
-        if not priority_id:
-            raise NotFoundError(f"Priority with key {key} not found")
-        priority = await PriorityService.get_priority(
-            db, priority_id, current_user["key"]
+        fields = parse_fields(request.query.get("fields"), PRIORITY_FIELDS)
+        priority = await PriorityService.get_priority_by_key(
+            db, key, current_user["key"], fields=fields
         )
-        return web.json_response(
-            PriorityResponse(**record_to_dict(priority)).model_dump(),
+        return respond(
+            request,
+            dump_record(priority, PriorityResponse, fields),
             status=200,
         )
     except UnauthorizedError as e:
@@ -124,22 +140,17 @@ async def create_priority(request: web.Request):
     db = request["conn"]
     username = request["user"]
     current_user = await AuthService.get_user(db, username)
-    priority_data = await request.json()
+    priority_data = await read_body(request)
     try:
-        # Check if all fields are present
-        if not all(
-            key in priority_data
-            for key in ["name", "color", "icon", "order", "user_key"]
-        ):
-            raise ValidationError(custom_message="All fields are required")
-        priority_model = PriorityCreate(**priority_data)
+        priority_model = PriorityCreateValidator.parse(priority_data)
         priority_model = PriorityCreateValidator.validate_priority(
             priority_model, current_user["key"]
         )
         priority = await PriorityService.create_priority(
             db, priority_model, current_user["key"]
         )
-        return web.json_response(
+        return respond(
+            request,
             PriorityResponse(**record_to_dict(priority)).model_dump(),
             status=201,
         )
@@ -166,7 +177,7 @@ async def update_priority(request: web.Request):
     username = request["user"]
     current_user = await AuthService.get_user(db, username)
     key = request.match_info["key"]
-    priority_data = await request.json()
+    priority_data = await read_body(request)
     try:
         priority_id = await PriorityService.fetch_priority_id_by_key(
             db, key, current_user["key"]
@@ -176,12 +187,12 @@ async def update_priority(request: web.Request):
     except Exception as e:
         raise AppError(e)
     try:
-        priority_model = PriorityUpdate(**priority_data)
-        priority_model = PriorityUpdateValidator.validate_priority(priority_model)
+        priority_model = PriorityUpdateValidator.parse(priority_data)
         priority = await PriorityService.update_priority(
             db, priority_id, priority_model, current_user["key"]
         )
-        return web.json_response(
+        return respond(
+            request,
             PriorityResponse(**record_to_dict(priority)).model_dump(),
             status=200,
         )
@@ -208,7 +219,7 @@ async def patch_priority(request: web.Request):
     username = request["user"]
     current_user = await AuthService.get_user(db, username)
     key = request.match_info["key"]
-    priority_patch = await request.json()
+    priority_patch = await read_body(request)
     try:
         priority_id = await PriorityService.fetch_priority_id_by_key(
             db, key, current_user["key"]
@@ -219,12 +230,12 @@ async def patch_priority(request: web.Request):
         raise AppError(e)
 
     try:
-        priority_model = PriorityPatch(**priority_patch)
-        priority_model = PriorityPatchValidator.validate_priority(priority_model)
+        priority_model = PriorityPatchValidator.parse(priority_patch)
         updated_priority = await PriorityService.patch_priority(
             db, priority_id, priority_model, current_user["key"]
         )
-        return web.json_response(
+        return respond(
+            request,
             PriorityResponse(**record_to_dict(updated_priority)).model_dump(),
             status=200,
         )
@@ -252,10 +263,12 @@ async def delete_priority(request: web.Request):
     current_user = await AuthService.get_user(db, username)
     key = request.match_info["key"]
     try:
-        priority_id = await PriorityService.fetch_priority_id_by_key(
-            db, key, current_user["key"]
+        await PriorityService.delete_priority_by_key(
+            db,
+            key,
+            current_user["key"],
+            reassign_to=request.query.get("reassign_to") or None,
         )
-        await PriorityService.delete_priority(db, priority_id, current_user["key"])
         return web.Response(status=204)
     except UnauthorizedError as e:
         logger.error(f"Unauthorized error: {e}")
@@ -280,11 +293,11 @@ async def reorder_priorities(request: web.Request):
     db = request["conn"]
     username = request["user"]
     current_user = await AuthService.get_user(db, username)
-    reorder_data = await request.json()
+    reorder_data = await read_body(request)
 
     try:
         # Validate the request body
-        reorder_model = PriorityReorder(**reorder_data)
+        reorder_model = parse_body(PriorityReorder, reorder_data)
 
         # Perform the reordering
         updated_priorities = await PriorityService.reorder_priorities(
@@ -292,9 +305,10 @@ async def reorder_priorities(request: web.Request):
         )
 
         # Convert to response format
-        items = [PriorityResponse(**record_to_dict(p)) for p in updated_priorities]
+        items = dump_records(updated_priorities, PriorityResponse, None)
 
-        return web.json_response(
+        return respond(
+            request,
             PriorityListResponse(
                 priorities=items,
                 total=len(items),
@@ -6,15 +6,23 @@ from app.utils.mapping import record_to_dict
 from app.schemas.status import (
     StatusResponse,
     StatusListResponse,
-    StatusCreate,
-    StatusPatch,
-    StatusUpdate,
     StatusReorder,
 )
 from app.utils.pagination import build_pagination_link, parse_pagination
+from app.utils.serialization import read_body, respond
+from app.utils.fields import (
+    LISTING_INCLUDES,
+    STATUS_FIELDS,
+    add_todo_counts,
+    dump_record,
+    dump_records,
+    parse_fields,
+    parse_include,
+)
 from app.core.errors import AppError, NotFoundError, UnauthorizedError, ValidationError
 import logging
 from app.middleware.authentication import require_auth
+from app.validators.body import parse_body
 from app.validators.status_validator import (
     StatusCreateValidator,
     StatusUpdateValidator,
@@ -36,9 +44,19 @@ async def get_statuses(request: web.Request):
         request.query.get("page"), request.query.get("size")
     )
     try:
-        statuses = await StatusService.get_statuses(db, current_user["key"], skip, size)
+        fields = parse_fields(request.query.get("fields"), STATUS_FIELDS)
+        include = parse_include(request.query.get("include"), LISTING_INCLUDES)
+        statuses = await StatusService.get_statuses(
+            db,
+            current_user["key"],
+            skip,
+            size,
+            fields=fields,
+            with_counts="counts" in include,
+        )
         if not statuses:
-            return web.json_response(
+            return respond(
+                request,
                 StatusListResponse(
                     statuses=[],
                     total=0,
@@ -51,8 +69,11 @@ async def get_statuses(request: web.Request):
                 status=200,
             )
         total = await StatusService.get_total_statuses(db, current_user["key"])
-        items = [StatusResponse(**record_to_dict(p)) for p in statuses]
-        return web.json_response(
+        items = dump_records(statuses, StatusResponse, fields)
+        if "counts" in include:
+            add_todo_counts(items, statuses)
+        return respond(
+            request,
             StatusListResponse(
                 statuses=items,
                 total=total,
@@ -88,14 +109,13 @@ async def get_status_by_key(request: web.Request):
     current_user = await AuthService.get_user(db, username)
     key = request.match_info["key"]
     try:
-        status_id = await StatusService.fetch_status_id_by_key(
-            db, key, current_user["key"]
+        fields = parse_fields(request.query.get("fields"), STATUS_FIELDS)
+        status = await StatusService.get_status_by_key(
+            db, key, current_user["key"], fields=fields
         )
-        if not status_id:
-            raise NotFoundError(f"Status with key {key} not found")
-        status = await StatusService.get_status(db, status_id, current_user["key"])
-        return web.json_response(
-            StatusResponse(**record_to_dict(status)).model_dump(),
+        return respond(
+            request,
+            dump_record(status, StatusResponse, fields),
             status=200,
         )
     except UnauthorizedError as e:
@@ -120,19 +140,14 @@ async def create_status(request: web.Request):
     db = request["conn"]
     username = request["user"]
     current_user = await AuthService.get_user(db, username)
-    status_data = await request.json()
+    status_data = await read_body(request)
     try:
-        # Check if all fields are present
-        if not all(
-            key in status_data for key in ["name", "color", "icon", "order", "user_key"]
-        ):
-            raise ValidationError(custom_message="All fields are required")
-        status_model = StatusCreate(**status_data)
-        status_model = StatusCreateValidator.validate_status(status_model)
+        status_model = StatusCreateValidator.parse(status_data)
         status = await StatusService.create_status(
             db, status_model, current_user["key"]
         )
-        return web.json_response(
+        return respond(
+            request,
             StatusResponse(**record_to_dict(status)).model_dump(),
             status=201,
         )
@@ -159,7 +174,7 @@ async def update_status(request: web.Request):
     username = request["user"]
     current_user = await AuthService.get_user(db, username)
     key = request.match_info["key"]
-    status_data = await request.json()
+    status_data = await read_body(request)
     try:
         status_id = await StatusService.fetch_status_id_by_key(
             db, key, current_user["key"]
@@ -169,12 +184,12 @@ async def update_status(request: web.Request):
     except Exception as e:
         raise AppError(e)
     try:
-        status_model = StatusUpdate(**status_data)
-        status_model = StatusUpdateValidator.validate_status(status_model)
+        status_model = StatusUpdateValidator.parse(status_data)
         status = await StatusService.update_status(
             db, status_id, status_model, current_user["key"]
         )
-        return web.json_response(
+        return respond(
+            request,
             StatusResponse(**record_to_dict(status)).model_dump(),
             status=200,
         )
@@ -201,7 +216,7 @@ async def patch_status(request: web.Request):
     username = request["user"]
     current_user = await AuthService.get_user(db, username)
     key = request.match_info["key"]
-    status_patch = await request.json()
+    status_patch = await read_body(request)
     try:
         status_id = await StatusService.fetch_status_id_by_key(
             db, key, current_user["key"]
@@ -212,12 +227,12 @@ async def patch_status(request: web.Request):
         raise AppError(e)
 
     try:
-        status_model = StatusPatch(**status_patch)
-        status_model = StatusPatchValidator.validate_status(status_model)
+        status_model = StatusPatchValidator.parse(status_patch)
         updated_status = await StatusService.patch_status(
             db, status_id, status_model, current_user["key"]
         )
-        return web.json_response(
+        return respond(
+            request,
             StatusResponse(**record_to_dict(updated_status)).model_dump(),
             status=200,
         )
@@ -245,10 +260,12 @@ async def delete_status(request: web.Request):
     current_user = await AuthService.get_user(db, username)
     key = request.match_info["key"]
     try:
-        status_id = await StatusService.fetch_status_id_by_key(
-            db, key, current_user["key"]
+        await StatusService.delete_status_by_key(
+            db,
+            key,
+            current_user["key"],
+            reassign_to=request.query.get("reassign_to") or None,
         )
-        await StatusService.delete_status(db, status_id, current_user["key"])
         return web.Response(status=204)
     except UnauthorizedError as e:
         logger.error(f"Unauthorized error: {e}")
@@ -273,11 +290,11 @@ async def reorder_statuses(request: web.Request):
     db = request["conn"]
     username = request["user"]
     current_user = await AuthService.get_user(db, username)
-    reorder_data = await request.json()
+    reorder_data = await read_body(request)
 
     try:
         # Validate the request body
-        reorder_model = StatusReorder(**reorder_data)
+        reorder_model = parse_body(StatusReorder, reorder_data)
 
         # Perform the reordering
         updated_statuses = await StatusService.reorder_statuses(
@@ -285,9 +302,10 @@ async def reorder_statuses(request: web.Request):
         )
 
         # Convert to response format
-        items = [StatusResponse(**record_to_dict(p)) for p in updated_statuses]
+        items = dump_records(updated_statuses, StatusResponse, None)
 
-        return web.json_response(
+        return respond(
+            request,
             StatusListResponse(
                 statuses=items,
                 total=len(items),
@@ -2,12 +2,34 @@ from aiohttp import web
 from app.services.todo_service import TodoService
 from app.services.auth_service import AuthService
 from app.utils.mapping import record_to_dict
-from app.schemas.todo import TodoResponse, TodoListResponse, TodoCreate, TodoUpdate
-from app.schemas.todo import TodoPatch
-from app.utils.pagination import build_pagination_link, parse_pagination
+from app.schemas.todo import TodoResponse, TodoListResponse
+from app.schemas.todo import TodoBulkResponse, TodoImportResponse
+from app.schemas.todo import TodoStatsResponse, TodoChangesResponse
+from app.schemas.todo import TodoTombstoneResponse, TodoLookup, TodoLookupResponse
+from app.schemas.todo import TodoBoardColumn, TodoBoardResponse
+from app.schemas.status import StatusResponse
+from app.utils.pagination import (
+    build_pagination_link,
+    decode_cursor,
+    encode_cursor,
+    parse_pagination,
+)
+from app.utils.fields import TODO_FIELDS, dump_record, dump_records, parse_fields
+from app.utils.serialization import read_body, respond
+from app.utils.export import (
+    EXPORT_CONTENT_TYPES,
+    todos_csv_header,
+    todos_to_csv,
+    todos_to_ndjson,
+)
+from app.utils.todo_import import IMPORT_CONTENT_TYPES, iter_csv_rows, iter_ndjson_rows
+from app.middleware.cors import apply_cors_headers
+from app.middleware.logging import REQUEST_ID_HEADER, get_request_id
 from app.core.errors import AppError, NotFoundError, UnauthorizedError, ValidationError
+import contextlib
 import logging
 from app.middleware.authentication import require_auth
+from app.validators.body import parse_body
 from app.validators.todo_validator import (
     TodoCreateValidator,
     TodoUpdateValidator,
@@ -18,6 +40,41 @@ import pydantic
 logger = logging.getLogger(__name__)
 
 
+def parse_todo_filters(request: web.Request) -> dict:
+    """
+    Read the list filters understood by TodoService.get_todos from the query.
+
+    An empty value (?search=) is no filter, the same as leaving it out.
+    """
+    completed = request.query.get("completed") or None
+    if completed is not None:
+        completed = completed.lower() == "true"
+    return {
+        "completed": completed,
+        "priority": request.query.get("priority") or None,
+        "search": request.query.get("search") or None,
+        "status": request.query.get("status") or None,
+    }
+
+
+async def _lookup_todos(
+    request: web.Request, db, user_key: str, keys: list[str], raw_fields: str | None
+) -> web.Response:
+    fields = parse_fields(raw_fields, TODO_FIELDS)
+    todos, missing = await TodoService.get_todos_by_keys(
+        db, keys, user_key, fields=fields
+    )
+    return respond(
+        request,
+        TodoLookupResponse(
+            todos=dump_records(todos, TodoResponse, fields),
+            missing=missing,
+            success=True,
+        ).model_dump(),
+        status=200,
+    )
+
+
 @require_auth()
 async def get_todos(request: web.Request):
     db = request["conn"]
@@ -29,27 +86,29 @@ async def get_todos(request: web.Request):
         request.query.get("page"), request.query.get("size")
     )
     sort = request.query.get("sort", "incomplete-priority-desc")
-    completed = request.query.get("completed")
-    if completed is not None:
-        completed = completed.lower() == "true"
-    priority = request.query.get("priority")
-    search = request.query.get("search")
-    status = request.query.get("status")
+    filters = parse_todo_filters(request)
     try:
+        if "keys" in request.query:
+            keys = [k.strip() for k in request.query["keys"].split(",") if k.strip()]
+            if not keys:
+                raise ValidationError(custom_message="keys must not be empty")
+            return await _lookup_todos(
+                request, db, current_user["key"], keys, request.query.get("fields")
+            )
+        fields = parse_fields(request.query.get("fields"), TODO_FIELDS)
         todos = await TodoService.get_todos(
             db,
             current_user["key"],
             skip=skip,
             limit=size,
             sort=sort,
-            completed=completed,
-            priority=priority,
-            search=search,
-            status=status,
+            fields=fields,
+            **filters,
         )
         total = await TodoService.get_total_todos(db, current_user["key"])
-        items = [TodoResponse(**record_to_dict(t)) for t in todos]
-        return web.json_response(
+        items = dump_records(todos, TodoResponse, fields)
+        return respond(
+            request,
             TodoListResponse(
                 todos=items,
                 total=total,
@@ -78,6 +137,172 @@ async def get_todos(request: web.Request):
         raise AppError(e)
 
 
+@require_auth()
+async def get_todo_stats(request: web.Request):
+    db = request["conn"]
+    username = request["user"]
+    current_user = await AuthService.get_user(db, username)
+    if not current_user:
+        raise UnauthorizedError("Unauthorized")
+    try:
+        stats = await TodoService.get_todo_stats(db, current_user["key"])
+        return respond(
+            request,
+            TodoStatsResponse(**stats, success=True).model_dump(),
+            status=200,
+        )
+    except UnauthorizedError as e:
+        logger.error(f"Unauthorized error: {e}")
+        raise UnauthorizedError(e)
+    except pydantic.ValidationError as e:
+        logger.error(f"Validation error: {e}")
+        raise ValidationError(e.errors())
+    except Exception as e:
+        logger.error(f"Error getting todo stats: {e}")
+        raise AppError(e)
+
+
+# change_seq is a bigint
+MAX_CHANGE_SEQ = 2**63 - 1
+
+
+def parse_change_token(token: str | None) -> int:
+    """Read a sync token issued by get_todo_changes; no token means a full sync."""
+    if token is None or token == "":
+        return 0
+    # isdigit() alone accepts digits like "²" that int() doesn't
+    if not (token.isascii() and token.isdigit()) or int(token) > MAX_CHANGE_SEQ:
+        raise ValidationError(custom_message="Invalid sync token")
+    return int(token)
+
+
+@require_auth()
+async def lookup_todos(request: web.Request):
+    """POST variant of GET /api/v1/todos?keys=... for key lists too long for a URL."""
+    db = request["conn"]
+    username = request["user"]
+    current_user = await AuthService.get_user(db, username)
+    if not current_user:
+        raise UnauthorizedError("Unauthorized")
+    try:
+        lookup = parse_body(TodoLookup, await read_body(request))
+        return await _lookup_todos(
+            request, db, current_user["key"], lookup.keys, request.query.get("fields")
+        )
+    except UnauthorizedError as e:
+        logger.error(f"Unauthorized error: {e}")
+        raise UnauthorizedError(e)
+    except ValidationError as e:
+        logger.error(f"Validation error: {e}")
+        raise
+    except pydantic.ValidationError as e:
+        logger.error(f"Validation error: {e}")
+        raise ValidationError(e.errors())
+    except Exception as e:
+        logger.error(f"Error looking up todos: {e}")
+        raise AppError(e)
+
+
+@require_auth()
+async def get_todo_changes(request: web.Request):
+    db = request["conn"]
+    username = request["user"]
+    current_user = await AuthService.get_user(db, username)
+    if not current_user:
+        raise UnauthorizedError("Unauthorized")
+    try:
+        since = parse_change_token(request.query.get("since"))
+        _, size, _ = parse_pagination(
+            None, request.query.get("size"), max_size=1000, default_size=100
+        )
+        changed, deleted, next_since, has_more = await TodoService.get_todo_changes(
+            db, current_user["key"], since=since, limit=size
+        )
+        return respond(
+            request,
+            TodoChangesResponse(
+                changed=[TodoResponse(**record_to_dict(t)) for t in changed],
+                deleted=[TodoTombstoneResponse(**record_to_dict(d)) for d in deleted],
+                next_token=str(next_since),
+                has_more=has_more,
+                success=True,
+            ).model_dump(),
+            status=200,
+        )
+    except UnauthorizedError as e:
+        logger.error(f"Unauthorized error: {e}")
+        raise UnauthorizedError(e)
+    except ValidationError as e:
+        logger.error(f"Validation error: {e}")
+        raise
+    except pydantic.ValidationError as e:
+        logger.error(f"Validation error: {e}")
+        raise ValidationError(e.errors())
+    except Exception as e:
+        logger.error(f"Error getting todo changes: {e}")
+        raise AppError(e)
+
+
+@require_auth()
+async def get_todo_board(request: web.Request):
+    """
+    Todos grouped by status: every column with its first size todos and count.
+
+    A column's next_cursor loads more of it with ?status=<key>&cursor=<token>.
+    """
+    db = request["conn"]
+    username = request["user"]
+    current_user = await AuthService.get_user(db, username)
+    if not current_user:
+        raise UnauthorizedError("Unauthorized")
+    try:
+        _, size, _ = parse_pagination(None, request.query.get("size"))
+        sort = request.query.get("sort", "incomplete-priority-desc")
+        filters = parse_todo_filters(request)
+        cursor = request.query.get("cursor")
+        after = None
+        if cursor:
+            if filters["status"] is None:
+                raise ValidationError(custom_message="cursor requires status")
+            after = decode_cursor(cursor)
+        fields = parse_fields(request.query.get("fields"), TODO_FIELDS)
+        board = await TodoService.get_todo_board(
+            db,
+            current_user["key"],
+            limit=size,
+            sort=sort,
+            after=after,
+            fields=fields,
+            **filters,
+        )
+        columns = [
+            TodoBoardColumn(
+                status=StatusResponse(**record_to_dict(status)).model_dump(),
+                todos=[dump_record(todo, TodoResponse, fields) for todo in todos],
+                count=count,
+                next_cursor=encode_cursor(next_after) if next_after else None,
+            )
+            for status, todos, count, next_after in board
+        ]
+        return respond(
+            request,
+            TodoBoardResponse(columns=columns, success=True).model_dump(),
+            status=200,
+        )
+    except UnauthorizedError as e:
+        logger.error(f"Unauthorized error: {e}")
+        raise UnauthorizedError(e)
+    except ValidationError as e:
+        logger.error(f"Validation error: {e}")
+        raise
+    except pydantic.ValidationError as e:
+        logger.error(f"Validation error: {e}")
+        raise ValidationError(e.errors())
+    except Exception as e:
+        logger.error(f"Error getting todo board: {e}")
+        raise AppError(e)
+
+
 @require_auth()
 async def get_todo_by_key(request: web.Request):
     db = request["conn"]
@@ -85,14 +310,13 @@ async def get_todo_by_key(request: web.Request):
     current_user = await AuthService.get_user(db, username)
     key = request.match_info["key"]
     try:
-        todo_id = await TodoService.fetch_todo_id_by_key(db, key, current_user["key"])
-        if not todo_id:
-            raise NotFoundError(f"Todo with key {key} not found")
-        todo = await TodoService.get_todo(db, todo_id, current_user["key"])
-        if not todo:
-            raise NotFoundError(f"Todo with key {key} not found")
-        return web.json_response(
-            TodoResponse(**record_to_dict(todo)).model_dump(),
+        fields = parse_fields(request.query.get("fields"), TODO_FIELDS)
+        todo = await TodoService.get_todo_by_key(
+            db, key, current_user["key"], fields=fields
+        )
+        return respond(
+            request,
+            dump_record(todo, TodoResponse, fields),
             status=200,
         )
     except UnauthorizedError as e:
@@ -117,18 +341,15 @@ async def create_todo(request: web.Request):
     db = request["conn"]
     username = request["user"]
     current_user = await AuthService.get_user(db, username)
-    todo_data = await request.json()
-    if not all(
-        key in todo_data for key in ["title", "priority", "completed", "user_key"]
-    ):
-        raise ValidationError(custom_message="All fields are required")
+    todo_data = await read_body(request)
     try:
-        todo_model = TodoCreate(**todo_data)
+        todo_model = TodoCreateValidator.parse(todo_data)
         todo_model = await TodoCreateValidator.validate_todo(
             todo_model, db, current_user["key"]
         )
         todo = await TodoService.create_todo(db, todo_model, current_user["key"])
-        return web.json_response(
+        return respond(
+            request,
             TodoResponse(**record_to_dict(todo)).model_dump(),
             status=201,
         )
@@ -155,7 +376,7 @@ async def update_todo(request: web.Request):
     username = request["user"]
     current_user = await AuthService.get_user(db, username)
     key = request.match_info["key"]
-    todo_data = await request.json()
+    todo_data = await read_body(request)
     try:
         todo_id = await TodoService.fetch_todo_id_by_key(db, key, current_user["key"])
         if not todo_id:
@@ -166,14 +387,15 @@ async def update_todo(request: web.Request):
         logger.error(f"Error updating todo: {e}")
         raise AppError(e)
     try:
-        todo_model = TodoUpdate(**todo_data)
+        todo_model = TodoUpdateValidator.parse(todo_data)
         todo_model = await TodoUpdateValidator.validate_todo(
             todo_model, db, current_user["key"]
         )
         todo = await TodoService.update_todo(
             db, todo_id, todo_model, current_user["key"]
         )
-        return web.json_response(
+        return respond(
+            request,
             TodoResponse(**record_to_dict(todo)).model_dump(),
             status=200,
         )
@@ -200,7 +422,7 @@ async def patch_todo(request: web.Request):
     username = request["user"]
     current_user = await AuthService.get_user(db, username)
     key = request.match_info["key"]
-    todo_patch = await request.json()
+    todo_patch = await read_body(request)
     try:
         todo_id = await TodoService.fetch_todo_id_by_key(db, key, current_user["key"])
         if not todo_id:
@@ -211,14 +433,15 @@ async def patch_todo(request: web.Request):
         logger.error(f"Error patching todo: {e}")
         raise AppError(e)
     try:
-        todo_model = TodoPatch(**todo_patch)
+        todo_model = TodoPatchValidator.parse(todo_patch)
         todo_model = await TodoPatchValidator.validate_todo(
             todo_model, db, current_user["key"]
         )
         updated_todo = await TodoService.patch_todo(
             db, todo_id, todo_model, current_user["key"]
         )
-        return web.json_response(
+        return respond(
+            request,
             TodoResponse(**record_to_dict(updated_todo)).model_dump(),
             status=200,
         )
@@ -246,13 +469,8 @@ async def delete_todo(request: web.Request):
     current_user = await AuthService.get_user(db, username)
     key = request.match_info["key"]
     try:
-        todo_id = await TodoService.fetch_todo_id_by_key(db, key, current_user["key"])
-        if not todo_id:
-            raise NotFoundError(f"Todo with key {key} not found")
-        if await TodoService.delete_todo(db, todo_id, current_user["key"]):
-            return web.Response(status=204)
-        else:
-            raise AppError("Failed to delete todo")
+        await TodoService.delete_todo_by_key(db, key, current_user["key"])
+        return web.Response(status=204)
     except UnauthorizedError as e:
         logger.error(f"Unauthorized error: {e}")
         raise UnauthorizedError(e)
@@ -268,3 +486,185 @@ async def delete_todo(request: web.Request):
     except Exception as e:
         logger.error(f"Error deleting todos: {e}")
         raise AppError(e)
+
+
+@require_auth()
+async def bulk_patch_todos(request: web.Request):
+    """Patch every todo matching the query filters with one statement."""
+    db = request["conn"]
+    username = request["user"]
+    current_user = await AuthService.get_user(db, username)
+    filters = parse_todo_filters(request)
+    todo_patch = await read_body(request)
+    try:
+        todo_model = TodoPatchValidator.parse(todo_patch)
+        todo_model = await TodoPatchValidator.validate_todo(
+            todo_model, db, current_user["key"]
+        )
+        affected = await TodoService.bulk_patch_todos(
+            db, todo_model, current_user["key"], **filters
+        )
+        return respond(
+            request,
+            TodoBulkResponse(affected=affected, success=True).model_dump(),
+            status=200,
+        )
+    except UnauthorizedError as e:
+        logger.error(f"Unauthorized error: {e}")
+        raise UnauthorizedError(e)
+    except NotFoundError as e:
+        logger.error(f"Not found error: {e}")
+        raise
+    except ValidationError as e:
+        logger.error(f"Validation error: {e}")
+        raise
+    except pydantic.ValidationError as e:
+        logger.error(f"Validation error: {e}")
+        raise ValidationError(e.errors())
+    except Exception as e:
+        logger.error(f"Error bulk patching todos: {e}")
+        raise AppError(e)
+
+
+@require_auth()
+async def bulk_delete_todos(request: web.Request):
+    """Delete every todo matching the query filters with one statement."""
+    db = request["conn"]
+    username = request["user"]
+    current_user = await AuthService.get_user(db, username)
+    filters = parse_todo_filters(request)
+    try:
+        # Refuse an unfiltered delete unless the client explicitly asks for it
+        if all(value is None for value in filters.values()) and (
+            request.query.get("all", "").lower() != "true"
+        ):
+            raise ValidationError(
+                custom_message="At least one filter is required, or pass all=true"
+            )
+        affected = await TodoService.bulk_delete_todos(
+            db, current_user["key"], **filters
+        )
+        return respond(
+            request,
+            TodoBulkResponse(affected=affected, success=True).model_dump(),
+            status=200,
+        )
+    except UnauthorizedError as e:
+        logger.error(f"Unauthorized error: {e}")
+        raise UnauthorizedError(e)
+    except NotFoundError as e:
+        logger.error(f"Not found error: {e}")
+        raise
+    except ValidationError as e:
+        logger.error(f"Validation error: {e}")
+        raise
+    except pydantic.ValidationError as e:
+        logger.error(f"Validation error: {e}")
+        raise ValidationError(e.errors())
+    except Exception as e:
+        logger.error(f"Error bulk deleting todos: {e}")
+        raise AppError(e)
+
+
+async def _start_export(
+    request: web.Request, response: web.StreamResponse, export_format: str
+):
+    """Send the export's headers, and the CSV header row, unless already sent."""
+    if response.prepared:
+        return
+    apply_cors_headers(request, response)
+    await response.prepare(request)
+    if export_format == "csv":
+        await response.write(todos_csv_header())
+
+
+@require_auth()
+async def export_todos(request: web.Request):
+    """Stream every matching todo as NDJSON or CSV without paging."""
+    db = request["conn"]
+    username = request["user"]
+    current_user = await AuthService.get_user(db, username)
+    export_format = request.query.get("format", "ndjson").lower()
+    if export_format not in EXPORT_CONTENT_TYPES:
+        raise ValidationError(
+            custom_message=f"Format must be one of {', '.join(EXPORT_CONTENT_TYPES)}"
+        )
+    sort = request.query.get("sort", "incomplete-priority-desc")
+    filters = parse_todo_filters(request)
+    encode = todos_to_csv if export_format == "csv" else todos_to_ndjson
+
+    # Headers are sent on prepare, so anything the middlewares add afterwards
+    # is lost; set the request id (and CORS headers) here instead
+    response = web.StreamResponse(
+        status=200,
+        headers={
+            "Content-Type": EXPORT_CONTENT_TYPES[export_format],
+            "Content-Disposition": f'attachment; filename="todos.{export_format}"',
+            REQUEST_ID_HEADER: get_request_id(request),
+        },
+    )
+    batches = TodoService.stream_todos(db, current_user["key"], sort=sort, **filters)
+    try:
+        # aclosing ends the cursor transaction before the connection goes
+        # back to the pool, even when the client disconnects mid-export
+        async with contextlib.aclosing(batches):
+            async for batch in batches:
+                await _start_export(request, response, export_format)
+                # write() drains the transport when its buffer is full, which
+                # pauses the cursor while the client catches up
+                await response.write(encode(batch))
+        await _start_export(request, response, export_format)
+        await response.write_eof()
+        return response
+    except Exception as e:
+        if not response.prepared:
+            logger.error(f"Error exporting todos: {e}")
+            raise AppError(e)
+        # The status line is already out; drop the connection so the client
+        # sees a truncated body instead of a silently short export
+        logger.error(f"Todo export aborted mid-stream: {e}")
+        if request.transport is not None:
+            request.transport.close()
+        return response
+
+
+@require_auth()
+async def import_todos(request: web.Request):
+    """Bulk import todos from a streamed NDJSON or CSV body."""
+    db = request["conn"]
+    username = request["user"]
+    current_user = await AuthService.get_user(db, username)
+    import_format = IMPORT_CONTENT_TYPES.get(request.content_type)
+    if import_format is None:
+        raise ValidationError(
+            custom_message=(
+                f"Content-Type must be one of {', '.join(IMPORT_CONTENT_TYPES)}"
+            )
+        )
+    # Read the body incrementally instead of buffering it with request.json()
+    if import_format == "csv":
+        rows = iter_csv_rows(request.content)
+    else:
+        rows = iter_ndjson_rows(request.content)
+    try:
+        imported = await TodoService.import_todos(db, rows, current_user["key"])
+        return respond(
+            request,
+            TodoImportResponse(imported=imported, success=True).model_dump(),
+            status=201,
+        )
+    except UnauthorizedError as e:
+        logger.error(f"Unauthorized error: {e}")
+        raise UnauthorizedError(e)
+    except NotFoundError as e:
+        logger.error(f"Not found error: {e}")
+        raise
+    except ValidationError as e:
+        logger.error(f"Validation error: {e}")
+        raise
+    except pydantic.ValidationError as e:
+        logger.error(f"Validation error: {e}")
+        raise ValidationError(e.errors())
+    except Exception as e:
+        logger.error(f"Error importing todos: {e}")
+        raise AppError(e)
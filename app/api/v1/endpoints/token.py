@@ -3,6 +3,7 @@ from app.core.config import settings
 from app.services.auth_service import AuthService
 from datetime import datetime, timedelta, timezone
 from app.schemas.token import Token
+from app.utils.serialization import respond
 from app.core.errors import AppError, UnauthorizedError, NotFoundError, ValidationError
 import pydantic
 import logging
@@ -27,7 +28,8 @@ async def login_for_access_token(request: web.Request) -> web.Response:
             },
             expires_delta=access_token_expires,
         )
-        return web.json_response(
+        return respond(
+            request,
             Token(
                 access_token=access_token,
                 token_type="bearer",
@@ -1,15 +1,11 @@
 from aiohttp import web
 from app.services.auth_service import AuthService
 from app.services.user_service import UserService
-from app.schemas.user import (
-    UserCreate,
-    UserResponse,
-    UserListResponse,
-    UserUpdate,
-    UserUpdatePassword,
-)
+from app.schemas.user import UserResponse, UserListResponse
 from app.utils.mapping import record_to_dict
 from app.utils.pagination import build_pagination_link, parse_pagination
+from app.utils.serialization import read_body, respond
+from app.utils.fields import USER_FIELDS, dump_record, dump_records, parse_fields
 from app.core.errors import AppError, NotFoundError, ValidationError, UnauthorizedError
 import logging
 from app.middleware.authentication import require_auth
@@ -30,10 +26,12 @@ async def read_users(request: web.Request):
         request.query.get("page"), request.query.get("size")
     )
     try:
-        users = await UserService.get_users(db, skip, size)
+        fields = parse_fields(request.query.get("fields"), USER_FIELDS)
+        users = await UserService.get_users(db, skip, size, fields=fields)
         total = await UserService.get_total_users(db)
-        users_list = [UserResponse(**record_to_dict(user)) for user in users]
-        return web.json_response(
+        users_list = dump_records(users, UserResponse, fields)
+        return respond(
+            request,
             UserListResponse(
                 users=users_list,
                 total=total,
@@ -64,11 +62,13 @@ async def read_user(request: web.Request):
     db = request["conn"]
     key = request.match_info["key"]
     try:
-        user = await UserService.get_user_by_key(db, key)
+        fields = parse_fields(request.query.get("fields"), USER_FIELDS)
+        user = await UserService.get_user_by_key(db, key, fields=fields)
         if not user:
             raise NotFoundError(f"User with key {key} not found")
-        return web.json_response(
-            UserResponse(**record_to_dict(user)).model_dump(),
+        return respond(
+            request,
+            dump_record(user, UserResponse, fields),
             status=200,
         )
     except NotFoundError as e:
@@ -87,12 +87,13 @@ async def read_user(request: web.Request):
 
 async def create_user(request: web.Request):
     db = request["conn"]
-    user_in = await request.json()
+    user_in = await read_body(request)
     try:
-        user_model = UserCreate(**user_in)
+        user_model = UserCreateValidator.parse(user_in)
         user_model = await UserCreateValidator.validate_user(user_model, db)
         db_user = await UserService.create_user(db, user_model)
-        return web.json_response(
+        return respond(
+            request,
             UserResponse(**record_to_dict(db_user)).model_dump(),
             status=201,
         )
@@ -116,7 +117,7 @@ async def update_user(
 ):
     db = request["conn"]
     key = request.match_info["key"]
-    user_in = await request.json()
+    user_in = await read_body(request)
     try:
         # Check if the user is the current user
         current_user = await AuthService.get_user(db, request["user"])
@@ -130,13 +131,14 @@ async def update_user(
                 f"User {current_user['key']} is not allowed to update user {key}"
             )
             raise ValidationError("You are not allowed to update this user")
-        user_model = UserUpdate(**user_in)
+        user_model = UserUpdateValidator.parse(user_in)
         user_model = await UserUpdateValidator.validate_user(
             user_model, db, current_user["key"]
         )
         user = await UserService.update_user(db, key, user_model, current_user["key"])
         user_data = UserResponse(**record_to_dict(user)).model_dump()
-        return web.json_response(
+        return respond(
+            request,
             user_data,
             status=200,
         )
@@ -158,7 +160,7 @@ async def update_user(
 async def patch_user(request: web.Request):
     db = request["conn"]
     key = request.match_info["key"]
-    user_in = await request.json()
+    user_in = await read_body(request)
     try:
         user = await UserService.get_user_by_key(db, key)
         if not user:
@@ -176,10 +178,11 @@ async def patch_user(request: web.Request):
         logger.error(f"Error patching user: {e}")
         raise AppError(e)
     try:
-        user_model = UserUpdate(**user_in)
+        user_model = UserUpdateValidator.parse(user_in)
         user_model = await UserUpdateValidator.validate_user(user_model, db, key)
         user = await UserService.patch_user(db, key, user_model, request["user"])
-        return web.json_response(
+        return respond(
+            request,
             UserResponse(**record_to_dict(user)).model_dump(),
             status=200,
         )
@@ -217,13 +220,14 @@ async def update_user_password(
         if current_user["key"] != user_key:
             raise ValidationError("You are not allowed to update this user")
         # Update the user password
-        user_in = await request.json()
-        user_model = UserUpdatePassword(**user_in)
+        user_in = await read_body(request)
+        user_model = UserUpdatePasswordValidator.parse(user_in)
         user_model = await UserUpdatePasswordValidator.validate_user_password(
             user_model, db, current_user["key"]
         )
         await UserService.update_user_password(db, user_key, user_model)
-        return web.json_response(
+        return respond(
+            request,
             {"success": True, "message": "User password updated successfully"},
             status=200,
         )
@@ -252,10 +256,10 @@ async def delete_user(
         current_user = await AuthService.get_user(db, request["user"])
         if not current_user:
             raise NotFoundError("User not found")
-        user = await UserService.get_user_by_key(db, key)
-        if not user:
-            raise NotFoundError(f"User with key {key} not found")
         if current_user["key"] != key:
+            # Only look the target up on the rejection path so a missing key
+            # still reports 404 before the permission error
+            await UserService.get_user_by_key(db, key)
             logger.error(
                 f"User {current_user['key']} is not allowed to delete user {key}"
             )
@@ -9,9 +9,12 @@ from .routes import (
     apply_base_routes,
     apply_auth_routes,
     apply_todo_routes,
+    apply_todo_bulk_routes,
     apply_priority_routes,
     apply_user_routes,
     apply_status_routes,
+    apply_event_routes,
+    apply_batch_routes,
 )
 
 
@@ -31,9 +34,12 @@ def register_all_routes() -> web.RouteTableDef:
     apply_base_routes(routes)  # Health checks, root
     apply_auth_routes(routes)  # Authentication
     apply_todo_routes(routes)  # Todo management
+    apply_todo_bulk_routes(routes)  # Lookup, bulk updates, export and import
     apply_priority_routes(routes)  # Priority management
     apply_status_routes(routes)  # Status management
     apply_user_routes(routes)  # User management
+    apply_event_routes(routes)  # Change feed
+    apply_batch_routes(routes)  # Multiplexed requests
 
     return routes
 
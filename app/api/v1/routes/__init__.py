@@ -7,16 +7,22 @@ Each resource has its own route module for better organization.
 
 from .base import apply_base_routes
 from .todos import apply_todo_routes
+from .todos_bulk import apply_todo_bulk_routes
 from .priorities import apply_priority_routes
 from .users import apply_user_routes
 from .auth import apply_auth_routes
 from .statuses import apply_status_routes
+from .events import apply_event_routes
+from .batch import apply_batch_routes
 
 __all__ = [
     "apply_base_routes",
     "apply_todo_routes",
+    "apply_todo_bulk_routes",
     "apply_priority_routes",
     "apply_user_routes",
     "apply_auth_routes",
     "apply_status_routes",
+    "apply_event_routes",
+    "apply_batch_routes",
 ]
@@ -5,6 +5,9 @@ This module contains basic routes like health checks and root endpoints.
 """
 
 from aiohttp import web
+from app.core.config import settings
+from app.middleware.authentication import token_cache
+from app.middleware.coalescing import coalescer
 
 
 def apply_base_routes(routes: web.RouteTableDef) -> None:
@@ -25,3 +28,17 @@ def apply_base_routes(routes: web.RouteTableDef) -> None:
     async def health(request: web.Request):
         """Health check endpoint for monitoring."""
         return web.json_response({"status": "OK", "message": "Service is running"})
+
+    @routes.get("/metrics")
+    async def metrics(request: web.Request):
+        """In-process counters for monitoring, when METRICS_ENABLED is set."""
+        if not settings.metrics_enabled:
+            raise web.HTTPNotFound()
+        return web.json_response(
+            {
+                "auth_token_cache": token_cache.stats(),
+                "db_pool": request.app["db_pool_monitor"].stats(),
+                "coalescing": coalescer.stats(),
+                "events": request.app["event_broker"].stats(),
+            }
+        )
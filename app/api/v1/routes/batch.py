@@ -0,0 +1,17 @@
+"""
+Batch routes for the API.
+
+This module contains the endpoint that runs several API requests at once.
+"""
+
+from aiohttp import web
+from app.api.v1.endpoints import batch
+
+
+def apply_batch_routes(routes: web.RouteTableDef) -> None:
+    """Apply batch routes to the route table."""
+
+    @routes.post("/api/v1/batch")
+    async def run_batch(request: web.Request):
+        """Run a list of API requests and return all of their responses."""
+        return await batch.batch(request)
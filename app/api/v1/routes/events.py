@@ -0,0 +1,22 @@
+"""
+Event routes for the API.
+
+This module contains the Server-Sent Events change feed.
+"""
+
+from aiohttp import web
+from app.api.v1.endpoints import events
+
+
+def apply_event_routes(routes: web.RouteTableDef) -> None:
+    """Apply event routes to the route table."""
+
+    @routes.get("/api/v1/events")
+    async def stream_events(request: web.Request):
+        """Stream todo, priority and status changes as Server-Sent Events."""
+        return await events.stream_events(request)
+
+    @routes.post("/api/v1/events/token")
+    async def create_stream_token(request: web.Request):
+        """Issue a short-lived token for opening the stream with EventSource."""
+        return await events.create_stream_token(request)
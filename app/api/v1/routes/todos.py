@@ -16,6 +16,21 @@ def apply_todo_routes(routes: web.RouteTableDef) -> None:
         """Get paginated list of todos for the authenticated user."""
         return await todos.get_todos(request)
 
+    @routes.get("/api/v1/todos/stats")
+    async def get_todo_stats(request: web.Request):
+        """Get todo counts by status, priority and completion."""
+        return await todos.get_todo_stats(request)
+
+    @routes.get("/api/v1/todos/changes")
+    async def get_todo_changes(request: web.Request):
+        """Get todos changed or deleted since a sync token."""
+        return await todos.get_todo_changes(request)
+
+    @routes.get("/api/v1/todos/board")
+    async def get_todo_board(request: web.Request):
+        """Get todos grouped by status with a count and cursor per column."""
+        return await todos.get_todo_board(request)
+
     @routes.get("/api/v1/todo/{key}")
     async def get_todo_by_key(request: web.Request):
         """Get a specific todo by its key."""
@@ -0,0 +1,38 @@
+"""
+Bulk todo routes for the API.
+
+This module contains routes that read or write many todos at once:
+lookup by keys, filter-based updates and deletes, export and import.
+"""
+
+from aiohttp import web
+from app.api.v1.endpoints import todos
+
+
+def apply_todo_bulk_routes(routes: web.RouteTableDef) -> None:
+    """Apply bulk todo routes to the route table."""
+
+    @routes.post("/api/v1/todos/lookup")
+    async def lookup_todos(request: web.Request):
+        """Get many todos by key; see GET /api/v1/todos?keys=..."""
+        return await todos.lookup_todos(request)
+
+    @routes.patch("/api/v1/todos")
+    async def bulk_patch_todos(request: web.Request):
+        """Partially update every todo matching the query filters."""
+        return await todos.bulk_patch_todos(request)
+
+    @routes.delete("/api/v1/todos")
+    async def bulk_delete_todos(request: web.Request):
+        """Delete every todo matching the query filters."""
+        return await todos.bulk_delete_todos(request)
+
+    @routes.get("/api/v1/todos/export")
+    async def export_todos(request: web.Request):
+        """Stream all matching todos as NDJSON or CSV."""
+        return await todos.export_todos(request)
+
+    @routes.post("/api/v1/todos/import")
+    async def import_todos(request: web.Request):
+        """Bulk import todos from an NDJSON or CSV body."""
+        return await todos.import_todos(request)
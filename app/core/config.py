@@ -22,6 +22,14 @@ class Settings(BaseSettings):
         "todo-api-client", json_schema_extra={"env": "JWT_AUDIENCE"}
     )
     JWT_LEEWAY: int = Field(60, json_schema_extra={"env": "JWT_LEEWAY"})
+    # Lifetime of the query string tokens GET /api/v1/events accepts
+    STREAM_TOKEN_EXPIRE_SECONDS: int = Field(
+        60, json_schema_extra={"env": "STREAM_TOKEN_EXPIRE_SECONDS"}
+    )
+    # Number of verified tokens kept in memory; 0 disables the cache
+    AUTH_TOKEN_CACHE_SIZE: int = Field(
+        10000, json_schema_extra={"env": "AUTH_TOKEN_CACHE_SIZE"}
+    )
 
     # API settings
     api_v1_str: str = "/api/v1"
@@ -29,6 +37,8 @@ class Settings(BaseSettings):
 
     # API
     debug: bool = Field(False, json_schema_extra={"env": "DEBUG"})
+    # GET /metrics is unauthenticated, so it answers 404 unless enabled
+    metrics_enabled: bool = Field(False, json_schema_extra={"env": "METRICS_ENABLED"})
     backend_cors_origins: List[str] = Field(
         ["http://localhost:3000"], json_schema_extra={"env": "BACKEND_CORS_ORIGINS"}
     )
@@ -37,6 +47,31 @@ class Settings(BaseSettings):
 
     db_pool_min: int = Field(1, json_schema_extra={"env": "DB_POOL_MIN"})
     db_pool_max: int = Field(10, json_schema_extra={"env": "DB_POOL_MAX"})
+    # Default statement_timeout; routes can override it (app/middleware/database.py)
+    db_statement_timeout_ms: int = Field(
+        10000, json_schema_extra={"env": "DB_STATEMENT_TIMEOUT_MS"}
+    )
+    # Idle connections are closed after this many seconds; 0 keeps them open
+    db_pool_max_inactive_lifetime: float = Field(
+        300.0, json_schema_extra={"env": "DB_POOL_MAX_INACTIVE_LIFETIME"}
+    )
+    # Resize the pool between db_pool_min and db_pool_adaptive_max by acquire wait
+    db_pool_adaptive: bool = Field(False, json_schema_extra={"env": "DB_POOL_ADAPTIVE"})
+    db_pool_adaptive_max: int = Field(
+        20, json_schema_extra={"env": "DB_POOL_ADAPTIVE_MAX"}
+    )
+    db_pool_target_wait_ms: float = Field(
+        5.0, json_schema_extra={"env": "DB_POOL_TARGET_WAIT_MS"}
+    )
+    db_pool_adjust_interval: float = Field(
+        10.0, json_schema_extra={"env": "DB_POOL_ADJUST_INTERVAL"}
+    )
+
+    # Server-Sent Events (GET /api/v1/events)
+    events_heartbeat_seconds: float = Field(
+        15.0, json_schema_extra={"env": "EVENTS_HEARTBEAT_SECONDS"}
+    )
+    events_queue_size: int = Field(100, json_schema_extra={"env": "EVENTS_QUEUE_SIZE"})
 
 
 settings = Settings()
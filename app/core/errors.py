@@ -17,17 +17,17 @@ class AppError(Exception):
         elif error:
             self.custom_message = str(error)
 
-    def to_response(self, request_id: str) -> web.Response:
-        return web.json_response(
-            {
-                "error": {
-                    "code": self.code,
-                    "message": self.custom_message or self.message,
-                },
-                "request_id": request_id,
+    def to_dict(self, request_id: str) -> dict:
+        return {
+            "error": {
+                "code": self.code,
+                "message": self.custom_message or self.message,
             },
-            status=self.status,
-        )
+            "request_id": request_id,
+        }
+
+    def to_response(self, request_id: str) -> web.Response:
+        return web.json_response(self.to_dict(request_id), status=self.status)
 
 
 class NotFoundError(AppError):
@@ -64,3 +64,9 @@ class UnauthorizedError(AppError):
     status = 401
     code = "unauthorized"
     message = "Unauthorized"
+
+
+class QueryTimeoutError(AppError):
+    status = 503
+    code = "query_timeout"
+    message = "The request took too long to complete"
@@ -18,10 +18,10 @@ class PasswordHasher:
 
 class TokenManager:
     @staticmethod
-    def encode(payload: dict) -> str:
+    def encode(payload: dict, audience: str | None = None) -> str:
         payload = {
             **payload,
-            "aud": settings.JWT_AUDIENCE,
+            "aud": audience or settings.JWT_AUDIENCE,
             "iss": settings.JWT_ISSUER,
         }
         return jwt.encode(
@@ -31,12 +31,12 @@ class TokenManager:
         )
 
     @staticmethod
-    def decode(token: str) -> dict:
+    def decode(token: str, audience: str | None = None) -> dict:
         return jwt.decode(
             token,
             settings.SECRET_KEY,
             algorithms=[settings.ALGORITHM],
-            audience=settings.JWT_AUDIENCE,
+            audience=audience or settings.JWT_AUDIENCE,
             issuer=settings.JWT_ISSUER,
             leeway=settings.JWT_LEEWAY,
             options={"require": ["exp", "iss", "aud"]},
@@ -8,6 +8,7 @@ This package contains all middleware functions organized by functionality:
 - cors: CORS handling middleware
 - logging: Request/response logging middleware
 - rate_limit: Rate limit middleware
+- coalescing: Request coalescing middleware
 """
 
 from .error_handling import error_middleware
@@ -16,6 +17,7 @@ from .authentication import auth_parsing_middleware
 from .cors import make_cors_middleware
 from .logging import request_logging_middleware
 from .rate_limit import rate_limit_middleware
+from .coalescing import coalescing_middleware
 
 __all__ = [
     "error_middleware",
@@ -24,4 +26,5 @@ __all__ = [
     "make_cors_middleware",
     "request_logging_middleware",
     "rate_limit_middleware",
+    "coalescing_middleware",
 ]
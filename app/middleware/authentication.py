@@ -5,12 +5,114 @@ This module contains middleware functions for authentication and authorization.
 """
 
 import functools
-from typing import Iterable, Optional, Set, Dict, Any
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Set, Dict, Any, Tuple
 from aiohttp import web
+from app.core.config import settings
 from app.core.security import TokenManager
 import jwt
 
 
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verified JWT claims, keyed by a SHA-256 digest of the token.
+
+    Entries are valid until the token's exp plus JWT_LEEWAY, the same deadline
+    TokenManager.decode enforces, so a cache hit never accepts a token that
+    verification would reject as expired. Failed verifications are not cached.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return cached claims for the token, or None on a miss."""
+        if self.max_size <= 0:
+            return None
+        digest = self._digest(token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+        valid_until, claims = entry
+        if time.time() > valid_until:
+            del self._entries[digest]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        # Copy so a handler mutating request["claims"] cannot poison the cache
+        return dict(claims)
+
+    def put(self, token: str, claims: Dict[str, Any]):
+        """Cache verified claims until exp + JWT_LEEWAY."""
+        if self.max_size <= 0 or "exp" not in claims:
+            return
+        digest = self._digest(token)
+        valid_until = float(claims["exp"]) + settings.JWT_LEEWAY
+        self._entries[digest] = (valid_until, dict(claims))
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit-rate counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def reset(self):
+        """Clear entries and counters - useful for testing."""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+
+# Global verified token cache instance
+token_cache = VerifiedTokenCache(settings.AUTH_TOKEN_CACHE_SIZE)
+
+
+def reset_token_cache():
+    """Reset the verified token cache - useful for testing."""
+    token_cache.reset()
+
+
+# A browser EventSource can't send an Authorization header, so these routes
+# also accept a short-lived stream token in the token query parameter
+STREAM_TOKEN_ROUTES = {("GET", "/api/v1/events")}
+
+
+def stream_token_audience() -> str:
+    """
+    Audience of stream tokens.
+
+    It differs from the access token audience, so a stream token is never
+    accepted as a bearer token and an access token never in a query string.
+    """
+    return f"{settings.JWT_AUDIENCE}:stream"
+
+
 def _bearer_unauthorized(error: str, desc: str) -> web.Response:
     """Create an unauthorized response with proper Bearer token format."""
     hdr = f'Bearer realm="api", error="{error}", error_description="{desc}"'
@@ -32,9 +134,20 @@ def _extract_bearer(request: web.Request) -> Optional[str]:
     return auth[7:]  # Remove "Bearer " prefix
 
 
+def _extract_stream_token(request: web.Request) -> Optional[str]:
+    """Extract a stream token from the query string of routes that take one."""
+    if (request.method, request.path) not in STREAM_TOKEN_ROUTES:
+        return None
+    return request.query.get("token")
+
+
 def _decode_jwt(token: str) -> Dict[str, Any]:
-    """Decode and verify JWT token."""
-    return TokenManager.decode(token)
+    """Decode and verify JWT token, reusing claims of recently verified tokens."""
+    claims = token_cache.get(token)
+    if claims is None:
+        claims = TokenManager.decode(token)
+        token_cache.put(token, claims)
+    return claims
 
 
 def _scopes_from_claims(claims: Dict[str, Any]) -> Set[str]:
@@ -51,11 +164,13 @@ async def auth_parsing_middleware(request: web.Request, handler):
     """
     Authentication parsing middleware.
 
-    Parses and validates JWT tokens from Authorization headers.
+    Parses and validates JWT tokens from Authorization headers, or stream
+    tokens from the query string of STREAM_TOKEN_ROUTES.
     Sets user and claims in request for downstream handlers.
     """
     token = _extract_bearer(request)
-    if token is None:
+    stream_token = _extract_stream_token(request) if token is None else None
+    if token is None and stream_token is None:
         # Public request; no user
         request["user"] = None
         request["claims"] = None
@@ -63,7 +178,11 @@ async def auth_parsing_middleware(request: web.Request, handler):
         return await handler(request)
 
     try:
-        claims = _decode_jwt(token)
+        if token is None:
+            # Not cached: the cache only holds tokens of the access audience
+            claims = TokenManager.decode(stream_token, stream_token_audience())
+        else:
+            claims = _decode_jwt(token)
     except jwt.ExpiredSignatureError:
         return _bearer_unauthorized("invalid_token", "Token expired")
     except jwt.InvalidTokenError as e:
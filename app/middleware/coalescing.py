@@ -0,0 +1,159 @@
+"""
+Request coalescing middleware for AioHTTP application.
+
+Concurrent identical reads by the same user share one handler execution
+(and with it one set of queries and one serialized body).
+"""
+
+import asyncio
+from typing import Dict, Optional, Tuple
+from aiohttp import web
+from multidict import CIMultiDict
+from app.middleware.rate_limit import _get_canonical_path
+
+# Read routes whose responses only depend on the user, path, query and Accept
+COALESCED_ROUTES = {
+    "/api/v1/todos",
+    "/api/v1/todos/stats",
+    "/api/v1/todos/changes",
+    "/api/v1/todos/board",
+    "/api/v1/todo/{key}",
+    "/api/v1/priorities",
+    "/api/v1/priority/{key}",
+    "/api/v1/statuses",
+    "/api/v1/status/{key}",
+}
+
+# Non-GET routes that don't write, so they don't invalidate the user's flights
+READ_ONLY_ROUTES = {("POST", "/api/v1/todos/lookup")}
+
+# (status, body, headers) of a finished flight; None makes followers run the
+# handler themselves (leader cancelled, or the response cannot be shared)
+Snapshot = Optional[Tuple[int, bytes, CIMultiDict]]
+
+
+class RequestCoalescer:
+    """Tracks in-flight reads and a per-user write generation."""
+
+    def __init__(self):
+        self._flights: Dict[tuple, asyncio.Future] = {}
+        # Bumped when a write by the user starts and ends, so a read issued
+        # after a write never joins a flight that may predate it. Only kept
+        # while the user has writes or flights in progress.
+        self._generations: Dict[str, int] = {}
+        self._writes: Dict[str, int] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def bump(self, user_key: str):
+        self._generations[user_key] = self._generations.get(user_key, 0) + 1
+
+    def begin_write(self, user_key: str):
+        self._writes[user_key] = self._writes.get(user_key, 0) + 1
+        self.bump(user_key)
+
+    def end_write(self, user_key: str):
+        self.bump(user_key)
+        self._writes[user_key] -= 1
+        if not self._writes[user_key]:
+            del self._writes[user_key]
+        self.prune(user_key)
+
+    def prune(self, user_key: str):
+        """Forget the user's generation once no write or flight depends on it."""
+        if user_key in self._writes:
+            return
+        if any(key[0] == user_key for key in self._flights):
+            return
+        self._generations.pop(user_key, None)
+
+    def key(self, request: web.Request, user_key: str) -> tuple:
+        return (
+            user_key,
+            self._generations.get(user_key, 0),
+            request.get("user"),
+            request.path,
+            tuple(sorted(request.query.items())),
+            request.headers.get("Accept", ""),
+        )
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "followers": self.followers,
+        }
+
+    def reset(self):
+        self._flights.clear()
+        self._generations.clear()
+        self._writes.clear()
+        self.leaders = self.followers = 0
+
+
+# Global coalescer instance
+coalescer = RequestCoalescer()
+
+
+def reset_coalescer():
+    """Reset the coalescer state - useful for testing."""
+    coalescer.reset()
+
+
+def _snapshot(response: web.StreamResponse) -> Snapshot:
+    if not isinstance(response, web.Response) or not isinstance(response.body, bytes):
+        return None
+    headers = CIMultiDict(response.headers)
+    headers.popall("Content-Length", None)
+    return response.status, response.body, headers
+
+
+@web.middleware
+async def coalescing_middleware(request: web.Request, handler):
+    """
+    Request coalescing middleware.
+
+    Runs after rate limiting, so every request is still counted and limited
+    on its own; only the handler execution is shared. The first request for
+    a key runs the handler, identical requests arriving while it runs get a
+    copy of its response. Nothing is cached once the flight finishes.
+    """
+    user_key = request.get("user_key")
+    if not user_key:
+        return await handler(request)
+
+    if request.method != "GET":
+        if (request.method, _get_canonical_path(request)) in READ_ONLY_ROUTES:
+            return await handler(request)
+        coalescer.begin_write(user_key)
+        try:
+            return await handler(request)
+        finally:
+            coalescer.end_write(user_key)
+
+    if _get_canonical_path(request) not in COALESCED_ROUTES:
+        return await handler(request)
+
+    key = coalescer.key(request, user_key)
+    flight = coalescer._flights.get(key)
+    if flight is not None:
+        coalescer.followers += 1
+        snapshot = await asyncio.shield(flight)
+        if snapshot is None:
+            return await handler(request)
+        status, body, headers = snapshot
+        return web.Response(body=body, status=status, headers=headers.copy())
+
+    flight = asyncio.get_running_loop().create_future()
+    coalescer._flights[key] = flight
+    coalescer.leaders += 1
+    snapshot = None
+    try:
+        response = await handler(request)
+        snapshot = _snapshot(response)
+        return response
+    finally:
+        del coalescer._flights[key]
+        coalescer.prune(user_key)
+        # Errors are not shared either: followers retry and get their own
+        flight.set_result(snapshot)
@@ -14,6 +14,7 @@ from . import (
     db_connection_middleware,
     auth_parsing_middleware,
     rate_limit_middleware,
+    coalescing_middleware,
 )
 
 
@@ -25,9 +26,11 @@ def get_middleware_stack() -> List[Callable]:
     1. CORS (outermost - handles preflight requests)
     2. Error handling (catches all exceptions)
     3. Request logging (logs all requests)
-    4. Database connection (provides DB connection)
-    5. Authentication (innermost - validates tokens)
-    6. Rate limit (limits requests per second)
+    4. Authentication (validates tokens)
+    5. Rate limit (limits requests per second)
+    6. Request coalescing (shares identical concurrent reads)
+    7. Database connection (innermost - provides DB connection, so rate
+       limited and coalesced requests never hold a pool connection)
 
     Returns:
         List of middleware functions in execution order
@@ -44,9 +47,10 @@ def get_middleware_stack() -> List[Callable]:
         cors_middleware,
         error_middleware,
         request_logging_middleware,
-        db_connection_middleware,
         auth_parsing_middleware,
         rate_limit_middleware,
+        coalescing_middleware,
+        db_connection_middleware,
     ]
 
 
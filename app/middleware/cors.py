@@ -10,6 +10,9 @@ from aiohttp import web
 
 logger = logging.getLogger(__name__)
 
+# Request key holding the CORS headers of an allowed cross-origin request
+CORS_HEADERS_KEY = "cors_headers"
+
 
 def make_cors_middleware(
     allowed_origins: Iterable[str],
@@ -68,19 +71,32 @@ def make_cors_middleware(
             return web.Response(status=204, headers=headers)
 
         # "Regular" CORS request: let through and append headers
-        resp = await handler(request)
-        # Only add if no CORS headers are already set
-        resp.headers.setdefault("Access-Control-Allow-Origin", origin)
-        resp.headers.setdefault("Vary", "Origin")
+        headers = {"Access-Control-Allow-Origin": origin, "Vary": "Origin"}
         if allow_credentials:
-            resp.headers.setdefault("Access-Control-Allow-Credentials", "true")
+            headers["Access-Control-Allow-Credentials"] = "true"
         if exposed:
-            resp.headers.setdefault("Access-Control-Expose-Headers", exposed)
+            headers["Access-Control-Expose-Headers"] = exposed
+        # Streaming handlers send their headers before returning
+        request[CORS_HEADERS_KEY] = headers
+        resp = await handler(request)
+        apply_cors_headers(request, resp)
         return resp
 
     return cors_middleware
 
 
+def apply_cors_headers(request: web.Request, response: web.StreamResponse) -> None:
+    """
+    Add the CORS headers of an allowed cross-origin request to a response.
+
+    The middleware does this once the handler returns, which is too late for
+    a StreamResponse: its headers are sent on prepare(). Streaming handlers
+    call this before prepare(). Headers already set are kept.
+    """
+    for name, value in request.get(CORS_HEADERS_KEY, {}).items():
+        response.headers.setdefault(name, value)
+
+
 def _apply_cors(request: web.Request, response: web.StreamResponse) -> None:
     """
     Apply CORS headers to a response.
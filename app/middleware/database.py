@@ -4,7 +4,46 @@ Database middleware for AioHTTP application.
 This module contains middleware functions for database connection management.
 """
 
+from typing import Dict, Optional, Tuple
 from aiohttp import web
+import asyncpg
+from app.core.errors import QueryTimeoutError
+from app.middleware.rate_limit import _get_canonical_path
+
+# Per-route statement_timeout (ms), keyed by (method, canonical path). Routes not
+# listed run with DB_STATEMENT_TIMEOUT_MS, which is set when a connection is
+# opened and restored by the pool's RESET ALL, so only overrides cost a query.
+STATEMENT_TIMEOUTS: Dict[Tuple[str, str], int] = {
+    # Single-row reads by key
+    ("GET", "/api/v1/todo/{key}"): 2000,
+    ("GET", "/api/v1/priority/{key}"): 2000,
+    ("GET", "/api/v1/status/{key}"): 2000,
+    ("GET", "/api/v1/user/{key}"): 2000,
+    # Exports fetch in batches, but each batch may scan a large part of the table
+    ("GET", "/api/v1/todos/export"): 60000,
+    ("POST", "/api/v1/todos/import"): 60000,
+    ("PATCH", "/api/v1/todos"): 60000,
+    ("DELETE", "/api/v1/todos"): 60000,
+}
+
+
+# Long-lived responses that must not pin a pooled connection for their whole
+# lifetime; their handlers acquire one briefly when they need it
+UNPOOLED_ROUTES = {("GET", "/api/v1/events")}
+
+
+def _get_statement_timeout(request: web.Request) -> Optional[int]:
+    """Return the statement timeout override for the request's route, if any."""
+    return STATEMENT_TIMEOUTS.get((request.method, _get_canonical_path(request)))
+
+
+def _is_statement_timeout(exc: Optional[BaseException]) -> bool:
+    """Check the exception and whatever it was raised from for a cancelled query."""
+    while exc is not None:
+        if isinstance(exc, asyncpg.exceptions.QueryCanceledError):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
 
 
 @web.middleware
@@ -14,8 +53,22 @@ async def db_connection_middleware(request: web.Request, handler):
 
     Provides a database connection to each request handler.
     Ensures proper connection cleanup after request processing.
+    Acquisition goes through the pool monitor, which records wait times.
+
+    If the client disconnects, aiohttp cancels the handler; asyncpg then
+    cancels the running query on the server before the connection is released.
     """
-    pool = request.app["db_pool"]
-    async with pool.acquire() as conn:
-        request["conn"] = conn
+    if (request.method, _get_canonical_path(request)) in UNPOOLED_ROUTES:
         return await handler(request)
+    async with request.app["db_pool_monitor"].acquire() as conn:
+        timeout = _get_statement_timeout(request)
+        if timeout is not None:
+            await conn.execute(f"SET statement_timeout = {int(timeout)}")
+        request["conn"] = conn
+        try:
+            return await handler(request)
+        except Exception as e:
+            # Endpoints wrap unexpected errors in AppError, so look at the chain
+            if _is_statement_timeout(e):
+                raise QueryTimeoutError() from e
+            raise
@@ -10,10 +10,42 @@ from aiohttp import web
 from app.core.errors import AppError
 from app.middleware.logging import get_request_id  # helper below
 from app.middleware.cors import _apply_cors
+from app.utils.serialization import respond
 
 logger = logging.getLogger(__name__)
 
 
+def error_response(request: web.Request, exc: Exception) -> web.Response:
+    """
+    Convert an exception raised by a handler into the API's error response.
+
+    Errors are encoded like any other response, so a client that asked for
+    MessagePack gets its errors as MessagePack too.
+    """
+    if isinstance(exc, AppError):
+        logger.error(f"AppError: {exc.message}")
+        return respond(request, exc.to_dict(get_request_id(request)), exc.status)
+    if isinstance(exc, web.HTTPException):
+        logger.error(f"HTTPException: {exc.text or exc.reason}")
+        return respond(
+            request,
+            {
+                "error": {"code": "http_error", "message": exc.text or exc.reason},
+                "request_id": get_request_id(request),
+            },
+            status=exc.status,
+        )
+    logger.error(f"Unhandled server error: {exc}")
+    return respond(
+        request,
+        {
+            "error": {"code": "internal_error", "message": "Internal Server Error"},
+            "request_id": get_request_id(request),
+        },
+        status=500,
+    )
+
+
 @web.middleware
 async def error_middleware(request: web.Request, handler):
     """
@@ -24,30 +56,7 @@ async def error_middleware(request: web.Request, handler):
     """
     try:
         return await handler(request)
-    except AppError as ex:
-        logger.error(f"AppError: {ex.message}")
-        resp = ex.to_response(get_request_id(request))
-        _apply_cors(request, resp)
-        return resp
-    except web.HTTPException as ex:
-        logger.error(f"HTTPException: {ex.text or ex.reason}")
-        resp = web.json_response(
-            {
-                "error": {"code": "http_error", "message": ex.text or ex.reason},
-                "request_id": get_request_id(request),
-            },
-            status=ex.status,
-        )
-        _apply_cors(request, resp)
-        return resp
-    except Exception as e:
-        logger.error(f"Unhandled server error: {e}")
-        resp = web.json_response(
-            {
-                "error": {"code": "internal_error", "message": "Internal Server Error"},
-                "request_id": get_request_id(request),
-            },
-            status=500,
-        )
+    except Exception as ex:
+        resp = error_response(request, ex)
         _apply_cors(request, resp)
         return resp
@@ -11,6 +11,7 @@ from collections import defaultdict, deque
 from typing import Dict, List, Tuple, Optional
 from aiohttp import web
 from dataclasses import dataclass
+from app.utils.serialization import respond
 
 
 @dataclass
@@ -135,6 +136,37 @@ RATE_LIMIT_POLICIES = [
     # Public endpoints - IP based
     RateLimitPolicy("GET", "/", "ip", [RateLimitWindow(60, 60)]),  # 60 per minute
     RateLimitPolicy("GET", "/health", "ip", [RateLimitWindow(60, 60)]),  # 60 per minute
+    # 60 per minute
+    RateLimitPolicy("GET", "/metrics", "ip", [RateLimitWindow(60, 60)]),
+    # Batch - User key based; every sub-request also counts against its own route
+    RateLimitPolicy(
+        "POST",
+        "/api/v1/batch",
+        "user",
+        [
+            RateLimitWindow(30, 60),  # 30 per minute
+            RateLimitWindow(500, 3600),  # 500 per hour
+        ],
+    ),
+    # Event stream - User key based; limits reconnect storms
+    RateLimitPolicy(
+        "GET",
+        "/api/v1/events",
+        "user",
+        [
+            RateLimitWindow(10, 60),  # 10 per minute
+            RateLimitWindow(100, 3600),  # 100 per hour
+        ],
+    ),
+    RateLimitPolicy(
+        "POST",
+        "/api/v1/events/token",
+        "user",
+        [
+            RateLimitWindow(10, 60),  # 10 per minute
+            RateLimitWindow(100, 3600),  # 100 per hour
+        ],
+    ),
     # Token endpoint - IP based with multi-window
     RateLimitPolicy(
         "POST",
@@ -210,6 +242,51 @@ RATE_LIMIT_POLICIES = [
             RateLimitWindow(200, 60),  # 200 per minute
         ],
     ),
+    RateLimitPolicy(
+        "GET",
+        "/api/v1/todos/stats",
+        "user",
+        [
+            RateLimitWindow(10, 1),  # 10 per second
+            RateLimitWindow(200, 60),  # 200 per minute
+        ],
+    ),
+    RateLimitPolicy(
+        "POST",
+        "/api/v1/todos/lookup",
+        "user",
+        [
+            RateLimitWindow(10, 1),  # 10 per second
+            RateLimitWindow(200, 60),  # 200 per minute
+        ],
+    ),
+    RateLimitPolicy(
+        "GET",
+        "/api/v1/todos/changes",
+        "user",
+        [
+            RateLimitWindow(10, 1),  # 10 per second
+            RateLimitWindow(200, 60),  # 200 per minute
+        ],
+    ),
+    RateLimitPolicy(
+        "GET",
+        "/api/v1/todos/board",
+        "user",
+        [
+            RateLimitWindow(10, 1),  # 10 per second
+            RateLimitWindow(200, 60),  # 200 per minute
+        ],
+    ),
+    RateLimitPolicy(
+        "GET",
+        "/api/v1/todos/export",
+        "user",
+        [
+            RateLimitWindow(5, 60),  # 5 per minute
+            RateLimitWindow(50, 3600),  # 50 per hour
+        ],
+    ),
     RateLimitPolicy(
         "GET",
         "/api/v1/todo/{key}",
@@ -228,6 +305,33 @@ RATE_LIMIT_POLICIES = [
             RateLimitWindow(100, 3600),  # 100 per hour
         ],
     ),
+    RateLimitPolicy(
+        "POST",
+        "/api/v1/todos/import",
+        "user",
+        [
+            RateLimitWindow(5, 60),  # 5 per minute
+            RateLimitWindow(20, 3600),  # 20 per hour
+        ],
+    ),
+    RateLimitPolicy(
+        "PATCH",
+        "/api/v1/todos",
+        "user",
+        [
+            RateLimitWindow(10, 60),  # 10 per minute
+            RateLimitWindow(100, 3600),  # 100 per hour
+        ],
+    ),
+    RateLimitPolicy(
+        "DELETE",
+        "/api/v1/todos",
+        "user",
+        [
+            RateLimitWindow(10, 60),  # 10 per minute
+            RateLimitWindow(50, 3600),  # 50 per hour
+        ],
+    ),
     RateLimitPolicy(
         "PUT",
         "/api/v1/todo/{key}",
@@ -443,13 +547,18 @@ def _create_rate_limit_headers(
     return headers
 
 
-@web.middleware
-async def rate_limit_middleware(request: web.Request, handler):
-    """Rate limiting middleware with sliding window and multi-window support."""
-    # Find matching policy
+def check_rate_limit(
+    request: web.Request,
+) -> Tuple[Optional[web.Response], Dict[str, str]]:
+    """
+    Check the request against its route's policy and record it when allowed.
+
+    Returns (429 response if the limit is exceeded, rate limit headers for the
+    response). Also used for the sub-requests of POST /api/v1/batch.
+    """
     policy = _find_matching_policy(request)
     if not policy:
-        return await handler(request)
+        return None, {}
 
     # Get identity key
     identity = _get_identity_key(request, policy)
@@ -469,20 +578,29 @@ async def rate_limit_middleware(request: web.Request, handler):
         retry_after = max(1, earliest_reset - int(time.time()))
         headers["Retry-After"] = str(retry_after)
 
-        return web.json_response(
+        response = respond(
+            request,
             {"error": {"code": "rate_limited", "message": "Too Many Requests"}},
             status=429,
-            headers=headers,
         )
+        response.headers.update(headers)
+        return response, headers
 
     # Record the request
     _rate_limiter.record_request(policy_key, identity, policy.windows)
+    return None, _create_rate_limit_headers(window_info)
+
+
+@web.middleware
+async def rate_limit_middleware(request: web.Request, handler):
+    """Rate limiting middleware with sliding window and multi-window support."""
+    rejected, headers = check_rate_limit(request)
+    if rejected is not None:
+        return rejected
 
-    # Add rate limit headers to response
     response = await handler(request)
-    headers = _create_rate_limit_headers(window_info)
 
-    # Update response headers
+    # Add rate limit headers to response
     for key, value in headers.items():
         response.headers[key] = value
 
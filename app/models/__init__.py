@@ -2,3 +2,5 @@ from .todo import Todo
 from .priority import Priority
 from .user import User
 from .status import Status
+from .user_counter import UserCounter
+from .todo_tombstone import TodoTombstone
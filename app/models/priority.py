@@ -1,6 +1,7 @@
 from sqlalchemy import (
     Column,
     Integer,
+    BigInteger,
     String,
     DateTime,
     Text,
@@ -21,7 +22,8 @@ class Priority(Base):
     description = Column(Text, nullable=True)
     color = Column(String(100), nullable=False)
     icon = Column(String(100), nullable=True)  # Icon identifier for frontend
-    order = Column(Integer, nullable=False)
+    # Sparse sort key; the API's dense order is computed from it on read
+    rank = Column(BigInteger, nullable=False)
     user_key = Column(String(36), ForeignKey("users.key"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -29,7 +31,13 @@ class Priority(Base):
     # Index and constraints for user_key
     __table_args__ = (
         UniqueConstraint("user_key", "name", name="uq_priority_user_name"),
-        UniqueConstraint("user_key", "order", name="uq_priority_user_order"),
+        UniqueConstraint(
+            "user_key",
+            "rank",
+            name="uq_priority_user_rank",
+            deferrable=True,
+            initially="IMMEDIATE",
+        ),
         Index("ix_priority_user_key", "user_key"),
         Index("ix_priority_user_key_key", "user_key", "key"),
     )
@@ -38,14 +46,14 @@ class Priority(Base):
         return (
             f"Priority(id={self.id}, name='{self.name}',"
             f" key='{self.key}', color='{self.color}', icon='{self.icon}',"
-            f" order={self.order}, user_key={self.user_key})"
+            f" rank={self.rank}, user_key={self.user_key})"
         )
 
     def __repr__(self):
         return (
             f"<Priority(id={self.id}, name='{self.name}',"
             f" key='{self.key}', color='{self.color}', icon='{self.icon}',"
-            f" order={self.order}, user_key={self.user_key})>"
+            f" rank={self.rank}, user_key={self.user_key})>"
         )
 
     def to_dict(self):
@@ -57,7 +65,7 @@ class Priority(Base):
             "description": self.description,
             "color": self.color,
             "icon": self.icon,
-            "order": self.order,
+            "rank": self.rank,
             "user_key": self.user_key,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
@@ -70,7 +78,7 @@ class Priority(Base):
         print(f"   Key: {self.key}")
         print(f"   Color: {self.color}")
         print(f"   Icon: {self.icon}")
-        print(f"   Order: {self.order}")
+        print(f"   Rank: {self.rank}")
         print(f"   User Key: {self.user_key}")
         if self.description:
             print(f"   Description: {self.description}")
@@ -1,4 +1,13 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import (
+    Column,
+    Integer,
+    BigInteger,
+    String,
+    Text,
+    DateTime,
+    Boolean,
+    UniqueConstraint,
+)
 from sqlalchemy.sql import func
 from db.database import Base
 
@@ -11,13 +20,24 @@ class Status(Base):
     name = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
     user_key = Column(String(36), nullable=False)
-    order = Column(Integer, nullable=False)
+    # Sparse sort key; the API's dense order is computed from it on read
+    rank = Column(BigInteger, nullable=False)
     color = Column(String(36), nullable=False)
     icon = Column(String(36), nullable=False)
     is_default = Column(Boolean, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        UniqueConstraint(
+            "user_key",
+            "rank",
+            name="uq_status_user_rank",
+            deferrable=True,
+            initially="IMMEDIATE",
+        ),
+    )
+
     def __str__(self):
         return self.name
 
@@ -31,7 +51,7 @@ class Status(Base):
             "name": self.name,
             "description": self.description,
             "user_key": self.user_key,
-            "order": self.order,
+            "rank": self.rank,
             "color": self.color,
             "icon": self.icon,
             "is_default": self.is_default,
@@ -2,40 +2,92 @@
 from sqlalchemy import (
     Column,
     Integer,
+    BigInteger,
     String,
     Boolean,
     DateTime,
     Text,
     ForeignKey,
     Index,
+    PrimaryKeyConstraint,
+    UniqueConstraint,
 )
 from sqlalchemy.sql import func
 from db.database import Base
 
 
 class Todo(Base):
+    """
+    Partitioned by HASH (user_key); the partitions are created by migration
+    9c4e2b7f1a35. Partitioned tables need the partition key in every unique
+    key, so the primary key is (user_key, id) and key is unique per user.
+    """
+
     __tablename__ = "todos"
 
-    id = Column(Integer, primary_key=True, index=True)
-    key = Column(String(36), unique=True, nullable=False)
+    id = Column(Integer, nullable=False)
+    key = Column(String(36), nullable=False)
     title = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
     completed = Column(Boolean, default=False)
     priority = Column(String(36), ForeignKey("priorities.key"), nullable=False)
     user_key = Column(String(36), ForeignKey("users.key"), nullable=False)
     status = Column(String(36), ForeignKey("statuses.key"), nullable=False)
+    # Copies of priorities.rank / statuses.rank kept in sync by triggers
+    priority_order = Column(BigInteger, nullable=True)
+    status_order = Column(BigInteger, nullable=True)
+    # Drawn from todo_change_seq by a trigger on every insert and update
+    change_seq = Column(BigInteger, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Index for user_key
     __table_args__ = (
-        Index("ix_todo_user_key", "user_key"),
+        PrimaryKeyConstraint("user_key", "id", name="pk_todos"),
+        UniqueConstraint("user_key", "key", name="uq_todos_user_key_key"),
         Index("ix_todo_priority", "priority"),
         Index("ix_todo_completed", "completed"),
-        Index("ix_todo_user_key_key", "user_key", "key"),
         Index("ix_todo_user_key_completed", "user_key", "completed"),
         Index("ix_todo_user_key_priority", "user_key", "priority"),
         Index("ix_todo_user_key_status", "user_key", "status"),
+        # One index per list sort
+        Index(
+            "ix_todo_user_completed_priority_order",
+            "user_key",
+            "completed",
+            "priority_order",
+            id.desc(),
+        ),
+        Index("ix_todo_user_priority_order", "user_key", "priority_order", id.desc()),
+        Index(
+            "ix_todo_user_priority_order_title", "user_key", "priority_order", "title"
+        ),
+        Index("ix_todo_user_title", "user_key", "title", id.desc()),
+        Index("ix_todo_user_title_desc", "user_key", title.desc(), id.desc()),
+        Index("ix_todo_user_status_order", "user_key", "status_order", id.desc()),
+        Index(
+            "ix_todo_user_status_order_desc",
+            "user_key",
+            status_order.desc(),
+            id.desc(),
+        ),
+        Index(
+            "ix_todo_user_completed_status_order",
+            "user_key",
+            "completed",
+            "status_order",
+            id.desc(),
+        ),
+        Index(
+            "ix_todo_user_priority_status_order",
+            "user_key",
+            "priority_order",
+            "status_order",
+            id.desc(),
+        ),
+        # Delta sync (GET /api/v1/todos/changes)
+        Index("ix_todo_user_change_seq", "user_key", "change_seq"),
+        {"postgresql_partition_by": "HASH (user_key)"},
     )
 
     def __str__(self):
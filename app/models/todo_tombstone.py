@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, BigInteger, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from db.database import Base
+
+
+class TodoTombstone(Base):
+    """
+    A deleted todo, recorded by a trigger so delta syncs can report deletes.
+
+    change_seq shares todo_change_seq with todos.change_seq.
+    """
+
+    __tablename__ = "todo_tombstones"
+
+    key = Column(String(36), primary_key=True)
+    user_key = Column(
+        String(36), ForeignKey("users.key", ondelete="CASCADE"), nullable=False
+    )
+    change_seq = Column(BigInteger, nullable=False)
+    deleted_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_todo_tombstone_user_change_seq", "user_key", "change_seq"),
+    )
+
+    def __repr__(self):
+        return f"<TodoTombstone {self.key} seq={self.change_seq}>"
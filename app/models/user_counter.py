@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, BigInteger, ForeignKey
+from db.database import Base
+
+
+class UserCounter(Base):
+    """
+    Per-user row counts maintained by triggers on todos, priorities and statuses.
+
+    kind is one of 'todos', 'completed', 'priorities', 'statuses' (ref is '')
+    or 'priority' / 'status' and the open todos of those, 'priority_open' /
+    'status_open' (ref is the priority or status key).
+    """
+
+    __tablename__ = "user_counters"
+
+    user_key = Column(
+        String(36), ForeignKey("users.key", ondelete="CASCADE"), primary_key=True
+    )
+    kind = Column(String(16), primary_key=True)
+    ref = Column(String(36), primary_key=True, default="")
+    count = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<UserCounter {self.user_key} {self.kind}:{self.ref}={self.count}>"
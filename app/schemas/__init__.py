@@ -15,3 +15,9 @@ from .status import (
     StatusListResponse,
     StatusReorder,
 )
+from .batch import (
+    BatchRequest,
+    BatchSubRequest,
+    BatchResponse,
+    BatchSubResponse,
+)
@@ -0,0 +1,31 @@
+# app/schemas/batch.py
+from pydantic import BaseModel, Field
+from typing import Any, Literal, Optional
+
+BATCH_MAX_REQUESTS = 20
+
+
+class BatchSubRequest(BaseModel):
+    id: Optional[str] = None
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"]
+    path: str = Field(..., pattern=r"^/api/v1/")
+    body: Optional[Any] = None
+
+
+class BatchRequest(BaseModel):
+    requests: list[BatchSubRequest] = Field(
+        ..., min_length=1, max_length=BATCH_MAX_REQUESTS
+    )
+    transaction: bool = False
+
+
+class BatchSubResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    body: Optional[Any] = None
+
+
+class BatchResponse(BaseModel):
+    responses: list[BatchSubResponse]
+    committed: bool
+    success: bool
@@ -0,0 +1,20 @@
+# app/schemas/constraints.py
+from typing import Annotated
+from pydantic import Field
+
+# pydantic searches patterns anywhere in the string unless they are anchored
+NOT_BLANK = r"\S"
+HEX_COLOR = r"^#[0-9a-fA-F]{6}$"
+USERNAME = r"^[a-zA-Z0-9_]+$"
+# Lookaheads need regex_engine="python-re" on the model
+PASSWORD = r"^(?=[^A-Z]*[A-Z])(?=[^a-z]*[a-z])(?=\D*\d)"
+
+Name = Annotated[str, Field(pattern=NOT_BLANK, max_length=100)]
+Description = Annotated[str, Field(max_length=1000)]
+Color = Annotated[str, Field(pattern=HEX_COLOR)]
+Icon = Annotated[str, Field(pattern=NOT_BLANK, max_length=100)]
+Order = Annotated[int, Field(gt=0)]
+PriorityKey = Annotated[str, Field(pattern=NOT_BLANK, max_length=36)]
+Username = Annotated[str, Field(pattern=USERNAME, max_length=50)]
+Password = Annotated[str, Field(pattern=PASSWORD, min_length=8, max_length=128)]
+CurrentPassword = Annotated[str, Field(pattern=NOT_BLANK)]
@@ -2,31 +2,32 @@
 from pydantic import BaseModel, Field, model_serializer
 from typing import Optional
 from datetime import datetime
+from app.schemas.constraints import Color, Icon, Name, Order
 
 
 class PriorityCreate(BaseModel):
-    name: str = Field(...)
+    name: Name = Field(...)
     description: Optional[str] = None
-    color: str = Field(...)
-    icon: str = Field(...)
-    order: int = Field(1)
+    color: Color = Field(...)
+    icon: Icon = Field(...)
+    order: Order = Field(...)
     user_key: str
 
 
 class PriorityUpdate(BaseModel):
-    name: str = Field(...)
+    name: Name = Field(...)
     description: Optional[str] = None
-    color: str = Field(...)
-    icon: Optional[str] = Field(None)
-    order: int = Field(1)
+    color: Color = Field(...)
+    icon: Optional[Icon] = Field(None)
+    order: Order = Field(1)
 
 
 class PriorityPatch(BaseModel):
-    name: Optional[str] = Field(None)
+    name: Optional[Name] = Field(None)
     description: Optional[str] = None
-    color: Optional[str] = Field(None)
-    icon: Optional[str] = Field(None)
-    order: Optional[int] = Field(None)
+    color: Optional[Color] = Field(None)
+    icon: Optional[Icon] = Field(None)
+    order: Optional[Order] = Field(None)
 
 
 class PriorityReorder(BaseModel):
@@ -61,7 +62,8 @@ class PriorityResponse(BaseModel):
 
 
 class PriorityListResponse(BaseModel):
-    priorities: list[PriorityResponse]
+    # Serialized PriorityResponses, narrowed to the requested fields= if any
+    priorities: list[dict]
     total: int
     page: int
     size: int
@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel, Field, model_serializer
 from typing import List
+from app.schemas.constraints import Color, Icon, Name, Order
 
 
 class Status(BaseModel):
@@ -19,21 +20,21 @@ class Status(BaseModel):
 
 
 class StatusCreate(BaseModel):
-    name: str
+    name: Name
     description: Optional[str] = None
     user_key: str
-    order: int
-    color: str
-    icon: str
+    order: Order
+    color: Color
+    icon: Icon
     is_default: bool
 
 
 class StatusUpdate(BaseModel):
-    name: str
+    name: Name
     description: Optional[str] = None
-    order: int
-    color: str
-    icon: str
+    order: Order
+    color: Color
+    icon: Icon
     is_default: bool
 
 
@@ -43,11 +44,11 @@ class StatusReorder(BaseModel):
 
 
 class StatusPatch(BaseModel):
-    name: Optional[str] = None
+    name: Optional[Name] = None
     description: Optional[str] = None
-    order: Optional[int] = None
-    color: Optional[str] = None
-    icon: Optional[str] = None
+    order: Optional[Order] = None
+    color: Optional[Color] = None
+    icon: Optional[Icon] = None
     is_default: Optional[bool] = None
 
 
@@ -80,7 +81,8 @@ class StatusResponse(BaseModel):
 
 
 class StatusListResponse(BaseModel):
-    statuses: List[StatusResponse]
+    # Serialized StatusResponses, narrowed to the requested fields= if any
+    statuses: List[dict]
     total: int
     page: int
     size: int
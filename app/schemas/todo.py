@@ -2,33 +2,41 @@
 from pydantic import BaseModel, Field, model_serializer
 from typing import Optional
 from datetime import datetime
+from app.schemas.constraints import Description, Name, PriorityKey
 
 
 class TodoCreate(BaseModel):
-    title: str = Field(...)
-    description: Optional[str] = None
-    priority: str = Field(...)
-    completed: Optional[bool] = None
+    title: Name = Field(...)
+    description: Optional[Description] = None
+    priority: PriorityKey = Field(...)
+    completed: bool = Field(...)
     user_key: str
     status: str = Field(...)
 
 
 class TodoUpdate(BaseModel):
-    title: str = Field(...)
-    description: Optional[str] = None
+    title: Name = Field(...)
+    description: Optional[Description] = None
     completed: Optional[bool] = None
-    priority: str = Field(...)
+    priority: PriorityKey = Field(...)
     status: str = Field(...)
 
 
 class TodoPatch(BaseModel):
-    title: Optional[str] = None
-    description: Optional[str] = None
+    title: Optional[Name] = None
+    description: Optional[Description] = None
     completed: Optional[bool] = None
-    priority: Optional[str] = None
+    priority: Optional[PriorityKey] = None
     status: Optional[str] = None
 
 
+class TodoImportRow(BaseModel):
+    """The free-text fields of an imported row; the import resolves the rest."""
+
+    title: Name
+    description: Optional[Description] = None
+
+
 class TodoResponse(BaseModel):
     key: str
     title: str
@@ -56,10 +64,77 @@ class TodoResponse(BaseModel):
 
 
 class TodoListResponse(BaseModel):
-    todos: list[TodoResponse]
+    # Serialized TodoResponses, narrowed to the requested fields= if any
+    todos: list[dict]
     total: int
     page: int
     size: int
     success: bool
     next_link: Optional[str] = None
     prev_link: Optional[str] = None
+
+
+class TodoLookup(BaseModel):
+    keys: list[str] = Field(..., min_length=1)
+
+
+class TodoLookupResponse(BaseModel):
+    # Serialized TodoResponses in the requested order
+    todos: list[dict]
+    missing: list[str]
+    success: bool
+
+
+class TodoBulkResponse(BaseModel):
+    affected: int
+    success: bool
+
+
+class TodoImportResponse(BaseModel):
+    imported: int
+    success: bool
+
+
+class TodoStatsBucket(BaseModel):
+    key: str
+    name: str
+    count: int
+
+
+class TodoStatsResponse(BaseModel):
+    total: int
+    completed: int
+    open: int
+    by_status: list[TodoStatsBucket]
+    by_priority: list[TodoStatsBucket]
+    success: bool
+
+
+class TodoTombstoneResponse(BaseModel):
+    key: str
+    deleted_at: datetime
+
+    @model_serializer
+    def ser_model(self) -> dict:
+        return {"key": self.key, "deleted_at": self.deleted_at.isoformat()}
+
+
+class TodoChangesResponse(BaseModel):
+    changed: list[TodoResponse]
+    deleted: list[TodoTombstoneResponse]
+    next_token: str
+    has_more: bool
+    success: bool
+
+
+class TodoBoardColumn(BaseModel):
+    # Serialized StatusResponse and TodoResponses, todos narrowed to fields=
+    status: dict
+    todos: list[dict]
+    count: int
+    next_cursor: Optional[str] = None
+
+
+class TodoBoardResponse(BaseModel):
+    columns: list[TodoBoardColumn]
+    success: bool
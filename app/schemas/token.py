@@ -18,5 +18,14 @@ class Token(BaseModel):
         }
 
 
+class StreamToken(BaseModel):
+    token: str
+    expires_at: datetime
+
+    @model_serializer
+    def ser_model(self) -> dict:
+        return {"token": self.token, "expires_at": self.expires_at.isoformat()}
+
+
 class TokenData(BaseModel):
     username: str | None = None
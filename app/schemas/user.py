@@ -1,6 +1,7 @@
 from pydantic import BaseModel, EmailStr, ConfigDict, model_serializer
 from typing import Optional, List
 from datetime import datetime
+from app.schemas.constraints import CurrentPassword, Name, Password, Username
 
 
 class UserBase(BaseModel):
@@ -11,22 +12,26 @@ class UserBase(BaseModel):
 
 
 class UserCreate(BaseModel):
-    name: str
-    username: str
+    name: Name
+    username: Username
     email: EmailStr
-    password: str
+    password: Password
     is_active: bool = True
 
+    model_config = ConfigDict(regex_engine="python-re")
+
 
 class UserUpdate(BaseModel):
-    name: Optional[str] = None
+    name: Optional[Name] = None
     email: Optional[EmailStr] = None
     is_active: Optional[bool] = None
 
 
 class UserUpdatePassword(BaseModel):
-    current_password: str
-    password: str
+    current_password: CurrentPassword
+    password: Password
+
+    model_config = ConfigDict(regex_engine="python-re")
 
 
 class UserInDBBase(UserBase):
@@ -77,7 +82,8 @@ class UserResponse(BaseModel):
 
 
 class UserListResponse(BaseModel):
-    users: List[UserResponse]
+    # Serialized UserResponses, narrowed to the requested fields= if any
+    users: List[dict]
     total: int
     page: int
     size: int
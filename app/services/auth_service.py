@@ -24,12 +24,14 @@ class AuthService:
             return False
         return user
 
-    def create_access_token(data: dict, expires_delta: timedelta | None = None):
+    def create_access_token(
+        data: dict, expires_delta: timedelta | None = None, audience: str | None = None
+    ):
         to_encode = data.copy()
         if expires_delta:
             expire = datetime.now(timezone.utc) + expires_delta
         else:
             expire = datetime.now(timezone.utc) + timedelta(minutes=15)
         to_encode.update({"exp": expire})
-        encoded_jwt = TokenManager.encode(to_encode)
+        encoded_jwt = TokenManager.encode(to_encode, audience)
         return encoded_jwt
@@ -1,5 +1,4 @@
 # app/services/priority_service.py
-from app.models.priority import Priority
 from app.schemas.priority import (
     PriorityCreate,
     PriorityPatch,
@@ -7,8 +6,11 @@ from app.schemas.priority import (
     PriorityReorder,
 )
 import uuid
+from typing import Optional
 import asyncpg
 from app.core.errors import AppError, NotFoundError, ValidationError
+from app.utils.fields import select_columns
+from app.utils.ordering import lock_ranks, rank_at, ranked_columns, ranked_rows
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,18 +20,19 @@ class PriorityService:
     @staticmethod
     async def create_priority(
         conn: asyncpg.Connection, priority: PriorityCreate, user_key: str
-    ) -> Priority:
+    ) -> asyncpg.Record:
         async with conn.transaction():
             priority_key = str(uuid.uuid4())
+            rank = await rank_at(conn, "priorities", user_key, priority.order)
             db_priority = await conn.fetchrow(
-                """
-                INSERT INTO priorities
+                f"""
+                INSERT INTO priorities AS p
                         ( "key"
                         , "name"
                         , "description"
                         , "color"
                         , "icon"
-                        , "order"
+                        , "rank"
                         , "user_key")
                     VALUES ( $1
                         , $2
@@ -37,14 +40,14 @@ class PriorityService:
                         , $4
                         , $5
                         , $6
-                        , $7) RETURNING *
+                        , $7) RETURNING {ranked_columns("priorities", "p", None)}
                 """,
                 priority_key,
                 priority.name,
                 priority.description,
                 priority.color,
                 priority.icon,
-                priority.order,
+                rank,
                 user_key,
             )
             return db_priority
@@ -75,15 +78,39 @@ class PriorityService:
 
     @staticmethod
     async def get_priorities(
-        conn: asyncpg.Connection, user_key: str, skip: int = 0, limit: int = 10
-    ) -> list[Priority]:
+        conn: asyncpg.Connection,
+        user_key: str,
+        skip: int = 0,
+        limit: int = 10,
+        fields: Optional[list[str]] = None,
+        with_counts: bool = False,
+    ) -> list[asyncpg.Record]:
+        """
+        A page of the user's priorities in order.
+
+        with_counts adds todo_count and open_todo_count columns, read from the
+        counters the todo triggers maintain rather than by counting todos.
+        """
+        columns = select_columns("p", fields)
+        joins = ""
+        if with_counts:
+            columns += (
+                ", COALESCE(ct.count, 0) AS todo_count"
+                ", COALESCE(co.count, 0) AS open_todo_count"
+            )
+            joins = """
+                LEFT JOIN user_counters ct ON ct.user_key = p.user_key
+                AND ct.kind = 'priority' AND ct.ref = p.key
+                LEFT JOIN user_counters co ON co.user_key = p.user_key
+                AND co.kind = 'priority_open' AND co.ref = p.key
+            """
         try:
             resp = await conn.fetch(
-                """
-                SELECT p.*
-                FROM priorities p
-                WHERE p.user_key = $1
-                ORDER BY p.order ASC
+                f"""
+                SELECT {columns}
+                FROM {ranked_rows("priorities")} p
+                {joins}
+                ORDER BY p.rank ASC
                 OFFSET $2
                 LIMIT $3
                 """,
@@ -96,25 +123,29 @@ class PriorityService:
             raise AppError(e)
 
     @staticmethod
-    async def get_priority(
-        conn: asyncpg.Connection, priority_id: int, user_key: str
-    ) -> Priority:
+    async def get_priority_by_key(
+        conn: asyncpg.Connection,
+        key: str,
+        user_key: str,
+        fields: Optional[list[str]] = None,
+    ) -> asyncpg.Record:
+        """Fetch a priority by its UUID key in a single indexed lookup."""
         try:
             resp = await conn.fetchrow(
-                """
-                SELECT p.*
+                f"""
+                SELECT {ranked_columns("priorities", "p", fields)}
                 FROM priorities p
-                WHERE p.id = $1
+                WHERE p.key = $1
                 AND p.user_key = $2
                 """,
-                priority_id,
+                key,
                 user_key,
             )
             if not resp:
-                raise NotFoundError(
-                    ValueError(f"Priority with id {priority_id} not found")
-                )
+                raise NotFoundError(f"Priority with key {key} not found")
             return resp
+        except NotFoundError:
+            raise
         except Exception as e:
             raise AppError(e)
 
@@ -124,12 +155,12 @@ class PriorityService:
         priority_id: int,
         priority_update: PriorityUpdate,
         user_key: str,
-    ) -> Priority:
+    ) -> asyncpg.Record:
         async with conn.transaction():
             # First check if priority exists
             db_priority = await conn.fetchrow(
-                """
-                SELECT p.*
+                f"""
+                SELECT {ranked_columns("priorities", "p", None)}
                 FROM priorities p
                 WHERE p.id = $1
                 AND p.user_key = $2
@@ -147,6 +178,10 @@ class PriorityService:
 
             for field, value in priority_update.model_dump().items():
                 if field in ["name", "description", "color", "icon", "order"]:
+                    if field == "order":
+                        field, value = "rank", await rank_at(
+                            conn, "priorities", user_key, value, priority_id
+                        )
                     update_fields.append(f'"{field}" = ${param_count}')
                     values.append(value)
                     param_count += 1
@@ -160,57 +195,99 @@ class PriorityService:
 
             # Execute the update
             query = f"""
-                UPDATE priorities
+                UPDATE priorities p
                 SET {', '.join(update_fields)}
                 WHERE id = ${param_count} AND user_key = ${param_count + 1}
-                RETURNING *
+                RETURNING {ranked_columns("priorities", "p", None)}
                 """
 
             updated_priority = await conn.fetchrow(query, *values)
             return updated_priority
 
     @staticmethod
-    async def delete_priority(
-        conn: asyncpg.Connection, priority_id: int, user_key: str
+    async def delete_priority_by_key(
+        conn: asyncpg.Connection,
+        key: str,
+        user_key: str,
+        reassign_to: Optional[str] = None,
     ) -> bool:
-        async with conn.transaction():
-            db_priority = await conn.fetchrow(
-                """
-                SELECT p.*
-                FROM priorities p
-                WHERE p.id = $1
-                AND p.user_key = $2
-                """,
-                priority_id,
-                user_key,
-            )
+        """
+        Delete a priority by its UUID key using a single DELETE ... RETURNING.
 
-            if not db_priority:
-                raise NotFoundError(f"Priority with id {priority_id} not found")
+        With reassign_to, the todos of the priority first move to that priority of
+        the same user in one UPDATE, in the same transaction as the delete.
+        Without it, a priority that todos still use can't be deleted.
+        """
+        async with conn.transaction():
+            if reassign_to is not None:
+                await PriorityService._reassign_todos(conn, key, reassign_to, user_key)
+            try:
+                deleted_id = await conn.fetchval(
+                    """
+                    DELETE FROM priorities p
+                    WHERE p.key = $1
+                    AND p.user_key = $2
+                    RETURNING p.id
+                    """,
+                    key,
+                    user_key,
+                )
+            except asyncpg.exceptions.ForeignKeyViolationError:
+                raise ValidationError(
+                    custom_message="Priority is used by todos; "
+                    "pass reassign_to to move them to another priority"
+                )
+            if deleted_id is None:
+                raise NotFoundError(f"Priority with key {key} not found")
+            return True  # Successfully deleted
 
-            await conn.execute(
-                """
-                DELETE FROM priorities p
-                WHERE p.id = $1
-                AND p.user_key = $2
-                """,
-                priority_id,
-                user_key,
+    @staticmethod
+    async def _reassign_todos(
+        conn: asyncpg.Connection, key: str, reassign_to: str, user_key: str
+    ) -> None:
+        if reassign_to == key:
+            raise ValidationError(
+                custom_message="Cannot reassign todos to the priority being deleted"
             )
-            return True  # Successfully deleted
+        target = await conn.fetchval(
+            """
+            SELECT p.key
+            FROM priorities p
+            WHERE p.key = $1
+            AND p.user_key = $2
+            """,
+            reassign_to,
+            user_key,
+        )
+        if target is None:
+            raise ValidationError(
+                custom_message=f"Priority to reassign to with key {reassign_to} not found"
+            )
+        # The priority_order copy and the counters follow through the todo triggers
+        await conn.execute(
+            """
+            UPDATE todos t
+            SET priority = $1
+            WHERE t.priority = $2
+            AND t.user_key = $3
+            """,
+            reassign_to,
+            key,
+            user_key,
+        )
 
     @staticmethod
     async def get_total_priorities(conn: asyncpg.Connection, user_key: str) -> int:
         try:
             resp = await conn.fetchval(
                 """
-                SELECT COUNT(*)
-                FROM priorities p
-                WHERE p.user_key = $1
+                SELECT c.count
+                FROM user_counters c
+                WHERE c.user_key = $1 AND c.kind = 'priorities' AND c.ref = ''
                 """,
                 user_key,
             )
-            # COUNT(*) returns 0 for empty sets; return that instead of raising
+            # Maintained by triggers; a user without priorities has no counter row
             return int(resp or 0)
         except Exception as e:
             raise AppError(e)
@@ -221,11 +298,11 @@ class PriorityService:
         priority_id: int,
         priority_patch: PriorityPatch,
         user_key: str,
-    ) -> Priority:
+    ) -> asyncpg.Record:
         async with conn.transaction():
             db_priority = await conn.fetchrow(
-                """
-                SELECT p.*
+                f"""
+                SELECT {ranked_columns("priorities", "p", None)}
                 FROM priorities p
                 WHERE p.id = $1
                 AND p.user_key = $2
@@ -241,6 +318,10 @@ class PriorityService:
             param_count = 1
             for field, value in priority_patch.model_dump().items():
                 if value is not None:
+                    if field == "order":
+                        field, value = "rank", await rank_at(
+                            conn, "priorities", user_key, value, priority_id
+                        )
                     update_fields.append(f'"{field}" = ${param_count}')
                     values.append(value)
                     param_count += 1
@@ -250,10 +331,10 @@ class PriorityService:
             values.extend([priority_id, user_key])
             # Execute the update
             query = f"""
-                UPDATE priorities
+                UPDATE priorities p
                 SET {', '.join(update_fields)}
                 WHERE id = ${param_count} AND user_key = ${param_count + 1}
-                RETURNING *
+                RETURNING {ranked_columns("priorities", "p", None)}
                 """
             try:
                 updated_priority = await conn.fetchrow(query, *values)
@@ -266,44 +347,34 @@ class PriorityService:
     @staticmethod
     async def reorder_priorities(
         conn: asyncpg.Connection, reorder_data: PriorityReorder, user_key: str
-    ) -> list[Priority]:
+    ) -> list[asyncpg.Record]:
         """
         Reorder priorities by moving a priority from one order position to another.
-        This method handles the unique constraint on (user_key, order) by temporarily
-        using negative order values during the reordering process.
+
+        Only the moved priority is written: it gets a rank between its new
+        neighbours, and the other priorities' positions follow from their ranks.
         """
         async with conn.transaction():
             from_order = reorder_data.fromOrder
             to_order = reorder_data.toOrder
 
-            # Validate that the from_order exists for this user
-            existing_priority = await conn.fetchrow(
+            # Positions can't change between reading and moving
+            await lock_ranks(conn, "priorities", user_key)
+            priorities = await conn.fetch(
                 """
-                SELECT id, "order" FROM priorities
-                WHERE user_key = $1 AND "order" = $2
+                SELECT id FROM priorities
+                WHERE user_key = $1
+                ORDER BY rank ASC
                 """,
                 user_key,
-                from_order,
             )
 
-            if not existing_priority:
+            # Validate that the from_order exists for this user
+            if not 1 <= from_order <= len(priorities):
                 raise NotFoundError(
                     f"Priority with order {from_order} not found for user"
                 )
 
-            # Get all priorities for this user ordered by current order
-            priorities = await conn.fetch(
-                """
-                SELECT id, "order" FROM priorities
-                WHERE user_key = $1
-                ORDER BY "order" ASC
-                """,
-                user_key,
-            )
-
-            if not priorities:
-                raise NotFoundError("No priorities found for user")
-
             # Validate to_order is within valid range
             max_order = len(priorities)
             if to_order < 1 or to_order > max_order:
@@ -311,53 +382,13 @@ class PriorityService:
                     custom_message=f"Target order must be between 1 and {max_order}"
                 )
 
-            # If from_order equals to_order, no reordering needed
-            if from_order == to_order:
-                return await PriorityService.get_priorities(conn, user_key, 0, 1000)
-
-            # Create a mapping of current order to priority ID
-            order_to_id = {p["order"]: p["id"] for p in priorities}
-
-            # Create the new order sequence
-            current_orders = list(range(1, max_order + 1))
-
-            # Remove the from_order and insert it at the to_order position
-            current_orders.remove(from_order)
-            current_orders.insert(to_order - 1, from_order)
-
-            # Create a mapping of priority ID to new order
-            id_to_new_order = {}
-            for i, order in enumerate(current_orders):
-                priority_id = order_to_id[order]
-                id_to_new_order[priority_id] = i + 1
-
-            # Update all priorities with new order values
-            # Use temporary negative values to avoid constraint violations
-            for priority in priorities:
-                temp_order = -(priority["id"])  # Use negative ID as temporary
-                await conn.execute(
-                    """
-                    UPDATE priorities
-                    SET "order" = $1
-                    WHERE id = $2 AND user_key = $3
-                    """,
-                    temp_order,
-                    priority["id"],
-                    user_key,
+            if from_order != to_order:
+                priority_id = priorities[from_order - 1]["id"]
+                rank = await rank_at(
+                    conn, "priorities", user_key, to_order, priority_id
                 )
-
-            # Now update with the final order values
-            for priority in priorities:
-                final_order = id_to_new_order[priority["id"]]
                 await conn.execute(
-                    """
-                    UPDATE priorities
-                    SET "order" = $1
-                    WHERE id = $2 AND user_key = $3
-                    """,
-                    final_order,
-                    priority["id"],
-                    user_key,
+                    "UPDATE priorities SET rank = $1 WHERE id = $2", rank, priority_id
                 )
 
             # Return the updated priorities
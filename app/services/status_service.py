@@ -1,7 +1,10 @@
 # app/services/status_service.py
 import uuid
+from typing import Optional
 import asyncpg
 from app.core.errors import AppError, NotFoundError, ValidationError
+from app.utils.fields import select_columns
+from app.utils.ordering import lock_ranks, rank_at, ranked_columns, ranked_rows
 import logging
 from app.schemas import (
     StatusCreate,
@@ -9,7 +12,6 @@ from app.schemas import (
     StatusPatch,
     StatusReorder,
 )
-from app.models import Status
 
 logger = logging.getLogger(__name__)
 
@@ -21,17 +23,18 @@ class StatusService:
     @staticmethod
     async def create_status(
         conn: asyncpg.Connection, status: StatusCreate, user_key: str
-    ) -> Status:
+    ) -> asyncpg.Record:
         async with conn.transaction():
             status_key = str(uuid.uuid4())
+            rank = await rank_at(conn, "statuses", user_key, status.order)
             db_status = await conn.fetchrow(
-                """
-                INSERT INTO statuses
+                f"""
+                INSERT INTO statuses AS s
                         ( "key"
                         , "name"
                         , "description"
                         , "user_key"
-                        , "order"
+                        , "rank"
                         , "color"
                         , "icon"
                         , "is_default")
@@ -43,13 +46,13 @@ class StatusService:
                         , $6
                         , $7
                         , $8
-                        ) RETURNING *
+                        ) RETURNING {ranked_columns("statuses", "s", None)}
                 """,
                 status_key,
                 status.name,
                 status.description,
                 user_key,
-                status.order,
+                rank,
                 status.color,
                 status.icon,
                 status.is_default,
@@ -82,15 +85,39 @@ class StatusService:
 
     @staticmethod
     async def get_statuses(
-        conn: asyncpg.Connection, user_key: str, skip: int = 0, limit: int = 10
-    ) -> list[Status]:
+        conn: asyncpg.Connection,
+        user_key: str,
+        skip: int = 0,
+        limit: int = 10,
+        fields: Optional[list[str]] = None,
+        with_counts: bool = False,
+    ) -> list[asyncpg.Record]:
+        """
+        A page of the user's statuses in order.
+
+        with_counts adds todo_count and open_todo_count columns, read from the
+        counters the todo triggers maintain rather than by counting todos.
+        """
+        columns = select_columns("s", fields)
+        joins = ""
+        if with_counts:
+            columns += (
+                ", COALESCE(ct.count, 0) AS todo_count"
+                ", COALESCE(co.count, 0) AS open_todo_count"
+            )
+            joins = """
+                LEFT JOIN user_counters ct ON ct.user_key = s.user_key
+                AND ct.kind = 'status' AND ct.ref = s.key
+                LEFT JOIN user_counters co ON co.user_key = s.user_key
+                AND co.kind = 'status_open' AND co.ref = s.key
+            """
         try:
             resp = await conn.fetch(
-                """
-                SELECT s.*
-                FROM statuses s
-                WHERE s.user_key = $1
-                ORDER BY s.order ASC
+                f"""
+                SELECT {columns}
+                FROM {ranked_rows("statuses")} s
+                {joins}
+                ORDER BY s.rank ASC
                 OFFSET $2
                 LIMIT $3
                 """,
@@ -103,23 +130,29 @@ class StatusService:
             raise AppError(e)
 
     @staticmethod
-    async def get_status(
-        conn: asyncpg.Connection, status_id: int, user_key: str
-    ) -> Status:
+    async def get_status_by_key(
+        conn: asyncpg.Connection,
+        key: str,
+        user_key: str,
+        fields: Optional[list[str]] = None,
+    ) -> asyncpg.Record:
+        """Fetch a status by its UUID key in a single indexed lookup."""
         try:
             resp = await conn.fetchrow(
-                """
-                SELECT s.*
+                f"""
+                SELECT {ranked_columns("statuses", "s", fields)}
                 FROM statuses s
-                WHERE s.id = $1
+                WHERE s.key = $1
                 AND s.user_key = $2
                 """,
-                status_id,
+                key,
                 user_key,
             )
             if not resp:
-                raise NotFoundError(f"Status with id {status_id} not found")
+                raise NotFoundError(f"Status with key {key} not found")
             return resp
+        except NotFoundError:
+            raise
         except Exception as e:
             raise AppError(e)
 
@@ -129,12 +162,12 @@ class StatusService:
         status_id: int,
         status_update: StatusUpdate,
         user_key: str,
-    ) -> Status:
+    ) -> asyncpg.Record:
         async with conn.transaction():
             # First check if status exists
             db_status = await conn.fetchrow(
-                """
-                SELECT s.*
+                f"""
+                SELECT {ranked_columns("statuses", "s", None)}
                 FROM statuses s
                 WHERE s.id = $1
                 AND s.user_key = $2
@@ -152,6 +185,10 @@ class StatusService:
 
             for field, value in status_update.model_dump().items():
                 if field in UPDATABLE_FIELDS:
+                    if field == "order":
+                        field, value = "rank", await rank_at(
+                            conn, "statuses", user_key, value, status_id
+                        )
                     update_fields.append(f'"{field}" = ${param_count}')
                     values.append(value)
                     param_count += 1
@@ -165,58 +202,108 @@ class StatusService:
 
             # Execute the update
             query = f"""
-                UPDATE statuses
+                UPDATE statuses s
                 SET {', '.join(update_fields)}
                 WHERE id = ${param_count} AND user_key = ${param_count + 1}
-                RETURNING *
+                RETURNING {ranked_columns("statuses", "s", None)}
                 """
 
             updated_status = await conn.fetchrow(query, *values)
             return updated_status
 
     @staticmethod
-    async def delete_status(
-        conn: asyncpg.Connection, status_id: int, user_key: str
+    async def delete_status_by_key(
+        conn: asyncpg.Connection,
+        key: str,
+        user_key: str,
+        reassign_to: Optional[str] = None,
     ) -> bool:
+        """
+        Delete a status by its UUID key using a single DELETE ... RETURNING.
+
+        With reassign_to, the todos of the status first move to that status of
+        the same user in one UPDATE, in the same transaction as the delete.
+        Without it, a status that todos still use can't be deleted.
+        """
         async with conn.transaction():
-            db_status = await conn.fetchrow(
+            if reassign_to is not None:
+                await StatusService._reassign_todos(conn, key, reassign_to, user_key)
+            # todos.status has no foreign key, so the delete wouldn't fail
+            elif await conn.fetchval(
                 """
-                SELECT s.*
-                FROM statuses s
-                WHERE s.id = $1
-                AND s.user_key = $2
+                SELECT EXISTS (
+                    SELECT 1 FROM todos t WHERE t.user_key = $2 AND t.status = $1
+                )
                 """,
-                status_id,
+                key,
                 user_key,
-            )
-
-            if not db_status:
-                raise NotFoundError(f"Status with id {status_id} not found")
-
-            await conn.execute(
+            ):
+                raise ValidationError(
+                    custom_message="Status is used by todos; "
+                    "pass reassign_to to move them to another status"
+                )
+            deleted_id = await conn.fetchval(
                 """
                 DELETE FROM statuses s
-                WHERE s.id = $1
+                WHERE s.key = $1
                 AND s.user_key = $2
+                RETURNING s.id
                 """,
-                status_id,
+                key,
                 user_key,
             )
+            if deleted_id is None:
+                raise NotFoundError(f"Status with key {key} not found")
             return True  # Successfully deleted
 
+    @staticmethod
+    async def _reassign_todos(
+        conn: asyncpg.Connection, key: str, reassign_to: str, user_key: str
+    ) -> None:
+        if reassign_to == key:
+            raise ValidationError(
+                custom_message="Cannot reassign todos to the status being deleted"
+            )
+        target = await conn.fetchval(
+            """
+            SELECT s.key
+            FROM statuses s
+            WHERE s.key = $1
+            AND s.user_key = $2
+            """,
+            reassign_to,
+            user_key,
+        )
+        if target is None:
+            raise ValidationError(
+                custom_message=f"Status to reassign to with key {reassign_to} not found"
+            )
+        # The status_order copy and the counters follow through the todo triggers
+        await conn.execute(
+            """
+            UPDATE todos t
+            SET status = $1
+            WHERE t.status = $2
+            AND t.user_key = $3
+            """,
+            reassign_to,
+            key,
+            user_key,
+        )
+
     @staticmethod
     async def get_total_statuses(conn: asyncpg.Connection, user_key: str) -> int:
         try:
             resp = await conn.fetchval(
                 """
-                SELECT COUNT(*)
-                FROM statuses s
-                WHERE s.user_key = $1
+                SELECT c.count
+                FROM user_counters c
+                WHERE c.user_key = $1 AND c.kind = 'statuses' AND c.ref = ''
                 """,
                 user_key,
             )
-            # COUNT(*) returns 0 for empty sets; return that instead of raising
-            return int(resp)
+            # Maintained by triggers; a user without statuses has no counter row
+            return int(resp or 0)
         except Exception as e:
             raise AppError(e)
 
@@ -226,11 +313,11 @@ class StatusService:
         status_id: int,
         status_patch: StatusPatch,
         user_key: str,
-    ) -> Status:
+    ) -> asyncpg.Record:
         async with conn.transaction():
             db_status = await conn.fetchrow(
-                """
-                SELECT s.*
+                f"""
+                SELECT {ranked_columns("statuses", "s", None)}
                 FROM statuses s
                 WHERE s.id = $1
                 AND s.user_key = $2
@@ -246,6 +333,10 @@ class StatusService:
             param_count = 1
             for field, value in status_patch.model_dump().items():
                 if value is not None:
+                    if field == "order":
+                        field, value = "rank", await rank_at(
+                            conn, "statuses", user_key, value, status_id
+                        )
                     update_fields.append(f'"{field}" = ${param_count}')
                     values.append(value)
                     param_count += 1
@@ -255,10 +346,10 @@ class StatusService:
             values.extend([status_id, user_key])
             # Execute the update
             query = f"""
-                UPDATE statuses
+                UPDATE statuses s
                 SET {', '.join(update_fields)}
                 WHERE id = ${param_count} AND user_key = ${param_count + 1}
-                RETURNING *
+                RETURNING {ranked_columns("statuses", "s", None)}
                 """
             try:
                 updated_status = await conn.fetchrow(query, *values)
@@ -271,44 +362,34 @@ class StatusService:
     @staticmethod
     async def reorder_statuses(
         conn: asyncpg.Connection, reorder_data: StatusReorder, user_key: str
-    ) -> list[Status]:
+    ) -> list[asyncpg.Record]:
         """
         Reorder statuses by moving a status from one order position to another.
-        This method handles the unique constraint on (user_key, order) by temporarily
-        using negative order values during the reordering process.
+
+        Only the moved status is written: it gets a rank between its new
+        neighbours, and the other statuses' positions follow from their ranks.
         """
         async with conn.transaction():
             from_order = reorder_data.fromOrder
             to_order = reorder_data.toOrder
 
-            # Validate that the from_order exists for this user
-            existing_status = await conn.fetchrow(
+            # Positions can't change between reading and moving
+            await lock_ranks(conn, "statuses", user_key)
+            statuses = await conn.fetch(
                 """
-                SELECT id, "order" FROM statuses
-                WHERE user_key = $1 AND "order" = $2
+                SELECT id FROM statuses
+                WHERE user_key = $1
+                ORDER BY rank ASC
                 """,
                 user_key,
-                from_order,
             )
 
-            if not existing_status:
+            # Validate that the from_order exists for this user
+            if not 1 <= from_order <= len(statuses):
                 raise NotFoundError(
                     f"Status with order {from_order} not found for user"
                 )
 
-            # Get all statuses for this user ordered by current order
-            statuses = await conn.fetch(
-                """
-                SELECT id, "order" FROM statuses
-                WHERE user_key = $1
-                ORDER BY "order" ASC
-                """,
-                user_key,
-            )
-
-            if not statuses:
-                raise NotFoundError("No statuses found for user")
-
             # Validate to_order is within valid range
             max_order = len(statuses)
             if to_order < 1 or to_order > max_order:
@@ -316,53 +397,11 @@ class StatusService:
                     custom_message=f"Target order must be between 1 and {max_order}"
                 )
 
-            # If from_order equals to_order, no reordering needed
-            if from_order == to_order:
-                return await StatusService.get_statuses(conn, user_key, 0, 1000)
-
-            # Create a mapping of current order to status ID
-            order_to_id = {p["order"]: p["id"] for p in statuses}
-
-            # Create the new order sequence
-            current_orders = list(range(1, max_order + 1))
-
-            # Remove the from_order and insert it at the to_order position
-            current_orders.remove(from_order)
-            current_orders.insert(to_order - 1, from_order)
-
-            # Create a mapping of status ID to new order
-            id_to_new_order = {}
-            for i, order in enumerate(current_orders):
-                status_id = order_to_id[order]
-                id_to_new_order[status_id] = i + 1
-
-            # Update all statuses with new order values
-            # Use temporary negative values to avoid constraint violations
-            for status in statuses:
-                temp_order = -(status["id"])  # Use negative ID as temporary
-                await conn.execute(
-                    """
-                    UPDATE statuses
-                    SET "order" = $1
-                    WHERE id = $2 AND user_key = $3
-                    """,
-                    temp_order,
-                    status["id"],
-                    user_key,
-                )
-
-            # Now update with the final order values
-            for status in statuses:
-                final_order = id_to_new_order[status["id"]]
+            if from_order != to_order:
+                status_id = statuses[from_order - 1]["id"]
+                rank = await rank_at(conn, "statuses", user_key, to_order, status_id)
                 await conn.execute(
-                    """
-                    UPDATE statuses
-                    SET "order" = $1
-                    WHERE id = $2 AND user_key = $3
-                    """,
-                    final_order,
-                    status["id"],
-                    user_key,
+                    "UPDATE statuses SET rank = $1 WHERE id = $2", rank, status_id
                 )
 
             # Return the updated statuses
@@ -1,28 +1,165 @@
 from app.schemas.todo import TodoCreate, TodoUpdate, TodoPatch
+import heapq
 import uuid
-from typing import Optional
+from typing import AsyncIterator, Optional, Tuple
 import asyncpg
-from app.core.errors import AppError, NotFoundError
+from app.core.errors import AppError, NotFoundError, ValidationError
+from app.utils.fields import select_columns
+from app.utils.ordering import ranked_rows
+from app.validators.todo_validator import TodoImportRowValidator
 import logging
 
 logger = logging.getLogger(__name__)
 
 UPDATABLE_FIELDS = ["title", "description", "priority", "status", "completed"]
 
+IMPORT_BATCH_SIZE = 1000
+LOOKUP_MAX_KEYS = 1000
+IMPORT_COLUMNS = [
+    "line",
+    "key",
+    "title",
+    "description",
+    "completed",
+    "priority",
+    "status",
+]
+
+# priority_order and status_order are trigger-maintained copies of
+# priorities.rank and statuses.rank, so no sort needs a join
 ALLOWED_SORTS = {
-    "incomplete-priority-desc": "t.completed ASC, p.order ASC, t.id DESC",
-    "priority-desc": "p.order ASC, t.id DESC",
-    "priority-desc-text-asc": "p.order ASC, t.title ASC",
+    "incomplete-priority-desc": "t.completed ASC, t.priority_order ASC, t.id DESC",
+    "priority-desc": "t.priority_order ASC, t.id DESC",
+    "priority-desc-text-asc": "t.priority_order ASC, t.title ASC",
     "text-asc": "t.title ASC, t.id DESC",
     "text-desc": "t.title DESC, t.id DESC",
     "created-desc": "t.id DESC",
-    "status-desc": "s.order ASC, t.id DESC",
-    "status-asc": "s.order DESC, t.id DESC",
-    "incomplete-status-desc": "t.completed ASC, s.order ASC, t.id DESC",
-    "priority-status-desc": "p.order ASC, s.order ASC, t.id DESC",
+    "status-desc": "t.status_order ASC, t.id DESC",
+    "status-asc": "t.status_order DESC, t.id DESC",
+    "incomplete-status-desc": "t.completed ASC, t.status_order ASC, t.id DESC",
+    "priority-status-desc": "t.priority_order ASC, t.status_order ASC, t.id DESC",
+}
+
+# Python types of the columns the sorts use, to check board cursors against
+SORT_COLUMN_TYPES = {
+    "t.completed": bool,
+    "t.priority_order": int,
+    "t.status_order": int,
+    "t.title": str,
+    "t.id": int,
 }
 
 
+def _build_todo_filters(
+    user_key: str,
+    completed: Optional[bool] = None,
+    priority: Optional[str] = None,
+    search: Optional[str] = None,
+    status: Optional[str] = None,
+    start_idx: int = 1,
+) -> tuple[list[str], list]:
+    """Build the WHERE conditions and parameters shared by todo list queries."""
+    where = [f"t.user_key = ${start_idx}"]
+    params = [user_key]
+    next_idx = start_idx + 1
+
+    if completed is not None:
+        where.append(f"t.completed = ${next_idx}")
+        params.append(completed)
+        next_idx += 1
+    if priority is not None:
+        where.append(f"t.priority = ${next_idx}")
+        params.append(priority)
+        next_idx += 1
+    if search:
+        where.append(f"t.title ILIKE ${next_idx}")
+        params.append(f"%{search}%")
+        next_idx += 1
+    if status is not None:
+        where.append(f"t.status = ${next_idx}")
+        params.append(status)
+        next_idx += 1
+    return where, params
+
+
+def _build_todo_list_sql(
+    where: list[str], sort: str, fields: Optional[list[str]] = None
+) -> str:
+    """Build the ordered SELECT used by the todo list and export queries."""
+    order_by = ALLOWED_SORTS.get(sort, ALLOWED_SORTS["created-desc"])
+    return f"""
+            SELECT {select_columns("t", fields)}
+            FROM todos t
+            WHERE {' AND '.join(where)}
+            ORDER BY {order_by}
+            """
+
+
+def _board_sort_keys(sort: str) -> list[tuple[str, str]]:
+    """(column, direction) pairs of a sort, made unique with t.id for keysets."""
+    order_by = ALLOWED_SORTS.get(sort, ALLOWED_SORTS["created-desc"])
+    keys = [tuple(part.split()) for part in order_by.split(", ")]
+    if "t.id" not in [column for column, _ in keys]:
+        keys.append(("t.id", "DESC"))
+    return keys
+
+
+def _build_keyset_condition(
+    keys: list[tuple[str, str]], after: list, start_idx: int
+) -> tuple[str, list]:
+    """
+    WHERE condition for the rows that sort after the values in after.
+
+    Sorts mix directions, so this is the expanded form of a row comparison:
+    (a > x) OR (a = x AND b < y) OR ...
+    """
+    if len(after) != len(keys) or any(
+        type(value) is not SORT_COLUMN_TYPES[column]
+        for (column, _), value in zip(keys, after)
+    ):
+        raise ValidationError(custom_message="Invalid cursor")
+    clauses = []
+    for i, (column, direction) in enumerate(keys):
+        parts = [f"{keys[j][0]} = ${start_idx + j}" for j in range(i)]
+        parts.append(f"{column} {'<' if direction == 'DESC' else '>'} ${start_idx + i}")
+        clauses.append(f"({' AND '.join(parts)})")
+    return f"({' OR '.join(clauses)})", list(after)
+
+
+def _parse_import_completed(line: int, value) -> bool:
+    if value is None or value == "":
+        return False
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ("true", "1", "yes"):
+        return True
+    if isinstance(value, str) and value.strip().lower() in ("false", "0", "no"):
+        return False
+    raise ValidationError(custom_message=f"Line {line}: Completed must be a boolean")
+
+
+def _build_import_record(
+    line: int, row: dict, priorities: dict[str, str], statuses: dict[str, str]
+) -> tuple:
+    """Validate one imported row and resolve its priority and status keys."""
+    fields = TodoImportRowValidator.parse(line, row)
+    priority = priorities.get(str(row.get("priority") or "").strip())
+    if priority is None:
+        raise ValidationError(custom_message=f"Line {line}: Priority not found")
+    status = statuses.get(str(row.get("status") or "").strip())
+    if status is None:
+        raise ValidationError(custom_message=f"Line {line}: Status not found")
+    return (
+        line,
+        str(uuid.uuid4()),
+        fields.title,
+        fields.description,
+        _parse_import_completed(line, row.get("completed")),
+        priority,
+        status,
+    )
+
+
 class TodoService:
     @staticmethod
     async def create_todo(
@@ -102,45 +239,15 @@ class TodoService:
         priority: Optional[str] = None,
         search: Optional[str] = None,
         status: Optional[str] = None,
+        fields: Optional[list[str]] = None,
     ) -> list[asyncpg.Record]:
         try:
-            where = ["t.user_key = $1"]
-            params = [user_key]
-            next_idx = 2
-
-            if completed is not None:
-                where.append(f"t.completed = ${next_idx}")
-                params.append(completed)
-                next_idx += 1
-            if priority is not None:
-                where.append(f"t.priority = ${next_idx}")
-                params.append(priority)
-                next_idx += 1
-            if search:
-                where.append(f"t.title ILIKE ${next_idx}")
-                params.append(f"%{search}%")
-                next_idx += 1
-            if status is not None:
-                where.append(f"t.status = ${next_idx}")
-                params.append(status)
-                next_idx += 1
-            order_by = ALLOWED_SORTS.get(sort, ALLOWED_SORTS["created-desc"])
-            sql = (
-                """
-                    SELECT t.*
-                    FROM todos t
-                    LEFT JOIN priorities p ON p.key = t.priority
-                    """
-                + (
-                    " LEFT JOIN statuses s ON s.key = t.status "
-                    if status is not None
-                    else ""
-                )
-                + f"""
-                    WHERE {' AND '.join(where)}
-                    ORDER BY {order_by}
-                    OFFSET ${next_idx} LIMIT ${next_idx + 1}
-                    """
+            where, params = _build_todo_filters(
+                user_key, completed, priority, search, status
+            )
+            next_idx = len(params) + 1
+            sql = _build_todo_list_sql(where, sort, fields) + (
+                f" OFFSET ${next_idx} LIMIT ${next_idx + 1}"
             )
             params.extend([skip, limit])
             resp = await conn.fetch(sql, *params)
@@ -149,22 +256,233 @@ class TodoService:
             raise AppError(e)
 
     @staticmethod
-    async def get_todo(
-        conn: asyncpg.Connection, todo_id: int, user_key: str
+    async def stream_todos(
+        conn: asyncpg.Connection,
+        user_key: str,
+        sort: str = "incomplete-priority-desc",
+        completed: Optional[bool] = None,
+        priority: Optional[str] = None,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[list[asyncpg.Record]]:
+        """
+        Yield every matching todo in batches through a server-side cursor.
+
+        Runs inside a read-only repeatable-read transaction so the whole export
+        sees one snapshot, while only one batch is held in memory at a time.
+        """
+        where, params = _build_todo_filters(
+            user_key, completed, priority, search, status
+        )
+        sql = _build_todo_list_sql(where, sort)
+        async with conn.transaction(isolation="repeatable_read", readonly=True):
+            cursor = await conn.cursor(sql, *params)
+            while True:
+                batch = await cursor.fetch(batch_size)
+                if not batch:
+                    break
+                yield batch
+
+    @staticmethod
+    async def get_todo_board(
+        conn: asyncpg.Connection,
+        user_key: str,
+        limit: int = 10,
+        sort: str = "incomplete-priority-desc",
+        completed: Optional[bool] = None,
+        priority: Optional[str] = None,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        after: Optional[list] = None,
+        fields: Optional[list[str]] = None,
+    ) -> list[Tuple[dict, list[dict], int, Optional[list]]]:
+        """
+        Todos grouped by status for a board view, in one query.
+
+        Every status of the user (or only status) is a column holding its
+        first limit todos under sort, after the sort values in after, and the
+        number of todos in the column. Returns (status, todos, count,
+        next_after) per column in status order; next_after holds the sort
+        values to continue from, or None on the last page.
+        """
+        keys = _board_sort_keys(sort)
+        where, params = _build_todo_filters(user_key, completed, priority, search)
+        where.append("t.status = s.key")
+        status_where = ["s.user_key = $1"]
+        if status is not None:
+            params.append(status)
+            status_where.append(f"s.key = ${len(params)}")
+        page_where = list(where)
+        if after is not None:
+            condition, values = _build_keyset_condition(keys, after, len(params) + 1)
+            page_where.append(condition)
+            params.extend(values)
+        params.append(limit + 1)
+        # The sort columns are selected under their own names, as fields= may
+        # leave them out and the next cursor needs them
+        sort_columns = ", ".join(
+            f"{column} AS board_sort_{i}" for i, (column, _) in enumerate(keys)
+        )
+        query = f"""
+            SELECT s AS board_status, so."order" AS board_order, c.board_count, t.*
+            FROM statuses s
+            JOIN {ranked_rows("statuses")} so ON so.id = s.id
+            CROSS JOIN LATERAL (
+                SELECT COUNT(*) AS board_count
+                FROM todos t
+                WHERE {' AND '.join(where)}
+            ) c
+            LEFT JOIN LATERAL (
+                SELECT {select_columns("t", fields)}, {sort_columns}
+                FROM todos t
+                WHERE {' AND '.join(page_where)}
+                ORDER BY {", ".join(f"{c} {d}" for c, d in keys)}
+                LIMIT ${len(params)}
+            ) t ON true
+            WHERE {' AND '.join(status_where)}
+            ORDER BY s.rank ASC,
+                {", ".join(f"t.board_sort_{i} {d}" for i, (_, d) in enumerate(keys))}
+        """
+        try:
+            rows = await conn.fetch(query, *params)
+        except Exception as e:
+            raise AppError(e)
+
+        columns = []
+        for row in rows:
+            if not columns or columns[-1][0]["key"] != row["board_status"]["key"]:
+                status_row = dict(row["board_status"].items(), order=row["board_order"])
+                columns.append((status_row, [], row["board_count"], []))
+            if row["key"] is not None:
+                columns[-1][3].append(
+                    [row[f"board_sort_{i}"] for i in range(len(keys))]
+                )
+                columns[-1][1].append(
+                    {k: v for k, v in row.items() if not k.startswith("board_")}
+                )
+        board = []
+        for status_row, todos, count, sort_values in columns:
+            has_more = len(todos) > limit
+            next_after = sort_values[limit - 1] if has_more else None
+            board.append((status_row, todos[:limit], count, next_after))
+        return board
+
+    @staticmethod
+    async def get_todos_by_keys(
+        conn: asyncpg.Connection,
+        keys: list[str],
+        user_key: str,
+        fields: Optional[list[str]] = None,
+    ) -> Tuple[list[asyncpg.Record], list[str]]:
+        """
+        Fetch many todos by UUID key in a single indexed lookup.
+
+        Returns the found todos in the order of keys (duplicates collapsed)
+        and the keys that matched no todo of the user.
+        """
+        keys = list(dict.fromkeys(keys))
+        if len(keys) > LOOKUP_MAX_KEYS:
+            raise ValidationError(
+                custom_message=f"At most {LOOKUP_MAX_KEYS} keys can be fetched at once"
+            )
+        try:
+            rows = await conn.fetch(
+                f"""
+                SELECT {select_columns("t", fields)}
+                FROM todos t
+                WHERE t.user_key = $1
+                AND t.key = ANY($2::varchar[])
+                """,
+                user_key,
+                keys,
+            )
+        except Exception as e:
+            raise AppError(e)
+        by_key = {row["key"]: row for row in rows}
+        found = [by_key[key] for key in keys if key in by_key]
+        missing = [key for key in keys if key not in by_key]
+        return found, missing
+
+    @staticmethod
+    async def get_todo_changes(
+        conn: asyncpg.Connection, user_key: str, since: int = 0, limit: int = 100
+    ) -> Tuple[list[asyncpg.Record], list[asyncpg.Record], int, bool]:
+        """
+        Todos changed and deleted after change sequence value since.
+
+        Returns (changed, deleted, next_since, has_more), where the page holds
+        the first limit changes in sequence order.
+        """
+        try:
+            # One snapshot for both queries
+            async with conn.transaction(isolation="repeatable_read", readonly=True):
+                changed = await conn.fetch(
+                    """
+                    SELECT t.*
+                    FROM todos t
+                    WHERE t.user_key = $1
+                    AND t.change_seq > $2
+                    ORDER BY t.change_seq
+                    LIMIT $3
+                    """,
+                    user_key,
+                    since,
+                    limit + 1,
+                )
+                deleted = await conn.fetch(
+                    """
+                    SELECT d.key, d.deleted_at, d.change_seq
+                    FROM todo_tombstones d
+                    WHERE d.user_key = $1
+                    AND d.change_seq > $2
+                    ORDER BY d.change_seq
+                    LIMIT $3
+                    """,
+                    user_key,
+                    since,
+                    limit + 1,
+                )
+        except Exception as e:
+            raise AppError(e)
+        page = list(
+            heapq.merge(
+                ((r["change_seq"], False, r) for r in changed),
+                ((r["change_seq"], True, r) for r in deleted),
+                key=lambda item: item[0],
+            )
+        )
+        has_more = len(page) > limit
+        page = page[:limit]
+        next_since = page[-1][0] if page else since
+        return (
+            [r for _, is_deleted, r in page if not is_deleted],
+            [r for _, is_deleted, r in page if is_deleted],
+            next_since,
+            has_more,
+        )
+
+    @staticmethod
+    async def get_todo_by_key(
+        conn: asyncpg.Connection,
+        key: str,
+        user_key: str,
+        fields: Optional[list[str]] = None,
     ) -> asyncpg.Record:
+        """Fetch a todo by its UUID key in a single indexed lookup."""
         try:
             resp = await conn.fetchrow(
-                """
-                SELECT t.*
+                f"""
+                SELECT {select_columns("t", fields)}
                 FROM todos t
-                WHERE t.id = $1
+                WHERE t.key = $1
                 AND t.user_key = $2
                 """,
-                todo_id,
+                key,
                 user_key,
             )
             if not resp:
-                raise NotFoundError(f"Todo with id {todo_id} not found")
+                raise NotFoundError(f"Todo with key {key} not found")
             return resp
         except NotFoundError:
             raise
@@ -176,15 +494,54 @@ class TodoService:
         try:
             resp = await conn.fetchval(
                 """
-                SELECT COUNT(*)
-                FROM todos t
-                WHERE t.user_key = $1
+                SELECT c.count
+                FROM user_counters c
+                WHERE c.user_key = $1 AND c.kind = 'todos' AND c.ref = ''
+                """,
+                user_key,
+            )
+            # Maintained by triggers; a user without todos has no counter row
+            return int(resp or 0)
+        except Exception as e:
+            raise AppError(e)
+
+    @staticmethod
+    async def get_todo_stats(conn: asyncpg.Connection, user_key: str) -> dict:
+        """Todo counts in total, completed and per status and priority."""
+        try:
+            rows = await conn.fetch(
+                """
+                SELECT c.kind, NULL AS key, NULL AS name, 0 AS rank, c.count
+                FROM user_counters c
+                WHERE c.user_key = $1 AND c.kind IN ('todos', 'completed')
+                UNION ALL
+                SELECT 'status', s.key, s.name, s.rank, COALESCE(c.count, 0)
+                FROM statuses s
+                LEFT JOIN user_counters c
+                ON c.user_key = s.user_key AND c.kind = 'status' AND c.ref = s.key
+                WHERE s.user_key = $1
+                UNION ALL
+                SELECT 'priority', p.key, p.name, p.rank, COALESCE(c.count, 0)
+                FROM priorities p
+                LEFT JOIN user_counters c
+                ON c.user_key = p.user_key AND c.kind = 'priority' AND c.ref = p.key
+                WHERE p.user_key = $1
+                ORDER BY 1, 4
                 """,
                 user_key,
             )
-            return resp
         except Exception as e:
             raise AppError(e)
+        stats = {"total": 0, "completed": 0, "by_status": [], "by_priority": []}
+        for row in rows:
+            if row["kind"] in ("todos", "completed"):
+                stats["total" if row["kind"] == "todos" else "completed"] = row["count"]
+            else:
+                stats[f"by_{row['kind']}"].append(
+                    {"key": row["key"], "name": row["name"], "count": row["count"]}
+                )
+        stats["open"] = stats["total"] - stats["completed"]
+        return stats
 
     @staticmethod
     async def update_todo(
@@ -259,34 +616,23 @@ class TodoService:
             return updated_todo
 
     @staticmethod
-    async def delete_todo(
-        conn: asyncpg.Connection, todo_id: int, user_key: str
+    async def delete_todo_by_key(
+        conn: asyncpg.Connection, key: str, user_key: str
     ) -> bool:
-        async with conn.transaction():
-            db_todo = await conn.fetchrow(
-                """
-                SELECT t.*
-                FROM todos t
-                WHERE t.id = $1
-                AND t.user_key = $2
-                """,
-                todo_id,
-                user_key,
-            )
-
-            if not db_todo:
-                raise NotFoundError(f"Todo with id {todo_id} not found")
-
-            await conn.execute(
-                """
-                DELETE FROM todos t
-                WHERE t.id = $1
-                AND t.user_key = $2
-                """,
-                todo_id,
-                user_key,
-            )
-            return True  # Successfully deleted
+        """Delete a todo by its UUID key using a single DELETE ... RETURNING."""
+        deleted_id = await conn.fetchval(
+            """
+            DELETE FROM todos t
+            WHERE t.key = $1
+            AND t.user_key = $2
+            RETURNING t.id
+            """,
+            key,
+            user_key,
+        )
+        if deleted_id is None:
+            raise NotFoundError(f"Todo with key {key} not found")
+        return True  # Successfully deleted
 
     @staticmethod
     async def patch_todo(
@@ -353,3 +699,196 @@ class TodoService:
             """
             updated_todo = await conn.fetchrow(query, *values)
             return updated_todo
+
+    @staticmethod
+    async def bulk_patch_todos(
+        conn: asyncpg.Connection,
+        todo_patch: TodoPatch,
+        user_key: str,
+        completed: Optional[bool] = None,
+        priority: Optional[str] = None,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> int:
+        """
+        Apply the same patch to every todo matching the filters.
+
+        The filters are the ones understood by get_todos. Returns the number of
+        updated rows.
+        """
+        async with conn.transaction():
+            if todo_patch.priority is not None:
+                priority_row = await conn.fetchrow(
+                    """
+                    SELECT p.key
+                    FROM priorities p
+                    WHERE p.key = $1
+                    AND p.user_key = $2
+                    """,
+                    todo_patch.priority,
+                    user_key,
+                )
+                if not priority_row:
+                    raise NotFoundError(
+                        f"Priority with id {todo_patch.priority} not found"
+                    )
+            if todo_patch.status is not None:
+                status_row = await conn.fetchrow(
+                    """
+                    SELECT s.key
+                    FROM statuses s
+                    WHERE s.key = $1
+                    AND s.user_key = $2
+                    """,
+                    todo_patch.status,
+                    user_key,
+                )
+                if not status_row:
+                    raise NotFoundError(f"Status with id {todo_patch.status} not found")
+
+            update_fields = []
+            values = []
+            param_count = 1
+            for field, value in todo_patch.model_dump().items():
+                if value is not None and field in UPDATABLE_FIELDS:
+                    update_fields.append(f'"{field}" = ${param_count}')
+                    values.append(value)
+                    param_count += 1
+            if not update_fields:
+                raise ValidationError(custom_message="No valid fields to update")
+
+            where, params = _build_todo_filters(
+                user_key, completed, priority, search, status, start_idx=param_count
+            )
+            query = f"""
+                WITH updated AS (
+                    UPDATE todos t
+                    SET {', '.join(update_fields)}
+                    WHERE {' AND '.join(where)}
+                    RETURNING 1
+                )
+                SELECT COUNT(*) FROM updated
+            """
+            return await conn.fetchval(query, *values, *params)
+
+    @staticmethod
+    async def bulk_delete_todos(
+        conn: asyncpg.Connection,
+        user_key: str,
+        completed: Optional[bool] = None,
+        priority: Optional[str] = None,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> int:
+        """
+        Delete every todo matching the filters in one statement.
+
+        The filters are the ones understood by get_todos. Returns the number of
+        deleted rows.
+        """
+        try:
+            where, params = _build_todo_filters(
+                user_key, completed, priority, search, status
+            )
+            query = f"""
+                WITH deleted AS (
+                    DELETE FROM todos t
+                    WHERE {' AND '.join(where)}
+                    RETURNING 1
+                )
+                SELECT COUNT(*) FROM deleted
+            """
+            return await conn.fetchval(query, *params)
+        except Exception as e:
+            raise AppError(e)
+
+    @staticmethod
+    async def import_todos(
+        conn: asyncpg.Connection,
+        rows: AsyncIterator[Tuple[int, dict]],
+        user_key: str,
+    ) -> int:
+        """
+        Bulk import todos from an async stream of (line number, row) pairs.
+
+        Priorities and statuses may be referenced by key or by name and are
+        resolved from one lookup each. Rows are COPY'd into a temporary staging
+        table in batches and then merged into todos with a single INSERT that
+        re-checks ownership. The import is all-or-nothing.
+        """
+        async with conn.transaction():
+            priorities = {}
+            for p in await conn.fetch(
+                "SELECT p.key, p.name FROM priorities p WHERE p.user_key = $1",
+                user_key,
+            ):
+                priorities.setdefault(p["name"], p["key"])
+                priorities[p["key"]] = p["key"]
+            statuses = {}
+            for s in await conn.fetch(
+                """
+                SELECT s.key, s.name
+                FROM statuses s
+                WHERE s.user_key = $1
+                ORDER BY s.rank ASC
+                """,
+                user_key,
+            ):
+                # Status names are not unique; the first one in order wins
+                statuses.setdefault(s["name"], s["key"])
+                statuses[s["key"]] = s["key"]
+
+            await conn.execute(
+                """
+                CREATE TEMPORARY TABLE todo_import (
+                    line integer NOT NULL,
+                    key varchar(36) NOT NULL,
+                    title varchar(100) NOT NULL,
+                    description text,
+                    completed boolean NOT NULL,
+                    priority varchar(36) NOT NULL,
+                    status varchar(36) NOT NULL
+                ) ON COMMIT DROP
+                """
+            )
+            staged = 0
+            batch = []
+            async for line, row in rows:
+                batch.append(_build_import_record(line, row, priorities, statuses))
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    await conn.copy_records_to_table(
+                        "todo_import", records=batch, columns=IMPORT_COLUMNS
+                    )
+                    staged += len(batch)
+                    batch = []
+            if batch:
+                await conn.copy_records_to_table(
+                    "todo_import", records=batch, columns=IMPORT_COLUMNS
+                )
+                staged += len(batch)
+            if not staged:
+                return 0
+
+            imported = await conn.fetchval(
+                """
+                WITH inserted AS (
+                    INSERT INTO todos
+                    (key, title, description, completed, priority, user_key, status)
+                    SELECT i.key, i.title, i.description, i.completed,
+                           p.key, $1, s.key
+                    FROM todo_import i
+                    JOIN priorities p ON p.key = i.priority AND p.user_key = $1
+                    JOIN statuses s ON s.key = i.status AND s.user_key = $1
+                    ORDER BY i.line
+                    RETURNING 1
+                )
+                SELECT COUNT(*) FROM inserted
+                """,
+                user_key,
+            )
+            if imported != staged:
+                # A priority or status was deleted while the body was streaming
+                raise ValidationError(
+                    custom_message="Priorities or statuses changed during import"
+                )
+            return imported
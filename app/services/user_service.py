@@ -1,8 +1,10 @@
 import uuid
+from typing import Optional
 import asyncpg
 from app.core.security import PasswordHasher
 from app.schemas.user import UserCreate, UserUpdate, UserUpdatePassword
 from app.core.errors import AppError, NotFoundError, ValidationError
+from app.utils.fields import select_columns
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,12 +13,15 @@ logger = logging.getLogger(__name__)
 class UserService:
     @staticmethod
     async def get_users(
-        conn: asyncpg.Connection, skip: int = 0, limit: int = 10
+        conn: asyncpg.Connection,
+        skip: int = 0,
+        limit: int = 10,
+        fields: Optional[list[str]] = None,
     ) -> list[asyncpg.Record]:
         try:
             resp = await conn.fetch(
-                """
-                SELECT u.*
+                f"""
+                SELECT {select_columns("u", fields)}
                 FROM users u
                 LIMIT $1 OFFSET $2
                 """,
@@ -28,11 +33,13 @@ class UserService:
             raise AppError(e)
 
     @staticmethod
-    async def get_user_by_key(conn: asyncpg.Connection, key: str) -> asyncpg.Record:
+    async def get_user_by_key(
+        conn: asyncpg.Connection, key: str, fields: Optional[list[str]] = None
+    ) -> asyncpg.Record:
         try:
             resp = await conn.fetchrow(
-                """
-                SELECT u.*
+                f"""
+                SELECT {select_columns("u", fields)}
                 FROM users u
                 WHERE u.key = $1
                 """,
@@ -160,18 +167,18 @@ class UserService:
 
     @staticmethod
     async def delete_user(conn: asyncpg.Connection, key: str) -> bool:
-        async with conn.transaction():
-            db_user = await UserService.get_user_by_key(conn, key)
-            if not db_user:
-                raise NotFoundError(f"User with key {key} not found")
-            await conn.execute(
-                """
-                DELETE FROM users u
-                WHERE u.key = $1
-                """,
-                key,
-            )
-            return True
+        """Delete a user by key using a single DELETE ... RETURNING."""
+        deleted_id = await conn.fetchval(
+            """
+            DELETE FROM users u
+            WHERE u.key = $1
+            RETURNING u.id
+            """,
+            key,
+        )
+        if deleted_id is None:
+            raise NotFoundError(f"User with key {key} not found")
+        return True
 
     @staticmethod
     async def get_total_users(conn: asyncpg.Connection) -> int:
@@ -0,0 +1,49 @@
+# app/utils/export.py
+import csv
+import io
+import json
+import asyncpg
+from app.schemas.todo import TodoResponse
+from app.utils.mapping import record_to_dict
+
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+TODO_EXPORT_COLUMNS = [
+    "key",
+    "title",
+    "description",
+    "completed",
+    "priority",
+    "status",
+    "user_key",
+    "created_at",
+    "updated_at",
+]
+
+
+def _serialize_todos(records: list[asyncpg.Record]) -> list[dict]:
+    return [TodoResponse(**record_to_dict(r)).model_dump() for r in records]
+
+
+def todos_to_ndjson(records: list[asyncpg.Record]) -> bytes:
+    """Encode a batch of todo records as newline-delimited JSON."""
+    lines = [json.dumps(todo) for todo in _serialize_todos(records)]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def todos_csv_header() -> bytes:
+    """Return the CSV header line for todo exports."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(TODO_EXPORT_COLUMNS)
+    return buffer.getvalue().encode("utf-8")
+
+
+def todos_to_csv(records: list[asyncpg.Record]) -> bytes:
+    """Encode a batch of todo records as CSV rows without a header."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=TODO_EXPORT_COLUMNS)
+    writer.writerows(_serialize_todos(records))
+    return buffer.getvalue().encode("utf-8")
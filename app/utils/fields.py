@@ -0,0 +1,113 @@
+# app/utils/fields.py
+from datetime import datetime
+from typing import Optional, Type
+import asyncpg
+from pydantic import BaseModel
+from app.core.errors import ValidationError
+from app.utils.mapping import record_to_dict
+
+# Columns a client may request with fields=; each is also a response field
+TODO_FIELDS = (
+    "key",
+    "title",
+    "description",
+    "completed",
+    "priority",
+    "status",
+    "user_key",
+    "created_at",
+    "updated_at",
+)
+PRIORITY_FIELDS = (
+    "key",
+    "name",
+    "description",
+    "color",
+    "icon",
+    "order",
+    "user_key",
+    "created_at",
+    "updated_at",
+)
+STATUS_FIELDS = PRIORITY_FIELDS + ("is_default",)
+# Extra data a client may embed in priority and status listings with include=
+LISTING_INCLUDES = ("counts",)
+USER_FIELDS = (
+    "key",
+    "name",
+    "username",
+    "email",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+
+
+def parse_fields(raw: Optional[str], allowed: tuple[str, ...]) -> Optional[list[str]]:
+    """
+    Read a comma-separated fields= parameter against a whitelist.
+
+    Returns None (every field) when the parameter is missing or empty. The key
+    is always included so clients can address the resource afterwards.
+    """
+    if raw is None or not raw.strip():
+        return None
+    fields = ["key"]
+    for name in raw.split(","):
+        name = name.strip()
+        if not name or name in fields:
+            continue
+        if name not in allowed:
+            raise ValidationError(custom_message=f"Unknown field: {name}")
+        fields.append(name)
+    return fields
+
+
+def parse_include(raw: Optional[str], allowed: tuple[str, ...]) -> set[str]:
+    """Read a comma-separated include= parameter against a whitelist."""
+    if raw is None:
+        return set()
+    include = {name.strip() for name in raw.split(",") if name.strip()}
+    for name in sorted(include):
+        if name not in allowed:
+            raise ValidationError(custom_message=f"Unknown include: {name}")
+    return include
+
+
+def select_columns(alias: str, fields: Optional[list[str]]) -> str:
+    """SELECT list for the requested fields; only call with parse_fields output."""
+    if fields is None:
+        return f"{alias}.*"
+    return ", ".join(f'{alias}."{name}"' for name in fields)
+
+
+def dump_record(
+    record: asyncpg.Record, model: Type[BaseModel], fields: Optional[list[str]]
+) -> dict:
+    """Serialize a record with its response model, or just the requested fields."""
+    if fields is None:
+        return model(**record_to_dict(record)).model_dump()
+    # Only the requested columns; listings may select extra ones like counts
+    values = {name: record[name] for name in fields}
+    return {
+        name: value.isoformat() if isinstance(value, datetime) else value
+        for name, value in values.items()
+    }
+
+
+def dump_records(
+    records: list[asyncpg.Record],
+    model: Type[BaseModel],
+    fields: Optional[list[str]],
+) -> list[dict]:
+    return [dump_record(record, model, fields) for record in records]
+
+
+def add_todo_counts(items: list[dict], records: list[asyncpg.Record]) -> list[dict]:
+    """Embed the todo_count and open_todo_count columns of records in items."""
+    for item, record in zip(items, records):
+        item["todo_counts"] = {
+            "total": record["todo_count"],
+            "open": record["open_todo_count"],
+        }
+    return items
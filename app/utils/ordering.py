@@ -0,0 +1,145 @@
+# app/utils/ordering.py
+"""
+Sparse ranks for user-ordered rows (priorities and statuses).
+
+Rows are stored with a rank that leaves gaps between neighbours, and the
+dense 1..N order the API exposes is computed from it on read: by one
+ROW_NUMBER() pass for lists (ranked_rows()), and by counting the rows ranked
+before it for a single row (position_sql()). Moving or inserting a row takes
+a rank halfway between its new neighbours, so it writes only that row.
+
+When two neighbours have no rank left between them, the user's ranks are
+spaced out again (_rebalance()) inline, in the transaction of the write that
+needs the room, and not by a background job. That happens after 16 inserts
+into the same spot at the earliest. It is one UPDATE of that user's
+priorities or statuses, and the sort key triggers copy the new ranks to the
+user's todos, like a move did before ranks were sparse. A background job
+would have to take the same lock to keep writes from picking ranks meanwhile.
+
+rank_at() locks the user's ranks until the caller's transaction ends, so
+two writes can't pick the same rank; callers that read positions before
+picking one take lock_ranks() first.
+"""
+
+from bisect import bisect_left
+from typing import Optional
+import asyncpg
+
+# Distance between ranks after spacing them out; a spot takes 16 inserts
+# before the user's ranks need spacing out again
+RANK_GAP = 1 << 16
+
+# Deferrable unique constraints on (user_key, rank), by table
+RANK_CONSTRAINTS = {
+    "priorities": "uq_priority_user_rank",
+    "statuses": "uq_status_user_rank",
+}
+
+
+def ranked_rows(table: str, user_key_param: str = "$1") -> str:
+    """
+    FROM item with the user's rows of table and their "order" column.
+
+    For queries that read many rows: the positions take one window pass, where
+    position_sql() would count the rows ranked before each one.
+    """
+    return f"""(
+        SELECT *, ROW_NUMBER() OVER (PARTITION BY user_key ORDER BY rank) AS "order"
+        FROM {table}
+        WHERE user_key = {user_key_param}
+    )"""
+
+
+def position_sql(table: str, alias: str) -> str:
+    """
+    The 1-based position of the alias row among the user's rows.
+
+    Other rows are compared by rank and the row itself is skipped, so this is
+    also correct in RETURNING, where the subquery still sees the old row.
+    Only use it for single rows; lists select from ranked_rows().
+    """
+    return f"""(
+        SELECT COUNT(*) + 1
+        FROM {table} o
+        WHERE o.user_key = {alias}.user_key
+        AND o.rank < {alias}.rank
+        AND o.id <> {alias}.id
+    )"""
+
+
+def ranked_columns(table: str, alias: str, fields: Optional[list[str]]) -> str:
+    """SELECT list like select_columns() for a single row, with its "order"."""
+    if fields is None:
+        return f'{alias}.*, {position_sql(table, alias)} AS "order"'
+    columns = [f'{alias}."{name}"' for name in fields if name != "order"]
+    if "order" in fields:
+        columns.append(f'{position_sql(table, alias)} AS "order"')
+    return ", ".join(columns)
+
+
+async def lock_ranks(conn: asyncpg.Connection, table: str, user_key: str) -> None:
+    """Serialize rank changes of a user's rows in table until commit."""
+    await conn.execute(
+        "SELECT pg_advisory_xact_lock(hashtext($1), hashtext($2))", table, user_key
+    )
+
+
+def _rank_between(ranks: list[int], position: int) -> Optional[int]:
+    if not ranks:
+        return RANK_GAP
+    low = ranks[position - 2] if position > 1 else ranks[0] - 2 * RANK_GAP
+    high = ranks[position - 1] if position <= len(ranks) else ranks[-1] + 2 * RANK_GAP
+    if high - low < 2:
+        return None
+    return (low + high) // 2
+
+
+async def _rebalance(conn: asyncpg.Connection, table: str, user_key: str) -> None:
+    constraint = RANK_CONSTRAINTS[table]
+    # Ranks pass each other while the rows are renumbered
+    await conn.execute(f"SET CONSTRAINTS {constraint} DEFERRED")
+    await conn.execute(
+        f"""
+        UPDATE {table} t
+        SET rank = r.position * {RANK_GAP}
+        FROM (
+            SELECT id, ROW_NUMBER() OVER (ORDER BY rank) AS position
+            FROM {table}
+            WHERE user_key = $1
+        ) r
+        WHERE t.id = r.id
+        AND t.rank <> r.position * {RANK_GAP}
+        """,
+        user_key,
+    )
+    await conn.execute(f"SET CONSTRAINTS {constraint} IMMEDIATE")
+
+
+async def rank_at(
+    conn: asyncpg.Connection,
+    table: str,
+    user_key: str,
+    position: int,
+    row_id: Optional[int] = None,
+) -> int:
+    """
+    Rank that puts a row at position among the user's other rows in table.
+
+    position is clamped to the first and last place. For an existing row
+    (row_id) that is already at position, its current rank is returned.
+    """
+    await lock_ranks(conn, table, user_key)
+    rows = await conn.fetch(
+        f"SELECT o.id, o.rank FROM {table} o WHERE o.user_key = $1 ORDER BY o.rank",
+        user_key,
+    )
+    ranks = [row["rank"] for row in rows if row["id"] != row_id]
+    position = min(max(position, 1), len(ranks) + 1)
+    for row in rows:
+        if row["id"] == row_id and bisect_left(ranks, row["rank"]) + 1 == position:
+            return row["rank"]
+    rank = _rank_between(ranks, position)
+    if rank is None:
+        await _rebalance(conn, table, user_key)
+        return await rank_at(conn, table, user_key, position, row_id)
+    return rank
@@ -1,7 +1,11 @@
 # app/utils/pagination.py
+import base64
+import binascii
+import json
 from typing import Optional
 from yarl import URL
 from typing import Tuple
+from app.core.errors import ValidationError
 
 
 def build_pagination_link(
@@ -31,3 +35,20 @@ def parse_pagination(page_raw: str | int | None, size_raw: str | int | None, *,
     size = max(min(size, max_size), 1)
     skip = (page - 1) * size
     return page, size, skip
+
+
+def encode_cursor(values: list) -> str:
+    """Opaque cursor for the sort values of the last row of a page."""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise ValidationError(custom_message="Invalid cursor")
+    if not isinstance(values, list):
+        raise ValidationError(custom_message="Invalid cursor")
+    return values
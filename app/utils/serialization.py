@@ -0,0 +1,85 @@
+# app/utils/serialization.py
+"""
+JSON and MessagePack bodies.
+
+Endpoints render responses with respond() and read request bodies with
+read_body(), so both formats go through the same path: the response data is
+built once and only the final encoding differs.
+"""
+
+from typing import Any, NamedTuple
+from aiohttp import web
+import msgpack
+from app.core.errors import ValidationError
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+# Names in use for MessagePack; responses are sent as MSGPACK_CONTENT_TYPE
+MSGPACK_CONTENT_TYPES = {
+    MSGPACK_CONTENT_TYPE,
+    "application/x-msgpack",
+    "application/vnd.msgpack",
+}
+
+
+class RequestBody(NamedTuple):
+    raw: bytes
+    content_type: str
+
+    @property
+    def is_msgpack(self) -> bool:
+        return self.content_type in MSGPACK_CONTENT_TYPES
+
+    def unpack(self) -> Any:
+        """Decode a MessagePack body; JSON bodies are decoded by pydantic."""
+        try:
+            return msgpack.unpackb(self.raw)
+        except ValueError:
+            raise ValidationError(custom_message="Body is not valid MessagePack")
+
+
+async def read_body(request: web.Request) -> RequestBody:
+    return RequestBody(await request.read(), request.content_type)
+
+
+def _quality(accept: str, content_types: set[str]) -> float:
+    best = 0.0
+    for part in accept.split(","):
+        media_type, *params = part.split(";")
+        if media_type.strip().lower() not in content_types:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        best = max(best, q)
+    return best
+
+
+def wants_msgpack(request: web.Request) -> bool:
+    """
+    Whether the client asked for MessagePack.
+
+    MessagePack has to be named explicitly and rank at least as high as JSON;
+    wildcards keep getting JSON.
+    """
+    accept = request.headers.get("Accept", "")
+    if "msgpack" not in accept:
+        return False
+    msgpack_q = _quality(accept, MSGPACK_CONTENT_TYPES)
+    return msgpack_q > 0 and msgpack_q >= _quality(accept, {JSON_CONTENT_TYPE})
+
+
+def respond(request: web.Request, data: Any, status: int = 200) -> web.Response:
+    """Encode response data as JSON or, if the client asked for it, MessagePack."""
+    if wants_msgpack(request):
+        return web.Response(
+            body=msgpack.packb(data),
+            status=status,
+            content_type=MSGPACK_CONTENT_TYPE,
+        )
+    return web.json_response(data, status=status)
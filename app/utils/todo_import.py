@@ -0,0 +1,73 @@
+# app/utils/todo_import.py
+import csv
+import json
+from typing import AsyncIterator, Tuple
+from aiohttp import StreamReader
+from app.core.errors import ValidationError
+
+IMPORT_CONTENT_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "text/csv": "csv",
+}
+
+
+async def _iter_lines(stream: StreamReader) -> AsyncIterator[Tuple[int, str]]:
+    line_no = 0
+    try:
+        async for raw in stream:
+            line_no += 1
+            yield line_no, raw.decode("utf-8")
+    except UnicodeDecodeError:
+        raise ValidationError(custom_message=f"Line {line_no}: Body must be UTF-8")
+    except ValueError:
+        # StreamReader refuses lines longer than its buffer limit
+        raise ValidationError(custom_message=f"Line {line_no + 1}: Line is too long")
+
+
+async def iter_ndjson_rows(stream: StreamReader) -> AsyncIterator[Tuple[int, dict]]:
+    """Yield (line number, object) pairs from an NDJSON body, one line at a time."""
+    async for line_no, line in _iter_lines(stream):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            raise ValidationError(custom_message=f"Line {line_no}: Invalid JSON")
+        if not isinstance(row, dict):
+            raise ValidationError(custom_message=f"Line {line_no}: Expected an object")
+        yield line_no, row
+
+
+async def iter_csv_rows(stream: StreamReader) -> AsyncIterator[Tuple[int, dict]]:
+    """
+    Yield (line number, row) pairs from a CSV body with a header row.
+
+    Physical lines are buffered only while a quoted field is still open, so a
+    record spanning several lines is parsed as one row.
+    """
+    header = None
+    pending = []
+    start_line = 0
+    async for line_no, line in _iter_lines(stream):
+        if not pending:
+            start_line = line_no
+        pending.append(line)
+        record = "".join(pending)
+        # An odd number of quotes means a quoted field continues on the next line
+        if record.count('"') % 2:
+            continue
+        pending = []
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            raise ValidationError(
+                custom_message=f"Line {start_line}: Expected {len(header)} columns"
+            )
+        yield start_line, dict(zip(header, values))
+    if pending:
+        raise ValidationError(custom_message=f"Line {start_line}: Unterminated quote")
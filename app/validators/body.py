@@ -0,0 +1,109 @@
+"""
+Request body parsing.
+
+Request schemas carry their rules as field constraints, so pydantic-core
+decodes and validates a raw JSON body in one pass (MessagePack bodies are
+unpacked first and validated as Python objects). Constraint errors are
+reported by pydantic in its own words; the ErrorMessage tables in the
+validator modules translate them back to the API's messages. They only run
+when a body is rejected.
+"""
+
+import re
+from typing import Any, Callable, NamedTuple, Optional, Sequence, Type, TypeVar
+import pydantic
+from app.core.errors import ValidationError
+from app.utils.serialization import RequestBody
+
+Model = TypeVar("Model", bound=pydantic.BaseModel)
+ErrorCheck = Callable[[dict], bool]
+
+
+class ErrorMessage(NamedTuple):
+    """Message for a pydantic error on field that check() matches."""
+
+    field: str
+    check: ErrorCheck
+    message: str
+
+
+def _is_str(value: Any) -> bool:
+    return isinstance(value, str)
+
+
+def missing(error: dict) -> bool:
+    return error["type"] == "missing"
+
+
+def null(error: dict) -> bool:
+    return error["input"] is None
+
+
+def blank(error: dict) -> bool:
+    return _is_str(error["input"]) and error["input"].strip() == ""
+
+
+def longer_than(limit: int) -> ErrorCheck:
+    return lambda error: _is_str(error["input"]) and len(error["input"]) > limit
+
+
+def shorter_than(limit: int) -> ErrorCheck:
+    return lambda error: _is_str(error["input"]) and len(error["input"]) < limit
+
+
+def not_starting_with(prefix: str) -> ErrorCheck:
+    return lambda error: _is_str(error["input"]) and not error["input"].startswith(
+        prefix
+    )
+
+
+def not_matching(pattern: str) -> ErrorCheck:
+    compiled = re.compile(pattern)
+    return lambda error: _is_str(error["input"]) and not compiled.search(error["input"])
+
+
+def error_type(name: str) -> ErrorCheck:
+    return lambda error: error["type"] == name
+
+
+def _first_message(
+    errors: list[dict], messages: Sequence[ErrorMessage]
+) -> Optional[str]:
+    for field, check, message in messages:
+        for error in errors:
+            if error["loc"][:1] == (field,) and check(error):
+                return message
+    return None
+
+
+def to_validation_error(
+    exc: pydantic.ValidationError, messages: Sequence[ErrorMessage]
+) -> ValidationError:
+    """
+    Translate a rejected body into the ValidationError the API reports.
+
+    Missing required fields win, as the endpoints used to check for them before
+    building the model. Errors without a message (wrong types, invalid JSON)
+    are reported as pydantic lists them. Otherwise the first message in table
+    order is used, which is the order the fields used to be checked in.
+    """
+    errors = exc.errors()
+    message = _first_message(errors, [m for m in messages if m.check is missing])
+    if message:
+        return ValidationError(custom_message=message)
+    unmatched = [error for error in errors if not _first_message([error], messages)]
+    if unmatched:
+        return ValidationError(unmatched)
+    return ValidationError(custom_message=_first_message(errors, messages))
+
+
+def parse_body(
+    model: Type[Model], body: RequestBody, messages: Sequence[ErrorMessage] = ()
+) -> Model:
+    """Decode and validate a request body in one pass."""
+    try:
+        if body.is_msgpack:
+            return model.model_validate(body.unpack())
+        return model.model_validate_json(body.raw)
+    except pydantic.ValidationError as e:
+        raise to_validation_error(e, messages)
@@ -1,148 +1,48 @@
+from app.schemas.constraints import HEX_COLOR
 from app.schemas.status import StatusCreate, StatusUpdate, StatusPatch
-import re
-from app.core.errors import ValidationError
+from app.utils.serialization import RequestBody
+from app.validators.body import (
+    ErrorMessage,
+    blank,
+    error_type,
+    longer_than,
+    missing,
+    not_matching,
+    not_starting_with,
+    parse_body,
+)
+
+STATUS_MESSAGES = (
+    ErrorMessage("name", blank, "Name is required"),
+    ErrorMessage("name", longer_than(100), "Name must be less than 100 characters"),
+    ErrorMessage("color", blank, "Color is required"),
+    ErrorMessage("color", not_starting_with("#"), "Color must start with #"),
+    ErrorMessage("color", longer_than(7), "Color must be less than 7 characters long"),
+    ErrorMessage("color", not_matching(HEX_COLOR), "Color must be a valid hex color"),
+    ErrorMessage("icon", blank, "Icon is required"),
+    ErrorMessage("icon", longer_than(100), "Icon must be less than 100 characters"),
+    ErrorMessage("order", error_type("greater_than"), "Order must be greater than 0"),
+)
 
 
 class StatusCreateValidator:
-    def validate_status_name(
-        status: StatusCreate,
-    ) -> StatusCreate:
-        if status.name.strip() == "":
-            raise ValidationError("Name is required")
-        if len(status.name) > 100:
-            raise ValidationError("Name must be less than 100 characters")
-        return status
+    messages = (
+        tuple(
+            ErrorMessage(field, missing, "All fields are required")
+            for field in ["name", "color", "icon", "order", "user_key"]
+        )
+        + STATUS_MESSAGES
+    )
 
-    def validate_status_color(
-        status: StatusCreate,
-    ) -> StatusCreate:
-        if status.color.strip() == "":
-            raise ValidationError("Color is required")
-        if status.color[0] != "#":
-            raise ValidationError("Color must start with #")
-        if len(status.color) > 7:
-            raise ValidationError("Color must be less than 7 characters long")
-        if not re.match(r"^#[0-9a-fA-F]{6}$", status.color):
-            raise ValidationError("Color must be a valid hex color")
-        return status
-
-    def validate_status_icon(
-        status: StatusCreate,
-    ) -> StatusCreate:
-        if status.icon.strip() == "":
-            raise ValidationError("Icon is required")
-        if len(status.icon) > 100:
-            raise ValidationError("Icon must be less than 100 characters")
-        return status
-
-    def validate_status_order(
-        status: StatusCreate,
-    ) -> StatusCreate:
-        if status.order <= 0:
-            raise ValidationError("Order must be greater than 0")
-        return status
-
-    def validate_status(status: StatusCreate) -> StatusCreate:
-        status = StatusCreateValidator.validate_status_name(status)
-        status = StatusCreateValidator.validate_status_color(status)
-        status = StatusCreateValidator.validate_status_icon(status)
-        status = StatusCreateValidator.validate_status_order(status)
-        return status
+    def parse(body: RequestBody) -> StatusCreate:
+        return parse_body(StatusCreate, body, StatusCreateValidator.messages)
 
 
 class StatusUpdateValidator:
-    def validate_status_name(
-        status: StatusUpdate,
-    ) -> StatusUpdate:
-        if status.name.strip() == "":
-            raise ValidationError("Name is required")
-        if len(status.name) > 100:
-            raise ValidationError("Name must be less than 100 characters")
-        return status
-
-    def validate_status_color(
-        status: StatusUpdate,
-    ) -> StatusUpdate:
-        if status.color.strip() == "":
-            raise ValidationError("Color is required")
-        if status.color[0] != "#":
-            raise ValidationError("Color must start with #")
-        if len(status.color) > 7:
-            raise ValidationError("Color must be less than 7 characters long")
-        if not re.match(r"^#[0-9a-fA-F]{6}$", status.color):
-            raise ValidationError("Color must be a valid hex color")
-        return status
-
-    def validate_status_icon(
-        status: StatusUpdate,
-    ) -> StatusUpdate:
-        if status.icon.strip() == "":
-            raise ValidationError("Icon is required")
-        if len(status.icon) > 100:
-            raise ValidationError("Icon must be less than 100 characters")
-        return status
-
-    def validate_status_order(
-        status: StatusUpdate,
-    ) -> StatusUpdate:
-        if status.order <= 0:
-            raise ValidationError("Order must be greater than 0")
-        return status
-
-    def validate_status(status: StatusUpdate) -> StatusUpdate:
-        status = StatusUpdateValidator.validate_status_name(status)
-        status = StatusUpdateValidator.validate_status_color(status)
-        status = StatusUpdateValidator.validate_status_icon(status)
-        status = StatusUpdateValidator.validate_status_order(status)
-        return status
+    def parse(body: RequestBody) -> StatusUpdate:
+        return parse_body(StatusUpdate, body, STATUS_MESSAGES)
 
 
 class StatusPatchValidator:
-    def validate_status_name(
-        status: StatusPatch,
-    ) -> StatusPatch:
-        if status.name is not None:
-            if status.name.strip() == "":
-                raise ValidationError("Name is required")
-            if len(status.name) > 100:
-                raise ValidationError("Name must be less than 100 characters")
-        return status
-
-    def validate_status_color(
-        status: StatusPatch,
-    ) -> StatusPatch:
-        if status.color is not None:
-            if status.color.strip() == "":
-                raise ValidationError("Color is required")
-            if status.color[0] != "#":
-                raise ValidationError("Color must start with #")
-            if len(status.color) > 7:
-                raise ValidationError("Color must be less than 7 characters long")
-            if not re.match(r"^#[0-9a-fA-F]{6}$", status.color):
-                raise ValidationError("Color must be a valid hex color")
-        return status
-
-    def validate_status_icon(
-        status: StatusPatch,
-    ) -> StatusPatch:
-        if status.icon is not None:
-            if status.icon.strip() == "":
-                raise ValidationError("Icon is required")
-            if len(status.icon) > 100:
-                raise ValidationError("Icon must be less than 100 characters")
-        return status
-
-    def validate_status_order(
-        status: StatusPatch,
-    ) -> StatusPatch:
-        if status.order is not None:
-            if status.order <= 0:
-                raise ValidationError("Order must be greater than 0")
-        return status
-
-    def validate_status(status: StatusPatch) -> StatusPatch:
-        status = StatusPatchValidator.validate_status_name(status)
-        status = StatusPatchValidator.validate_status_color(status)
-        status = StatusPatchValidator.validate_status_icon(status)
-        status = StatusPatchValidator.validate_status_order(status)
-        return status
+    def parse(body: RequestBody) -> StatusPatch:
+        return parse_body(StatusPatch, body, STATUS_MESSAGES)
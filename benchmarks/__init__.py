@@ -0,0 +1,5 @@
+"""
+Benchmark harnesses for the Todo API.
+
+These are not part of the test suite; run them against a disposable database.
+"""
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the server entry point.
+
+Imports main_aiohttp in fresh interpreters with ``-X importtime``, keeps the
+best of several runs and compares it with the stored baseline. The run fails
+when the import is slower than the baseline by more than the threshold, or
+when a package that only migrations need (or a framework the server no longer
+uses) shows up in the server's import graph.
+
+The server reads its settings at import time, so run this with the same
+environment variables as the server.
+
+Usage:
+    python -m benchmarks.import_time                    # compare with the baseline
+    python -m benchmarks.import_time --update-baseline  # store a new baseline
+    python -m benchmarks.import_time --top 20           # show more packages
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "import_time.json"
+DEFAULT_THRESHOLD = 0.25
+MODULE = "main_aiohttp"
+
+# SQLAlchemy and alembic are for migrations only; the rest are leftovers of an
+# earlier framework. None of them may be imported by the server.
+FORBIDDEN_PACKAGES = ("sqlalchemy", "alembic", "slowapi", "starlette", "fastapi")
+
+
+def measure_once() -> Tuple[float, Dict[str, int]]:
+    """
+    Import MODULE in a new interpreter.
+
+    Returns the cumulative import time of MODULE in milliseconds and the self
+    time in microseconds per top-level package.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {MODULE}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"Importing {MODULE} failed:\n{proc.stderr}")
+    total_us = None
+    packages: Counter = Counter()
+    for line in proc.stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <indented module name>"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.partition(":")[2].split("|")
+        name = name.strip()
+        packages[name.split(".")[0]] += int(self_us)
+        if name == MODULE:
+            total_us = int(cumulative_us)
+    if total_us is None:
+        raise SystemExit(f"No import time reported for {MODULE}")
+    return total_us / 1000, dict(packages)
+
+
+def measure(repeat: int) -> Tuple[float, Dict[str, int]]:
+    """Return the best of repeat runs (and the package times of that run)."""
+    return min((measure_once() for _ in range(repeat)), key=lambda run: run[0])
+
+
+def load_baseline() -> Optional[float]:
+    if not BASELINE_PATH.exists():
+        return None
+    return json.loads(BASELINE_PATH.read_text())["total_ms"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time benchmark")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--top", type=int, default=10, help="Packages to list")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown against the baseline (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the measured time to the baseline file",
+    )
+    args = parser.parse_args()
+
+    total_ms, packages = measure(args.repeat)
+    for name, self_us in Counter(packages).most_common(args.top):
+        print(f"{name:30} {self_us / 1000:8.1f} ms")
+    line = f"{'import ' + MODULE:30} {total_ms:8.1f} ms"
+    baseline = load_baseline()
+    failed = False
+    if baseline:
+        change = total_ms / baseline - 1
+        line += f"  {change:+7.1%} vs baseline"
+        if change > args.threshold and not args.update_baseline:
+            line += "  REGRESSION"
+            failed = True
+    print(line)
+
+    forbidden = [name for name in FORBIDDEN_PACKAGES if name in packages]
+    if forbidden:
+        print(f"Imported by the server but not allowed: {', '.join(forbidden)}")
+        failed = True
+
+    if args.update_baseline:
+        BASELINE_PATH.parent.mkdir(exist_ok=True)
+        BASELINE_PATH.write_text(
+            json.dumps(
+                {
+                    "meta": {
+                        "python": platform.python_version(),
+                        "machine": platform.machine(),
+                        "updated_at": datetime.now(timezone.utc).isoformat(),
+                    },
+                    "total_ms": round(total_ms, 1),
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"Baseline written to {BASELINE_PATH}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
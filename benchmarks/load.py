@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+End-to-end load benchmark for the Todo API.
+
+Seeds the database from DATABASE_URL, serves create_app() in a separate
+process and drives one of the request mixes at a fixed concurrency. Results
+(RPS and p50/p95/p99 latency per route) are printed as JSON.
+
+Usage:
+    python -m benchmarks.load --mix polling --concurrency 32 --duration 30
+    python -m benchmarks.load --mix mixed --users 20 --todos-per-user 2000 \\
+        --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+import aiohttp
+import asyncpg
+
+from app.core.config import settings
+from benchmarks import seed as seeding
+from benchmarks.scenarios import MIXES, BenchClient, BenchUser, Recorder, login
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _serve(port: int, keep_rate_limits: bool, log_level: str):
+    """Run the app in this (child) process until terminated."""
+    from aiohttp import web
+    from main_aiohttp import create_app
+
+    logging.getLogger().setLevel(log_level)
+    if not keep_rate_limits:
+        # Lift the limits but keep the middleware on the request path
+        from app.middleware.rate_limit import RATE_LIMIT_POLICIES, RateLimitWindow
+
+        for policy in RATE_LIMIT_POLICIES:
+            policy.windows = [
+                RateLimitWindow(sys.maxsize, w.window_seconds) for w in policy.windows
+            ]
+    web.run_app(
+        create_app(),
+        host="127.0.0.1",
+        port=port,
+        access_log=None,
+        print=None,
+        handler_cancellation=True,
+    )
+
+
+async def _wait_until_ready(base_url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession(base_url) as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get("/health") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready in {timeout}s")
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def _summarize(latencies: List[float], statuses: Dict[int, int], duration: float):
+    values = sorted(latencies)
+    if not values:
+        return {"requests": 0}
+    return {
+        "requests": len(values),
+        "rps": round(len(values) / duration, 2),
+        "p50_ms": round(_percentile(values, 50) * 1000, 3),
+        "p95_ms": round(_percentile(values, 95) * 1000, 3),
+        "p99_ms": round(_percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _worker(
+    client: BenchClient, user: BenchUser, operations, weights, deadline: float
+):
+    while time.monotonic() < deadline:
+        operation = random.choices(operations, weights)[0]
+        await operation(client, user)
+
+
+async def run(args) -> dict:
+    prefix = f"bench_{uuid.uuid4().hex[:8]}"
+    conn = await asyncpg.connect(settings.database_url)
+    try:
+        seeded = await seeding.seed(conn, prefix, args.users, args.todos_per_user)
+    finally:
+        await conn.close()
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = multiprocessing.get_context("spawn").Process(
+        target=_serve, args=(port, args.keep_rate_limits, args.server_log_level)
+    )
+    server.start()
+    recorder = Recorder()
+    try:
+        await _wait_until_ready(base_url)
+        connector = aiohttp.TCPConnector(limit=args.concurrency)
+        async with aiohttp.ClientSession(base_url, connector=connector) as session:
+            client = BenchClient(session, recorder)
+            users = [BenchUser(s) for s in seeded]
+            for user in users:
+                user.token = await login(client, user)
+                if user.token is None:
+                    raise RuntimeError(f"Could not log in as {user.seeded.username}")
+
+            operations = [op for _, op in MIXES[args.mix]]
+            weights = [weight for weight, _ in MIXES[args.mix]]
+
+            async def phase(seconds: float):
+                deadline = time.monotonic() + seconds
+                await asyncio.gather(
+                    *(
+                        _worker(
+                            client, users[i % len(users)], operations, weights, deadline
+                        )
+                        for i in range(args.concurrency)
+                    )
+                )
+
+            if args.warmup:
+                await phase(args.warmup)
+            recorder.enabled = True
+            started = time.monotonic()
+            await phase(args.duration)
+            elapsed = time.monotonic() - started
+            recorder.enabled = False
+    finally:
+        server.terminate()
+        server.join()
+        if not args.keep_data:
+            conn = await asyncpg.connect(settings.database_url)
+            try:
+                await seeding.cleanup(conn, prefix)
+            finally:
+                await conn.close()
+
+    all_latencies = [v for values in recorder.latencies.values() for v in values]
+    all_statuses: Dict[int, int] = {}
+    for counter in recorder.statuses.values():
+        for code, count in counter.items():
+            all_statuses[code] = all_statuses.get(code, 0) + count
+
+    return {
+        "meta": {
+            "mix": args.mix,
+            "concurrency": args.concurrency,
+            "duration_s": round(elapsed, 3),
+            "warmup_s": args.warmup,
+            "users": args.users,
+            "todos_per_user": args.todos_per_user,
+            "rate_limits": args.keep_rate_limits,
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "routes": {
+            route: _summarize(latencies, recorder.statuses[route], elapsed)
+            for route, latencies in sorted(recorder.latencies.items())
+        },
+        "total": _summarize(all_latencies, all_statuses, elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load benchmark for the Todo API")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="Seconds measured")
+    parser.add_argument("--warmup", type=float, default=3, help="Seconds not measured")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--todos-per-user", type=int, default=500)
+    parser.add_argument(
+        "--keep-rate-limits",
+        action="store_true",
+        help="Enforce the real rate limits (lifted by default)",
+    )
+    parser.add_argument(
+        "--keep-data", action="store_true", help="Do not delete the seeded rows"
+    )
+    parser.add_argument("--server-log-level", default="WARNING")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
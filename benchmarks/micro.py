@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for per-request hot paths that do not touch the database.
+
+Each case is timed with timeit (best of several repeats) and compared with the
+stored baseline; the run fails when a case is slower than its baseline by
+more than the threshold.
+
+Usage:
+    python -m benchmarks.micro                     # compare with the baseline
+    python -m benchmarks.micro --update-baseline   # store new baseline numbers
+    python -m benchmarks.micro -k rate_limit --threshold 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import timeit
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import msgpack
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+from yarl import URL
+
+from app.api.v1.route_manager import register_all_routes
+from app.core.security import TokenManager
+from app.middleware.authentication import _decode_jwt, reset_token_cache
+from app.middleware.rate_limit import (
+    RateLimitWindow,
+    SlidingWindowRateLimiter,
+    _find_matching_policy,
+)
+from app.schemas.todo import TodoResponse
+from app.utils.mapping import record_to_dict
+from app.utils.pagination import build_pagination_link
+from app.utils.serialization import JSON_CONTENT_TYPE, RequestBody
+from app.validators.priority_validator import PriorityCreateValidator
+from app.validators.status_validator import StatusCreateValidator
+from app.validators.todo_validator import TodoCreateValidator, TodoPatchValidator
+from app.validators.user_validator import UserCreateValidator
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "micro.json"
+DEFAULT_THRESHOLD = 0.25
+USER_KEY = "0b9c6a58-3f5e-4a5e-9a3e-2f1d7c1e4b10"
+
+TODO_ROW = {
+    "id": 1,
+    "key": "5f0e1c2a-8d4b-4e8f-9c1a-7b6d5e4f3a21",
+    "title": "Write the quarterly report",
+    "description": "Collect numbers from finance and summarize them",
+    "completed": False,
+    "priority": "a1f3c5e7-2b4d-4f6a-8c0e-1d3f5b7a9c2e",
+    "status": "c2e4a6b8-3d5f-4a7b-9e1c-2f4a6c8e0b3d",
+    "user_key": USER_KEY,
+    "created_at": datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc),
+    "updated_at": datetime(2025, 1, 2, 8, 30, tzinfo=timezone.utc),
+    "priority_order": 1,
+    "status_order": 2,
+}
+
+
+@dataclass
+class Case:
+    name: str
+    # Returns the zero-argument callable to time; called once per repeat so
+    # stateful cases (e.g. the rate limiter) start from the same state
+    setup: Callable[[], Optional[Callable[[], object]]]
+
+
+# Limits high enough that the benchmark always measures the allowed path
+RATE_LIMIT_WINDOWS = [RateLimitWindow(1000, 1), RateLimitWindow(20000, 60)]
+
+
+def _rate_limiter_check():
+    limiter = SlidingWindowRateLimiter()
+    windows = RATE_LIMIT_WINDOWS
+    # A busy identity: the deques already hold a window's worth of requests
+    for _ in range(50):
+        limiter.record_request("GET:/api/v1/todos", "user:bench", windows)
+    return lambda: limiter.check_rate_limit("GET:/api/v1/todos", "user:bench", windows)
+
+
+def _rate_limiter_record():
+    limiter = SlidingWindowRateLimiter()
+    windows = RATE_LIMIT_WINDOWS
+    return lambda: limiter.record_request("GET:/api/v1/todos", "user:bench", windows)
+
+
+def _routed_request(method: str, path: str) -> web.Request:
+    app = web.Application()
+    app.add_routes(register_all_routes())
+    request = make_mocked_request(method, path, app=app)
+    match_info = asyncio.run(app.router.resolve(request))
+    return make_mocked_request(method, path, app=app, match_info=match_info)
+
+
+def _find_policy(method: str, path: str):
+    def setup():
+        request = _routed_request(method, path)
+        return lambda: _find_matching_policy(request)
+
+    return setup
+
+
+def _bench_token() -> str:
+    return TokenManager.encode(
+        {
+            "sub": "bench_user",
+            "uid": USER_KEY,
+            "exp": datetime.now(timezone.utc) + timedelta(days=1),
+        }
+    )
+
+
+def _token_decode():
+    token = _bench_token()
+    return lambda: TokenManager.decode(token)
+
+
+def _cached_token_decode():
+    token = _bench_token()
+    reset_token_cache()
+    _decode_jwt(token)
+    return lambda: _decode_jwt(token)
+
+
+def _todo_response_construct():
+    return lambda: TodoResponse(**TODO_ROW)
+
+
+def _todo_response_dump():
+    todo = TodoResponse(**TODO_ROW)
+    return todo.model_dump
+
+
+def _todo_response_page():
+    rows = [TODO_ROW] * 20
+    return lambda: [TodoResponse(**row).model_dump() for row in rows]
+
+
+def _page_payload() -> dict:
+    todos = [TodoResponse(**TODO_ROW).model_dump()] * 100
+    return {"todos": todos, "total": 100, "page": 1, "size": 100, "success": True}
+
+
+def _page_to_json():
+    payload = _page_payload()
+    return lambda: json.dumps(payload).encode("utf-8")
+
+
+def _page_to_msgpack():
+    payload = _page_payload()
+    return lambda: msgpack.packb(payload)
+
+
+def _record_to_dict():
+    record = _fetch_todo_record()
+    if record is None:
+        return None
+    return lambda: record_to_dict(record)
+
+
+def _fetch_todo_record():
+    """asyncpg.Record has no public constructor, so build one on the server."""
+    import asyncpg
+
+    from app.core.config import settings
+
+    async def fetch():
+        conn = await asyncpg.connect(settings.database_url, timeout=5)
+        try:
+            return await conn.fetchrow(
+                """
+                SELECT $1::int AS id, $2::text AS key, $3::text AS title,
+                       $4::text AS description, $5::bool AS completed,
+                       $6::text AS priority, $7::text AS status,
+                       $8::text AS user_key, $9::timestamptz AS created_at,
+                       $10::timestamptz AS updated_at, $11::bigint AS priority_order,
+                       $12::bigint AS status_order
+                """,
+                *TODO_ROW.values(),
+            )
+        finally:
+            await conn.close()
+
+    try:
+        return asyncio.run(fetch())
+    except Exception:
+        return None
+
+
+def _pagination_link():
+    url = URL("http://localhost:8000/api/v1/todos?sort=priority-desc&page=2&size=20")
+    return lambda: build_pagination_link(url, 3, 20, 500)
+
+
+def _json_body(data: dict) -> RequestBody:
+    return RequestBody(json.dumps(data).encode(), JSON_CONTENT_TYPE)
+
+
+def _todo_create_validation():
+    raw = _json_body(
+        {
+            "title": TODO_ROW["title"],
+            "description": TODO_ROW["description"],
+            "priority": TODO_ROW["priority"],
+            "status": TODO_ROW["status"],
+            "completed": False,
+            "user_key": USER_KEY,
+        }
+    )
+
+    def run():
+        # The priority lookup needs the database and is left out
+        todo = TodoCreateValidator.parse(raw)
+        TodoCreateValidator.validate_todo_user_key(todo, USER_KEY)
+
+    return run
+
+
+def _todo_patch_validation():
+    raw = _json_body({"title": "Renamed", "completed": True})
+    return lambda: TodoPatchValidator.parse(raw)
+
+
+def _priority_create_validation():
+    raw = _json_body(
+        {
+            "name": "High",
+            "description": "Do this first",
+            "color": "#ff0000",
+            "icon": "fa-fire",
+            "order": 1,
+            "user_key": USER_KEY,
+        }
+    )
+    return lambda: PriorityCreateValidator.validate_priority(
+        PriorityCreateValidator.parse(raw), USER_KEY
+    )
+
+
+def _status_create_validation():
+    raw = _json_body(
+        {
+            "name": "In progress",
+            "description": "Being worked on",
+            "color": "#00ff00",
+            "icon": "fa-spinner",
+            "order": 2,
+            "is_default": False,
+            "user_key": USER_KEY,
+        }
+    )
+    return lambda: StatusCreateValidator.parse(raw)
+
+
+def _user_create_validation():
+    raw = _json_body(
+        {
+            "name": "Bench User",
+            "username": "bench_user",
+            "email": "bench@example.com",
+            "password": "Sup3rSecret",
+        }
+    )
+    # Uniqueness checks need the database and are left out
+    return lambda: UserCreateValidator.parse(raw)
+
+
+CASES: List[Case] = [
+    Case("rate_limit.check_rate_limit", _rate_limiter_check),
+    Case("rate_limit.record_request", _rate_limiter_record),
+    Case(
+        "rate_limit.find_matching_policy[todos]",
+        _find_policy("GET", "/api/v1/todos"),
+    ),
+    Case(
+        "rate_limit.find_matching_policy[last]",
+        _find_policy("DELETE", "/api/v1/status/abc"),
+    ),
+    Case("security.token_decode", _token_decode),
+    Case("auth.decode_jwt_cached", _cached_token_decode),
+    Case("schemas.todo_response_construct", _todo_response_construct),
+    Case("schemas.todo_response_model_dump", _todo_response_dump),
+    Case("schemas.todo_response_page_of_20", _todo_response_page),
+    Case("serialization.page_of_100_json", _page_to_json),
+    Case("serialization.page_of_100_msgpack", _page_to_msgpack),
+    Case("utils.record_to_dict", _record_to_dict),
+    Case("utils.build_pagination_link", _pagination_link),
+    Case("validators.todo_create", _todo_create_validation),
+    Case("validators.todo_patch", _todo_patch_validation),
+    Case("validators.priority_create", _priority_create_validation),
+    Case("validators.status_create", _status_create_validation),
+    Case("validators.user_create", _user_create_validation),
+]
+
+
+def measure(case: Case, repeat: int) -> Optional[float]:
+    """Return the best time per call in nanoseconds, or None if skipped."""
+    func = case.setup()
+    if func is None:
+        return None
+    number, _ = timeit.Timer(func).autorange()
+    best = float("inf")
+    for _ in range(repeat):
+        func = case.setup()
+        best = min(best, timeit.Timer(func).timeit(number) / number)
+    return best * 1e9
+
+
+def load_baseline() -> Dict[str, float]:
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text())["cases"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for hot paths")
+    parser.add_argument("-k", dest="filter", help="Only run cases containing this")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown against the baseline (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the measured numbers to the baseline file",
+    )
+    args = parser.parse_args()
+
+    baseline = load_baseline()
+    results: Dict[str, float] = {}
+    regressions = []
+    for case in CASES:
+        if args.filter and args.filter not in case.name:
+            continue
+        ns = measure(case, args.repeat)
+        if ns is None:
+            print(f"{case.name:45} skipped (no database connection)")
+            continue
+        results[case.name] = round(ns, 1)
+        line = f"{case.name:45} {ns:12.1f} ns"
+        base = baseline.get(case.name)
+        if base:
+            change = ns / base - 1
+            line += f"  {change:+7.1%} vs baseline"
+            if change > args.threshold:
+                regressions.append(case.name)
+                line += "  REGRESSION"
+        print(line)
+
+    if args.update_baseline:
+        BASELINE_PATH.parent.mkdir(exist_ok=True)
+        cases = {**baseline, **results}
+        BASELINE_PATH.write_text(
+            json.dumps(
+                {
+                    "meta": {
+                        "python": platform.python_version(),
+                        "machine": platform.machine(),
+                        "updated_at": datetime.now(timezone.utc).isoformat(),
+                    },
+                    "cases": dict(sorted(cases.items())),
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+
+    if regressions:
+        print(
+            f"{len(regressions)} case(s) slower than baseline by more than "
+            f"{args.threshold:.0%}: {', '.join(regressions)}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
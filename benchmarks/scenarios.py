@@ -0,0 +1,176 @@
+"""
+Request mixes driven by the load benchmark.
+
+An operation is a coroutine taking a BenchClient and the worker's user; it
+may issue several requests, each timed and recorded under its route template.
+"""
+
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from benchmarks.seed import BENCH_PASSWORD, SeededUser
+
+LIST_SORTS = ["incomplete-priority-desc", "priority-desc", "text-asc", "created-desc"]
+
+
+@dataclass
+class BenchUser:
+    seeded: SeededUser
+    token: Optional[str] = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+class Recorder:
+    """Collects per-route latencies and status codes."""
+
+    def __init__(self):
+        self.enabled = False
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, route: str, status: int, elapsed: float):
+        if not self.enabled:
+            return
+        self.latencies[route].append(elapsed)
+        self.statuses[route][status] += 1
+
+
+class BenchClient:
+    """Thin wrapper around an aiohttp session that times every request."""
+
+    def __init__(self, session: aiohttp.ClientSession, recorder: Recorder):
+        self.session = session
+        self.recorder = recorder
+
+    async def request(
+        self, route: str, method: str, path: str, **kwargs
+    ) -> Tuple[int, Optional[dict]]:
+        start = time.perf_counter()
+        try:
+            async with self.session.request(method, path, **kwargs) as response:
+                body = await response.read()
+                status = response.status
+        except aiohttp.ClientError:
+            # 599 mirrors the "network connect timeout" convention for failed requests
+            self.recorder.record(route, 599, time.perf_counter() - start)
+            return 599, None
+        self.recorder.record(route, status, time.perf_counter() - start)
+        if body and response.content_type == "application/json":
+            return status, json.loads(body)
+        return status, None
+
+
+async def login(client: BenchClient, user: BenchUser) -> Optional[str]:
+    status, data = await client.request(
+        "POST /api/v1/token",
+        "POST",
+        "/api/v1/token",
+        data={"username": user.seeded.username, "password": BENCH_PASSWORD},
+    )
+    if status == 200 and data:
+        return data["access_token"]
+    return None
+
+
+async def list_todos(client: BenchClient, user: BenchUser):
+    await client.request(
+        "GET /api/v1/todos",
+        "GET",
+        "/api/v1/todos",
+        headers=user.headers,
+        params={
+            "page": random.randint(1, 5),
+            "size": 20,
+            "sort": random.choice(LIST_SORTS),
+        },
+    )
+
+
+async def list_priorities(client: BenchClient, user: BenchUser):
+    await client.request(
+        "GET /api/v1/priorities", "GET", "/api/v1/priorities", headers=user.headers
+    )
+
+
+async def list_statuses(client: BenchClient, user: BenchUser):
+    await client.request(
+        "GET /api/v1/statuses", "GET", "/api/v1/statuses", headers=user.headers
+    )
+
+
+async def get_todo(client: BenchClient, user: BenchUser):
+    if not user.seeded.todos:
+        return
+    key = random.choice(user.seeded.todos)
+    await client.request(
+        "GET /api/v1/todo/{key}", "GET", f"/api/v1/todo/{key}", headers=user.headers
+    )
+
+
+async def todo_lifecycle(client: BenchClient, user: BenchUser):
+    """Create a todo, read it, patch it and delete it again."""
+    status, data = await client.request(
+        "POST /api/v1/todos",
+        "POST",
+        "/api/v1/todos",
+        headers=user.headers,
+        json={
+            "title": "Bench todo",
+            "description": "Created by the load benchmark",
+            "priority": random.choice(user.seeded.priorities),
+            "status": random.choice(user.seeded.statuses),
+            "completed": False,
+            "user_key": user.seeded.key,
+        },
+    )
+    if status != 201 or not data:
+        return
+    key = data["key"]
+    await client.request(
+        "GET /api/v1/todo/{key}", "GET", f"/api/v1/todo/{key}", headers=user.headers
+    )
+    await client.request(
+        "PATCH /api/v1/todo/{key}",
+        "PATCH",
+        f"/api/v1/todo/{key}",
+        headers=user.headers,
+        json={"completed": True},
+    )
+    await client.request(
+        "DELETE /api/v1/todo/{key}",
+        "DELETE",
+        f"/api/v1/todo/{key}",
+        headers=user.headers,
+    )
+
+
+async def login_burst(client: BenchClient, user: BenchUser):
+    await login(client, user)
+
+
+Operation = Callable[[BenchClient, BenchUser], Awaitable[None]]
+
+# mix name -> [(weight, operation)]
+MIXES: Dict[str, List[Tuple[int, Operation]]] = {
+    # A client polling its todo list, occasionally refreshing lookups
+    "polling": [(8, list_todos), (1, list_priorities), (1, list_statuses)],
+    "crud": [(3, todo_lifecycle), (1, get_todo), (1, list_todos)],
+    "login": [(1, login_burst)],
+    "mixed": [
+        (10, list_todos),
+        (2, list_priorities),
+        (2, list_statuses),
+        (3, get_todo),
+        (2, todo_lifecycle),
+        (1, login_burst),
+    ],
+}
@@ -0,0 +1,125 @@
+"""
+Seed a Postgres database with benchmark users, priorities, statuses and todos.
+
+Every seeded row belongs to a user whose username starts with the run prefix,
+so a run can be cleaned up again without touching other data.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from typing import List
+
+import asyncpg
+
+from app.core.security import PasswordHasher
+from app.utils.ordering import RANK_GAP
+
+BENCH_PASSWORD = "bench-password"
+PRIORITY_NAMES = ["Urgent", "High", "Medium", "Low"]
+STATUS_NAMES = ["Todo", "In progress", "Done"]
+TODO_COLUMNS = [
+    "key",
+    "title",
+    "description",
+    "completed",
+    "priority",
+    "status",
+    "user_key",
+]
+
+
+@dataclass
+class SeededUser:
+    key: str
+    username: str
+    priorities: List[str] = field(default_factory=list)
+    statuses: List[str] = field(default_factory=list)
+    todos: List[str] = field(default_factory=list)
+
+
+async def seed(
+    conn: asyncpg.Connection, prefix: str, users: int, todos_per_user: int
+) -> List[SeededUser]:
+    """Create `users` users with `todos_per_user` todos each and return them."""
+    hashed_password = PasswordHasher.hash(BENCH_PASSWORD)
+    seeded = []
+    for i in range(users):
+        user = SeededUser(key=str(uuid.uuid4()), username=f"{prefix}_{i}")
+        async with conn.transaction():
+            await conn.execute(
+                """
+                INSERT INTO users (key, name, username, email, hashed_password, is_active)
+                VALUES ($1, $2, $3, $4, $5, TRUE)
+                """,
+                user.key,
+                f"Bench user {i}",
+                user.username,
+                f"{user.username}@bench.local",
+                hashed_password,
+            )
+            for order, name in enumerate(PRIORITY_NAMES, start=1):
+                priority_key = str(uuid.uuid4())
+                await conn.execute(
+                    """
+                    INSERT INTO priorities (key, name, color, rank, user_key)
+                    VALUES ($1, $2, '#888888', $3, $4)
+                    """,
+                    priority_key,
+                    name,
+                    order * RANK_GAP,
+                    user.key,
+                )
+                user.priorities.append(priority_key)
+            for order, name in enumerate(STATUS_NAMES, start=1):
+                status_key = str(uuid.uuid4())
+                await conn.execute(
+                    """
+                    INSERT INTO statuses
+                    (key, name, color, icon, rank, user_key, is_default)
+                    VALUES ($1, $2, '#888888', 'fa-circle', $3, $4, $5)
+                    """,
+                    status_key,
+                    name,
+                    order * RANK_GAP,
+                    user.key,
+                    order == 1,
+                )
+                user.statuses.append(status_key)
+
+            records = []
+            for n in range(todos_per_user):
+                todo_key = str(uuid.uuid4())
+                records.append(
+                    (
+                        todo_key,
+                        f"Todo {n}",
+                        f"Seeded todo {n} for {user.username}",
+                        n % 3 == 0,
+                        user.priorities[n % len(user.priorities)],
+                        user.statuses[n % len(user.statuses)],
+                        user.key,
+                    )
+                )
+                user.todos.append(todo_key)
+            if records:
+                await conn.copy_records_to_table(
+                    "todos", records=records, columns=TODO_COLUMNS
+                )
+        seeded.append(user)
+    await conn.execute("ANALYZE todos")
+    return seeded
+
+
+async def cleanup(conn: asyncpg.Connection, prefix: str) -> None:
+    """Delete every row created by a run with the given prefix."""
+    user_keys = await conn.fetch(
+        "SELECT key FROM users WHERE username LIKE $1", f"{prefix}\\_%"
+    )
+    keys = [r["key"] for r in user_keys]
+    if not keys:
+        return
+    async with conn.transaction():
+        await conn.execute("DELETE FROM todos WHERE user_key = ANY($1)", keys)
+        await conn.execute("DELETE FROM statuses WHERE user_key = ANY($1)", keys)
+        await conn.execute("DELETE FROM priorities WHERE user_key = ANY($1)", keys)
+        await conn.execute("DELETE FROM users WHERE key = ANY($1)", keys)
@@ -1,19 +1,43 @@
+import asyncio
+import contextlib
 from aiohttp import web
 import asyncpg
 from app.core.config import settings
+from db.pool import PoolMonitor
 
 # ---------- App factory + lifecycle ----------
 
 
 async def init_db(app: web.Application):
     dsn = settings.database_url
+    max_size = settings.db_pool_max
+    if settings.db_pool_adaptive:
+        max_size = max(max_size, settings.db_pool_adaptive_max)
     app["db_pool"] = await asyncpg.create_pool(
         dsn=dsn,
         min_size=settings.db_pool_min,
-        max_size=settings.db_pool_max,
+        max_size=max_size,
         command_timeout=60,
+        max_inactive_connection_lifetime=settings.db_pool_max_inactive_lifetime,
+        server_settings={"statement_timeout": str(settings.db_statement_timeout_ms)},
     )
+    app["db_pool_monitor"] = PoolMonitor(
+        app["db_pool"],
+        limit=settings.db_pool_max,
+        min_limit=settings.db_pool_min,
+        max_limit=max_size,
+        target_wait_ms=settings.db_pool_target_wait_ms,
+    )
+    if settings.db_pool_adaptive:
+        app["db_pool_controller"] = asyncio.create_task(
+            app["db_pool_monitor"].run_controller(settings.db_pool_adjust_interval)
+        )
 
 
 async def close_db(app: web.Application):
+    controller = app.get("db_pool_controller")
+    if controller is not None:
+        controller.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await controller
     await app["db_pool"].close()
@@ -0,0 +1,144 @@
+# db/events.py
+import asyncio
+import contextlib
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+import asyncpg
+from aiohttp import web
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "app_events"
+# Sent to a subscriber whose events were dropped; the client should refetch
+RESYNC_EVENT = {"type": "resync"}
+
+
+class Subscription:
+    """A bounded queue of events for one stream."""
+
+    def __init__(self, user_key: str, max_size: int):
+        self.user_key = user_key
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.dropped = 0
+
+    def push(self, event: Optional[dict]):
+        """Queue an event; when the client can't keep up, replace the backlog."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow consumer: drop everything and ask the client to resync
+            # instead of buffering without bound or blocking other streams
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT if event is not None else None)
+
+
+class EventBroker:
+    """
+    Fans out change notifications from one LISTEN connection to SSE streams.
+
+    Each worker holds a single dedicated connection (outside the pool) that
+    listens on EVENTS_CHANNEL and dispatches each notification to the
+    subscriptions of the user it belongs to.
+    """
+
+    def __init__(self, dsn: str, queue_size: int):
+        self.dsn = dsn
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._conn: Optional[asyncpg.Connection] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.notifications = 0
+
+    async def start(self):
+        self._conn = await asyncpg.connect(self.dsn)
+        self._conn.add_termination_listener(self._on_terminated)
+        await self._conn.add_listener(EVENTS_CHANNEL, self._on_notification)
+
+    async def close(self):
+        self._closing = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reconnect_task
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+
+    def close_streams(self):
+        """End every open stream, e.g. on shutdown."""
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                subscription.push(None)
+
+    def subscribe(self, user_key: str) -> Subscription:
+        subscription = Subscription(user_key, self.queue_size)
+        self._subscribers[user_key].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscribers.get(subscription.user_key)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscribers[subscription.user_key]
+
+    def _on_notification(self, conn, pid, channel, payload: str):
+        self.notifications += 1
+        try:
+            event = json.loads(payload)
+        except json.JSONDecodeError:
+            logger.error(f"Invalid event payload: {payload!r}")
+            return
+        for subscription in self._subscribers.get(event.pop("user_key", None), ()):
+            subscription.push(event)
+
+    def _on_terminated(self, conn):
+        if self._closing:
+            return
+        logger.error("Event listener connection lost, reconnecting")
+        self._reconnect_task = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self):
+        delay = 1
+        while True:
+            try:
+                await self.start()
+                break
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.error(f"Event listener reconnect failed: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+        # Notifications sent while disconnected are lost
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                subscription.push(RESYNC_EVENT)
+
+    def stats(self) -> dict:
+        return {
+            "streams": sum(len(s) for s in self._subscribers.values()),
+            "users": len(self._subscribers),
+            "notifications": self.notifications,
+        }
+
+
+# ---------- App lifecycle ----------
+
+
+async def init_events(app: web.Application):
+    app["event_broker"] = EventBroker(settings.database_url, settings.events_queue_size)
+    await app["event_broker"].start()
+
+
+async def close_event_streams(app: web.Application):
+    app["event_broker"].close_streams()
+
+
+async def close_events(app: web.Application):
+    await app["event_broker"].close()
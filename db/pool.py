@@ -0,0 +1,149 @@
+# db/pool.py
+import asyncio
+import contextlib
+import logging
+import time
+from typing import AsyncIterator
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the acquire-wait histogram buckets; the last bucket is +Inf
+WAIT_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class PoolMonitor:
+    """
+    Admission limit and wait-time metrics in front of an asyncpg pool.
+
+    asyncpg cannot resize a pool once created, so the pool is created at the
+    upper bound and `limit` caps how many connections are handed out at once.
+    Connections above the limit go idle and are closed by
+    max_inactive_connection_lifetime. `adjust` moves the limit between
+    min_limit and max_limit based on the waits seen since the previous call.
+    """
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        limit: int,
+        min_limit: int,
+        max_limit: int,
+        target_wait_ms: float = 5.0,
+    ):
+        self.pool = pool
+        self.limit = limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_wait_ms = target_wait_ms
+        self._in_use = 0
+        self._cond = asyncio.Condition()
+
+        self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.acquisitions = 0
+        self.exhausted = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.resizes = 0
+
+        # Counters since the last adjust() call
+        self._interval_acquisitions = 0
+        self._interval_slow = 0
+        self._interval_peak = 0
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        """Acquire a pool connection, recording how long the caller waited."""
+        start = time.perf_counter()
+        async with self._cond:
+            if self._in_use >= self.limit:
+                self.exhausted += 1
+                await self._cond.wait_for(lambda: self._in_use < self.limit)
+            self._in_use += 1
+            self._interval_peak = max(self._interval_peak, self._in_use)
+        try:
+            async with self.pool.acquire() as conn:
+                self._record_wait((time.perf_counter() - start) * 1000)
+                yield conn
+        finally:
+            async with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+
+    def _record_wait(self, wait_ms: float):
+        self.acquisitions += 1
+        self._interval_acquisitions += 1
+        self.wait_total_ms += wait_ms
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+        for i, bound in enumerate(WAIT_BUCKETS_MS):
+            if wait_ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        if wait_ms > self.target_wait_ms:
+            self._interval_slow += 1
+
+    async def set_limit(self, limit: int):
+        limit = max(self.min_limit, min(self.max_limit, limit))
+        if limit == self.limit:
+            return
+        logger.info(f"Resizing database pool limit from {self.limit} to {limit}")
+        self.limit = limit
+        self.resizes += 1
+        async with self._cond:
+            self._cond.notify_all()
+
+    def next_limit(self) -> int:
+        """
+        Decide the limit for the next interval and reset the interval counters.
+
+        Grows by a quarter when more than 5% of acquisitions waited longer than
+        the target; shrinks by one when nobody waited and the peak usage left
+        at least two connections unused.
+        """
+        acquisitions = self._interval_acquisitions
+        slow = self._interval_slow
+        peak = self._interval_peak
+        self._interval_acquisitions = self._interval_slow = 0
+        self._interval_peak = self._in_use
+
+        if acquisitions and slow / acquisitions > 0.05:
+            return self.limit + max(1, self.limit // 4)
+        if slow == 0 and peak <= self.limit - 2:
+            return self.limit - 1
+        return self.limit
+
+    async def run_controller(self, interval: float):
+        """Periodically resize the limit; runs until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.set_limit(self.next_limit())
+
+    def stats(self) -> dict:
+        """Return pool utilization and acquire-wait metrics."""
+        histogram = {}
+        cumulative = 0
+        for bound, count in zip(WAIT_BUCKETS_MS, self.buckets):
+            cumulative += count
+            histogram[f"le_{bound}ms"] = cumulative
+        histogram["le_inf"] = cumulative + self.buckets[-1]
+        return {
+            "size": self.pool.get_size(),
+            "idle": self.pool.get_idle_size(),
+            "in_use": self._in_use,
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "resizes": self.resizes,
+            "acquisitions": self.acquisitions,
+            "exhausted": self.exhausted,
+            "wait_avg_ms": (
+                round(self.wait_total_ms / self.acquisitions, 3)
+                if self.acquisitions
+                else 0.0
+            ),
+            "wait_max_ms": round(self.wait_max_ms, 3),
+            "wait_histogram": histogram,
+        }
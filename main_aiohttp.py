@@ -1,6 +1,7 @@
 import logging
 from aiohttp import web
 from db.conn import init_db, close_db
+from db.events import init_events, close_event_streams, close_events
 from app.middleware.config import get_middleware_stack
 from app.api.v1.route_manager import register_all_routes
 
@@ -11,6 +12,9 @@ def create_app() -> web.Application:
     app = web.Application(middlewares=get_middleware_stack())
     app.add_routes(register_all_routes())
     app.on_startup.append(init_db)
+    app.on_startup.append(init_events)
+    app.on_shutdown.append(close_event_streams)
+    app.on_cleanup.append(close_events)
     app.on_cleanup.append(close_db)
     return app
 
@@ -20,6 +24,8 @@ if __name__ == "__main__":
         create_app(),
         host="localhost",
         port=8000,
+        # Cancel handlers (and their running queries) when the client disconnects
+        handler_cancellation=True,
         access_log_format='\n%a | %t \n"%r" \nStatus: %s | Resp Size: %b | Time: %T'
         "\n-------------------------------------------------",
     )
@@ -7,6 +7,8 @@ from sqlalchemy.pool import StaticPool
 from db.database import Base
 from main_aiohttp import create_app
 from app.core.config import settings
+from app.middleware.authentication import reset_token_cache
+from app.middleware.coalescing import reset_coalescer
 from app.middleware.rate_limit import reset_rate_limiters
 from tests.factories import AuthFactory
 
@@ -39,6 +41,8 @@ def test_db_url():
 async def reset_rate_limits():
     """Reset rate limiters before each test to prevent rate limiting issues"""
     reset_rate_limiters()
+    reset_token_cache()
+    reset_coalescer()
     yield
 
 
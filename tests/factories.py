@@ -4,6 +4,7 @@ from datetime import datetime, timezone, timedelta
 from typing import Dict, Any
 from faker import Faker
 from app.core.security import TokenManager
+from app.utils.ordering import RANK_GAP
 
 fake = Faker()
 
@@ -52,7 +53,7 @@ class PriorityFactory:
             "description": fake.sentence(),
             "color": fake.hex_color(),
             "icon": "fa-star",
-            "order": fake.random_int(min=1, max=10),
+            "order": None,
             "user_key": user_key,
         }
         data.update(overrides)
@@ -61,10 +62,18 @@ class PriorityFactory:
     @staticmethod
     async def create_priority(conn, user_key: str, **overrides) -> Dict[str, Any]:
         priority_data = PriorityFactory.create_priority_data(user_key, **overrides)
+        # An order places the row at order * RANK_GAP, else after the user's last
         return await conn.fetchrow(
-            """
-            INSERT INTO priorities (key, name, description, color, icon, "order", user_key)
-            VALUES ($1, $2, $3, $4, $5, $6, $7)
+            f"""
+            INSERT INTO priorities (key, name, description, color, icon, rank, user_key)
+            VALUES (
+                $1, $2, $3, $4, $5,
+                COALESCE(
+                    $6::bigint * {RANK_GAP},
+                    (SELECT COALESCE(MAX(rank), 0) + {RANK_GAP} FROM priorities WHERE user_key = $7)
+                ),
+                $7
+            )
             RETURNING *
             """,
             priority_data["key"],
@@ -174,7 +183,7 @@ class StatusFactory:
             "description": fake.sentence(),
             "color": fake.hex_color(),
             "icon": "fa-star",
-            "order": fake.random_int(min=1, max=10),
+            "order": None,
             "user_key": user_key,
             "is_default": False,
         }
@@ -184,10 +193,18 @@ class StatusFactory:
     @staticmethod
     async def create_status(conn, user_key: str, **overrides) -> Dict[str, Any]:
         status_data = StatusFactory.create_status_data(user_key, **overrides)
+        # An order places the row at order * RANK_GAP, else after the user's last
         return await conn.fetchrow(
-            """
-            INSERT INTO statuses (key, name, description, color, icon, "order", user_key, is_default)
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+            f"""
+            INSERT INTO statuses (key, name, description, color, icon, rank, user_key, is_default)
+            VALUES (
+                $1, $2, $3, $4, $5,
+                COALESCE(
+                    $6::bigint * {RANK_GAP},
+                    (SELECT COALESCE(MAX(rank), 0) + {RANK_GAP} FROM statuses WHERE user_key = $7)
+                ),
+                $7, $8
+            )
             RETURNING *
             """,
             status_data["key"],
@@ -0,0 +1,96 @@
+"""
+Tests for the verified token cache in the authentication middleware.
+"""
+
+import time
+import pytest
+from app.core.config import settings
+from app.middleware.authentication import VerifiedTokenCache, token_cache
+
+
+class TestVerifiedTokenCache:
+    def test_lru_eviction(self):
+        """Test that the least recently used token is evicted first"""
+        cache = VerifiedTokenCache(max_size=2)
+        exp = time.time() + 3600
+        cache.put("token-a", {"sub": "a", "exp": exp})
+        cache.put("token-b", {"sub": "b", "exp": exp})
+        assert cache.get("token-a")["sub"] == "a"
+        cache.put("token-c", {"sub": "c", "exp": exp})
+
+        assert cache.get("token-b") is None
+        assert cache.get("token-a")["sub"] == "a"
+        assert cache.get("token-c")["sub"] == "c"
+        assert cache.stats()["evictions"] == 1
+
+    def test_expired_entry_is_a_miss(self):
+        """Test that entries past exp plus leeway are not served"""
+        cache = VerifiedTokenCache(max_size=10)
+        cache.put("expired", {"exp": time.time() - settings.JWT_LEEWAY - 1})
+        cache.put("in-leeway", {"exp": time.time() - settings.JWT_LEEWAY / 2})
+
+        assert cache.get("expired") is None
+        assert cache.get("in-leeway") is not None
+        stats = cache.stats()
+        assert stats["expirations"] == 1
+        assert stats["size"] == 1
+
+    def test_cached_claims_are_copies(self):
+        """Test that mutating returned claims does not change the cache"""
+        cache = VerifiedTokenCache(max_size=10)
+        cache.put("token", {"sub": "a", "exp": time.time() + 60})
+        cache.get("token")["sub"] = "b"
+        assert cache.get("token")["sub"] == "a"
+
+    def test_disabled_cache(self):
+        """Test that a cache with size 0 stores nothing"""
+        cache = VerifiedTokenCache(max_size=0)
+        cache.put("token", {"exp": time.time() + 60})
+        assert cache.get("token") is None
+        assert cache.stats()["size"] == 0
+
+
+class TestTokenCacheMiddleware:
+    @pytest.mark.asyncio
+    async def test_repeat_requests_hit_cache(self, auth_client):
+        """Test that a reused token is verified once"""
+        for _ in range(3):
+            response = await auth_client.get("/api/v1/todos")
+            assert response.status == 200
+
+        stats = token_cache.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 2
+        assert stats["size"] == 1
+
+    @pytest.mark.asyncio
+    async def test_tampered_token_is_rejected(self, auth_client):
+        """Test that a modified token is verified instead of served from cache"""
+        response = await auth_client.get("/api/v1/todos")
+        assert response.status == 200
+
+        token = auth_client.session.headers["Authorization"][7:]
+        tampered = token[:-2] + ("AA" if token[-2:] != "AA" else "BB")
+        response = await auth_client.get(
+            "/api/v1/todos", headers={"Authorization": f"Bearer {tampered}"}
+        )
+        assert response.status == 401
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self, auth_client, monkeypatch):
+        """Test that the metrics endpoint reports cache counters"""
+        monkeypatch.setattr(settings, "metrics_enabled", True)
+        await auth_client.get("/api/v1/todos")
+        await auth_client.get("/api/v1/todos")
+
+        response = await auth_client.get("/metrics")
+        assert response.status == 200
+        data = await response.json()
+        assert data["auth_token_cache"]["hits"] >= 1
+        assert data["auth_token_cache"]["hit_rate"] > 0
+
+    @pytest.mark.asyncio
+    async def test_metrics_disabled_by_default(self, auth_client):
+        """Test that the metrics endpoint is not served unless enabled"""
+        response = await auth_client.get("/metrics")
+        assert response.status == 404
@@ -0,0 +1,231 @@
+"""
+Tests for multiplexed batch requests.
+"""
+
+import pytest
+from aiohttp.test_utils import make_mocked_request
+from app.api.v1.endpoints.batch import _sub_request
+from app.middleware.rate_limit import _rate_limiter
+from app.schemas.batch import BatchSubRequest
+from tests.factories import PriorityFactory, StatusFactory, TodoFactory
+
+
+async def _seed(auth_client, db_conn):
+    user_key = auth_client.session.headers["User-Key"]
+    priority = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+    status = await StatusFactory.create_status(db_conn, user_key, order=1)
+    todo = await TodoFactory.create_todo(
+        db_conn, user_key, priority["key"], status["key"], title="Batched"
+    )
+    return user_key, priority, status, todo
+
+
+def _new_todo(user_key, priority, status, title):
+    return {
+        "title": title,
+        "priority": priority["key"],
+        "status": status["key"],
+        "completed": False,
+        "user_key": user_key,
+    }
+
+
+class TestBatch:
+    @pytest.mark.asyncio
+    async def test_launch_reads_in_one_request(self, auth_client, db_conn):
+        """Test that several reads are answered in request order"""
+        user_key, priority, status, todo = await _seed(auth_client, db_conn)
+
+        response = await auth_client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {"id": "todos", "method": "GET", "path": "/api/v1/todos?size=5"},
+                    {"id": "priorities", "method": "GET", "path": "/api/v1/priorities"},
+                    {"id": "statuses", "method": "GET", "path": "/api/v1/statuses"},
+                    {"id": "me", "method": "GET", "path": f"/api/v1/user/{user_key}"},
+                ]
+            },
+        )
+        assert response.status == 200
+        data = await response.json()
+        assert data["committed"] is True
+        assert [r["id"] for r in data["responses"]] == [
+            "todos",
+            "priorities",
+            "statuses",
+            "me",
+        ]
+        assert all(r["status"] == 200 for r in data["responses"])
+        todos, priorities, statuses, me = (r["body"] for r in data["responses"])
+        assert todos["todos"][0]["key"] == todo["key"]
+        assert priorities["priorities"][0]["key"] == priority["key"]
+        assert statuses["statuses"][0]["key"] == status["key"]
+        assert me["username"] == "authenticated_user"
+
+    @pytest.mark.asyncio
+    async def test_errors_are_returned_per_sub_request(self, auth_client):
+        """Test that failed sub-requests don't fail the batch"""
+        response = await auth_client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {"method": "GET", "path": "/api/v1/todo/missing"},
+                    {"method": "GET", "path": "/api/v1/nope"},
+                    {"method": "GET", "path": "/api/v1/todos/export"},
+                    {"method": "GET", "path": "/api/v1/todos"},
+                ]
+            },
+        )
+        assert response.status == 200
+        statuses = [r["status"] for r in (await response.json())["responses"]]
+        assert statuses == [404, 404, 422, 200]
+
+    @pytest.mark.asyncio
+    async def test_writes_without_transaction(self, auth_client, db_conn):
+        """Test that sub-request writes commit independently"""
+        user_key, priority, status, _ = await _seed(auth_client, db_conn)
+
+        response = await auth_client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {
+                        "method": "POST",
+                        "path": "/api/v1/todos",
+                        "body": _new_todo(user_key, priority, status, "First"),
+                    },
+                    {"method": "POST", "path": "/api/v1/todos", "body": {"title": "x"}},
+                ]
+            },
+        )
+        data = await response.json()
+        assert [r["status"] for r in data["responses"]] == [201, 422]
+        assert data["committed"] is True
+        assert await db_conn.fetchval("SELECT COUNT(*) FROM todos") == 2
+
+    @pytest.mark.asyncio
+    async def test_transaction_rolls_back_on_failure(self, auth_client, db_conn):
+        """Test that a failed sub-request rolls back the whole transaction"""
+        user_key, priority, status, todo = await _seed(auth_client, db_conn)
+
+        response = await auth_client.post(
+            "/api/v1/batch",
+            json={
+                "transaction": True,
+                "requests": [
+                    {
+                        "method": "POST",
+                        "path": "/api/v1/todos",
+                        "body": _new_todo(user_key, priority, status, "Rolled back"),
+                    },
+                    {"method": "DELETE", "path": f"/api/v1/todo/{todo['key']}"},
+                    {"method": "GET", "path": "/api/v1/todo/missing"},
+                    {"method": "GET", "path": "/api/v1/todos"},
+                ],
+            },
+        )
+        data = await response.json()
+        assert data["committed"] is False
+        # Execution stops at the first failure
+        assert [r["status"] for r in data["responses"]] == [201, 204, 404]
+        keys = [r["key"] for r in await db_conn.fetch("SELECT key FROM todos")]
+        assert keys == [todo["key"]]
+
+    @pytest.mark.asyncio
+    async def test_transaction_commits(self, auth_client, db_conn):
+        """Test that a transactional batch commits when every sub-request succeeds"""
+        user_key, priority, status, todo = await _seed(auth_client, db_conn)
+
+        response = await auth_client.post(
+            "/api/v1/batch",
+            json={
+                "transaction": True,
+                "requests": [
+                    {
+                        "method": "PATCH",
+                        "path": f"/api/v1/todo/{todo['key']}",
+                        "body": {"completed": True},
+                    },
+                    {"method": "GET", "path": f"/api/v1/todo/{todo['key']}"},
+                ],
+            },
+        )
+        data = await response.json()
+        assert data["committed"] is True
+        # Later sub-requests see earlier writes
+        assert data["responses"][1]["body"]["completed"] is True
+
+    @pytest.mark.asyncio
+    async def test_changes_outside_transaction_only(self, auth_client, db_conn):
+        """Test that the delta sync is refused in a transactional batch"""
+        await _seed(auth_client, db_conn)
+        requests = [{"method": "GET", "path": "/api/v1/todos/changes"}]
+
+        response = await auth_client.post(
+            "/api/v1/batch", json={"transaction": True, "requests": requests}
+        )
+        data = await response.json()
+        assert data["committed"] is False
+        assert data["responses"][0]["status"] == 422
+        assert data["responses"][0]["body"]["error"]["message"] == (
+            "GET /api/v1/todos/changes cannot run in a transactional batch"
+        )
+
+        response = await auth_client.post("/api/v1/batch", json={"requests": requests})
+        data = await response.json()
+        assert data["responses"][0]["status"] == 200
+
+    @pytest.mark.asyncio
+    async def test_sub_requests_are_rate_limited(self, auth_client):
+        """Test that sub-requests count against their own route's limits"""
+        response = await auth_client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [{"method": "GET", "path": "/api/v1/todos"}] * 11,
+            },
+        )
+        statuses = [r["status"] for r in (await response.json())["responses"]]
+        # GET /api/v1/todos allows 10 per second
+        assert statuses == [200] * 10 + [429]
+        assert any(
+            key.startswith("GET:/api/v1/todos:") for key in _rate_limiter._windows
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalid_batch(self, auth_client):
+        """Test validation of the batch body"""
+        response = await auth_client.post("/api/v1/batch", json={"requests": []})
+        assert response.status == 422
+
+        response = await auth_client.post(
+            "/api/v1/batch",
+            json={"requests": [{"method": "GET", "path": "http://example.com/"}]},
+        )
+        assert response.status == 422
+
+    @pytest.mark.asyncio
+    async def test_requires_authentication(self, client):
+        """Test that anonymous clients can't run batches"""
+        response = await client.post(
+            "/api/v1/batch",
+            json={"requests": [{"method": "GET", "path": "/api/v1/todos"}]},
+        )
+        assert response.status == 401
+
+
+class TestSubRequest:
+    @pytest.mark.asyncio
+    async def test_sub_request_body_and_route(self, client):
+        """Test the private aiohttp attributes _sub_request sets still work"""
+        template = make_mocked_request("POST", "/api/v1/batch", app=client.app)
+        sub = BatchSubRequest(
+            method="PATCH", path="/api/v1/todo/abc?fields=key", body={"title": "New"}
+        )
+
+        request = await _sub_request(template, sub)
+        assert request.method == "PATCH"
+        assert request.query["fields"] == "key"
+        assert await request.json() == {"title": "New"}
+        assert request.match_info["key"] == "abc"
+        assert request.match_info.route.resource.canonical == "/api/v1/todo/{key}"
@@ -0,0 +1,113 @@
+"""
+Tests for coalescing of identical concurrent reads.
+"""
+
+import asyncio
+import pytest
+from app.middleware.coalescing import coalescer
+from app.services.todo_service import TodoService
+from tests.factories import PriorityFactory, StatusFactory, TodoFactory
+
+
+@pytest.fixture
+def slow_get_todos(monkeypatch):
+    """Make TodoService.get_todos slow enough to overlap and count its calls"""
+    calls = []
+    original = TodoService.get_todos
+
+    async def slow(*args, **kwargs):
+        calls.append(kwargs)
+        await asyncio.sleep(0.2)
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(TodoService, "get_todos", staticmethod(slow))
+    return calls
+
+
+async def _seed_todo(db_conn, user_key: str):
+    priority = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+    status = await StatusFactory.create_status(db_conn, user_key, order=1)
+    return await TodoFactory.create_todo(
+        db_conn, user_key, priority["key"], status["key"], title="Shared"
+    )
+
+
+class TestCoalescing:
+    @pytest.mark.asyncio
+    async def test_identical_reads_share_one_execution(
+        self, auth_client, db_conn, slow_get_todos
+    ):
+        """Test that concurrent identical reads run the handler once"""
+        await _seed_todo(db_conn, auth_client.session.headers["User-Key"])
+
+        responses = await asyncio.gather(
+            *(auth_client.get("/api/v1/todos?size=5&page=1") for _ in range(4))
+        )
+        bodies = [await r.json() for r in responses]
+
+        assert len(slow_get_todos) == 1
+        assert all(r.status == 200 for r in responses)
+        assert all(b == bodies[0] for b in bodies)
+        assert bodies[0]["todos"][0]["title"] == "Shared"
+        assert coalescer.stats()["followers"] == 3
+        # Each response still carries its own request id
+        assert len({r.headers["X-Request-Id"] for r in responses}) == 4
+
+    @pytest.mark.asyncio
+    async def test_query_order_is_normalized(self, auth_client, slow_get_todos):
+        """Test that parameter order does not split a flight"""
+        await asyncio.gather(
+            auth_client.get("/api/v1/todos?page=1&size=5"),
+            auth_client.get("/api/v1/todos?size=5&page=1"),
+        )
+        assert len(slow_get_todos) == 1
+
+    @pytest.mark.asyncio
+    async def test_different_queries_run_separately(self, auth_client, slow_get_todos):
+        """Test that different queries are not coalesced"""
+        await asyncio.gather(
+            auth_client.get("/api/v1/todos?page=1"),
+            auth_client.get("/api/v1/todos?page=2"),
+        )
+        assert len(slow_get_todos) == 2
+
+    @pytest.mark.asyncio
+    async def test_read_after_write_starts_new_flight(
+        self, auth_client, db_conn, slow_get_todos
+    ):
+        """Test that a read issued after a write does not join an older flight"""
+        todo = await _seed_todo(db_conn, auth_client.session.headers["User-Key"])
+
+        first = asyncio.create_task(auth_client.get("/api/v1/todos"))
+        await asyncio.sleep(0.05)
+        response = await auth_client.patch(
+            f"/api/v1/todo/{todo['key']}", json={"title": "Renamed"}
+        )
+        assert response.status == 200
+        second = await auth_client.get("/api/v1/todos")
+        await first
+
+        assert len(slow_get_todos) == 2
+        data = await second.json()
+        assert data["todos"][0]["title"] == "Renamed"
+        # Nothing is kept per user once the reads and writes are done
+        assert coalescer._generations == {}
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_counts_every_request(self, auth_client, slow_get_todos):
+        """Test that coalesced requests are still rate limited individually"""
+        # GET /api/v1/todos allows 10 requests per second per user
+        responses = await asyncio.gather(
+            *(auth_client.get("/api/v1/todos") for _ in range(12))
+        )
+        statuses = sorted(r.status for r in responses)
+        assert statuses.count(200) == 10
+        assert statuses.count(429) == 2
+        assert len(slow_get_todos) == 1
+        remaining = sorted(
+            int(r.headers["X-RateLimit-Remaining"])
+            for r in responses
+            if r.status == 200
+        )
+        # Each request was counted separately, so no two report the same budget
+        assert len(set(remaining)) == 10
@@ -0,0 +1,177 @@
+"""
+Tests for the Server-Sent Events change feed.
+"""
+
+import asyncio
+import json
+import pytest
+from app.core.config import settings
+from db.events import RESYNC_EVENT, Subscription
+from tests.factories import AuthFactory, PriorityFactory, StatusFactory
+
+
+async def _read_message(response, timeout: float = 5.0) -> list[str]:
+    """Read lines up to the blank line that ends one SSE message"""
+    lines = []
+    while True:
+        line = await asyncio.wait_for(response.content.readline(), timeout)
+        line = line.decode("utf-8").rstrip("\n")
+        if not line:
+            if lines:
+                return lines
+            continue
+        lines.append(line)
+
+
+async def _read_event(response) -> tuple[str, dict]:
+    """Skip comments and control lines until the next named event"""
+    while True:
+        lines = await _read_message(response)
+        fields = dict(line.split(": ", 1) for line in lines if not line.startswith(":"))
+        if "event" in fields:
+            return fields["event"], json.loads(fields["data"])
+
+
+class TestEventStream:
+    @pytest.mark.asyncio
+    async def test_requires_authentication(self, client):
+        """Test that the stream rejects anonymous clients"""
+        response = await client.get("/api/v1/events")
+        assert response.status == 401
+
+    @pytest.mark.asyncio
+    async def test_streams_own_changes(self, auth_client, db_conn):
+        """Test that a write is delivered to the owner's stream"""
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+        status = await StatusFactory.create_status(db_conn, user_key, order=1)
+
+        stream = await auth_client.get("/api/v1/events")
+        assert stream.status == 200
+        assert stream.headers["Content-Type"] == "text/event-stream"
+        assert await _read_message(stream) == ["retry: 5000"]
+
+        response = await auth_client.post(
+            "/api/v1/todos",
+            json={
+                "title": "Streamed",
+                "priority": priority["key"],
+                "status": status["key"],
+                "completed": False,
+                "user_key": user_key,
+            },
+        )
+        assert response.status == 201
+        todo = await response.json()
+
+        event, data = await _read_event(stream)
+        assert event == "todo"
+        assert data == {"type": "todo", "action": "created", "keys": [todo["key"]]}
+        assert "user_key" not in data
+        stream.close()
+
+    @pytest.mark.asyncio
+    async def test_other_users_changes_are_not_streamed(self, auth_client, db_conn):
+        """Test that a stream only carries its own user's events"""
+        other = await AuthFactory.create_authenticated_user(db_conn, username="other")
+        stream = await auth_client.get("/api/v1/events")
+        await _read_message(stream)
+
+        await PriorityFactory.create_priority(db_conn, other["user"]["key"], order=1)
+        await StatusFactory.create_status(
+            db_conn, auth_client.session.headers["User-Key"], order=1
+        )
+
+        event, data = await _read_event(stream)
+        assert event == "status"
+        assert data["action"] == "created"
+        stream.close()
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_on_idle_stream(self, auth_client, monkeypatch):
+        """Test that idle streams receive heartbeat comments"""
+        monkeypatch.setattr(settings, "events_heartbeat_seconds", 0.05)
+        stream = await auth_client.get("/api/v1/events")
+        await _read_message(stream)
+
+        assert await _read_message(stream) == [": heartbeat"]
+        stream.close()
+
+    @pytest.mark.asyncio
+    async def test_stream_does_not_hold_pool_connection(self, app, auth_client):
+        """Test that open streams leave the pool's admission slots free"""
+        stream = await auth_client.get("/api/v1/events")
+        await _read_message(stream)
+
+        assert app["db_pool_monitor"].stats()["in_use"] == 0
+        assert app["event_broker"].stats()["streams"] == 1
+        stream.close()
+
+    @pytest.mark.asyncio
+    async def test_cors_headers_on_stream(self, auth_client):
+        """Test that allowed origins get the CORS headers on the stream"""
+        origin = settings.backend_cors_origins[0]
+        stream = await auth_client.get("/api/v1/events", headers={"Origin": origin})
+        assert stream.status == 200
+        assert stream.headers["Access-Control-Allow-Origin"] == origin
+        assert stream.headers["Vary"] == "Origin"
+        assert stream.headers["Access-Control-Expose-Headers"] == "X-Request-Id"
+        assert await _read_message(stream) == ["retry: 5000"]
+        stream.close()
+
+
+class TestStreamToken:
+    @pytest.mark.asyncio
+    async def test_stream_token_opens_stream(self, auth_client):
+        """Test that a stream token in the query string opens the stream"""
+        response = await auth_client.post("/api/v1/events/token")
+        assert response.status == 201
+        token = (await response.json())["token"]
+
+        # EventSource sends no Authorization header
+        auth_client.session.headers.pop("Authorization")
+        stream = await auth_client.get("/api/v1/events", params={"token": token})
+        assert stream.status == 200
+        assert await _read_message(stream) == ["retry: 5000"]
+        stream.close()
+
+    @pytest.mark.asyncio
+    async def test_stream_token_is_not_a_bearer_token(self, auth_client):
+        """Test that a stream token is rejected outside the stream"""
+        response = await auth_client.post("/api/v1/events/token")
+        token = (await response.json())["token"]
+
+        response = await auth_client.get(
+            "/api/v1/todos", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status == 401
+
+    @pytest.mark.asyncio
+    async def test_access_token_in_query_is_rejected(self, auth_client):
+        """Test that the query string takes stream tokens only"""
+        token = auth_client.session.headers.pop("Authorization").split()[1]
+        response = await auth_client.get("/api/v1/events", params={"token": token})
+        assert response.status == 401
+
+    @pytest.mark.asyncio
+    async def test_stream_token_only_on_stream(self, auth_client):
+        """Test that other routes ignore the token query parameter"""
+        response = await auth_client.post("/api/v1/events/token")
+        token = (await response.json())["token"]
+
+        auth_client.session.headers.pop("Authorization")
+        response = await auth_client.get("/api/v1/todos", params={"token": token})
+        assert response.status == 401
+
+
+class TestSubscription:
+    @pytest.mark.asyncio
+    async def test_overflow_replaces_backlog_with_resync(self):
+        """Test that a full queue collapses into a single resync event"""
+        subscription = Subscription("user", max_size=2)
+        for i in range(3):
+            subscription.push({"type": "todo", "action": "created", "keys": [str(i)]})
+
+        assert subscription.queue.qsize() == 1
+        assert subscription.queue.get_nowait() == RESYNC_EVENT
+        assert subscription.dropped == 2
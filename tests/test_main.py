@@ -1,4 +1,7 @@
+import subprocess
+import sys
 import pytest
+from benchmarks.import_time import FORBIDDEN_PACKAGES, MODULE, ROOT
 
 
 class TestMainEndpoints:
@@ -22,3 +25,22 @@ class TestMainEndpoints:
         data = await response.json()
         assert "status" in data
         assert data["status"] == "OK"
+
+
+class TestImportGraph:
+    def test_server_does_not_import_migration_packages(self):
+        """Test that SQLAlchemy and other unused frameworks stay out of the server"""
+        code = (
+            f"import sys, {MODULE}; "
+            "print(' '.join(sorted({m.split('.')[0] for m in sys.modules})))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        imported = set(result.stdout.split())
+        assert "aiohttp" in imported
+        assert not imported & set(FORBIDDEN_PACKAGES)
@@ -0,0 +1,132 @@
+"""
+Tests for MessagePack request and response bodies.
+"""
+
+import msgpack
+import pytest
+from tests.factories import PriorityFactory, StatusFactory, TodoFactory
+
+MSGPACK = "application/msgpack"
+
+
+async def _seed(auth_client, db_conn):
+    user_key = auth_client.session.headers["User-Key"]
+    priority = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+    status = await StatusFactory.create_status(db_conn, user_key, order=1)
+    return user_key, priority, status
+
+
+class TestMsgpack:
+    @pytest.mark.asyncio
+    async def test_list_as_msgpack(self, auth_client, db_conn):
+        """Test that a listing has the same content in both formats"""
+        user_key, priority, status = await _seed(auth_client, db_conn)
+        await TodoFactory.create_todo(db_conn, user_key, priority["key"], status["key"])
+
+        json_response = await auth_client.get("/api/v1/todos")
+        response = await auth_client.get("/api/v1/todos", headers={"Accept": MSGPACK})
+        assert response.status == 200
+        assert response.content_type == MSGPACK
+        assert msgpack.unpackb(await response.read()) == await json_response.json()
+
+    @pytest.mark.asyncio
+    async def test_create_from_msgpack(self, auth_client, db_conn):
+        """Test creating a todo from a MessagePack body"""
+        user_key, priority, status = await _seed(auth_client, db_conn)
+        body = {
+            "title": "Packed",
+            "priority": priority["key"],
+            "status": status["key"],
+            "completed": False,
+            "user_key": user_key,
+        }
+        response = await auth_client.post(
+            "/api/v1/todos",
+            data=msgpack.packb(body),
+            headers={"Content-Type": MSGPACK, "Accept": MSGPACK},
+        )
+        assert response.status == 201
+        data = msgpack.unpackb(await response.read())
+        assert data["title"] == "Packed"
+        assert data["priority"] == priority["key"]
+
+    @pytest.mark.asyncio
+    async def test_validation_error_as_msgpack(self, auth_client, db_conn):
+        """Test that errors keep their message and are encoded as requested"""
+        user_key, priority, status = await _seed(auth_client, db_conn)
+        body = {
+            "title": " ",
+            "priority": priority["key"],
+            "status": status["key"],
+            "completed": False,
+            "user_key": user_key,
+        }
+        response = await auth_client.post(
+            "/api/v1/todos",
+            data=msgpack.packb(body),
+            headers={"Content-Type": MSGPACK, "Accept": MSGPACK},
+        )
+        assert response.status == 422
+        assert response.content_type == MSGPACK
+        data = msgpack.unpackb(await response.read())
+        assert data["error"]["code"] == "validation_error"
+        assert data["error"]["message"] == "Title is required"
+
+    @pytest.mark.asyncio
+    async def test_invalid_msgpack_body(self, auth_client):
+        """Test that a body that does not decode is a validation error"""
+        response = await auth_client.post(
+            "/api/v1/todos/lookup",
+            data=b"\xc1",
+            headers={"Content-Type": MSGPACK},
+        )
+        assert response.status == 422
+        data = await response.json()
+        assert data["error"]["message"] == "Body is not valid MessagePack"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "accept",
+        [
+            "*/*",
+            "application/json, application/msgpack;q=0.5",
+            "application/msgpack;q=0",
+        ],
+    )
+    async def test_json_unless_msgpack_preferred(self, auth_client, accept):
+        """Test that JSON stays the default for other Accept headers"""
+        response = await auth_client.get("/api/v1/todos", headers={"Accept": accept})
+        assert response.status == 200
+        assert response.content_type == "application/json"
+
+    @pytest.mark.asyncio
+    async def test_batch_with_msgpack(self, auth_client, db_conn):
+        """Test that batch sub-responses are embedded in a MessagePack batch"""
+        await _seed(auth_client, db_conn)
+        body = {
+            "requests": [
+                {"id": "priorities", "method": "GET", "path": "/api/v1/priorities"}
+            ]
+        }
+        response = await auth_client.post(
+            "/api/v1/batch",
+            data=msgpack.packb(body),
+            headers={"Content-Type": MSGPACK, "Accept": MSGPACK},
+        )
+        assert response.status == 200
+        data = msgpack.unpackb(await response.read())
+        assert data["responses"][0]["status"] == 200
+        assert data["responses"][0]["body"]["total"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_error_as_msgpack(self, auth_client):
+        """Test that 429 responses follow the Accept header too"""
+        for _ in range(11):
+            response = await auth_client.get(
+                "/api/v1/todos", headers={"Accept": MSGPACK}
+            )
+        assert response.status == 429
+        assert response.content_type == MSGPACK
+        assert "Retry-After" in response.headers
+        data = msgpack.unpackb(await response.read())
+        assert data["error"]["code"] == "rate_limited"
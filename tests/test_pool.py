@@ -0,0 +1,97 @@
+"""
+Tests for the database pool monitor.
+"""
+
+import asyncio
+import pytest
+from app.core.config import settings
+from db.pool import PoolMonitor
+
+
+class TestPoolMonitorController:
+    def test_grows_when_waits_exceed_target(self):
+        """Test that the limit grows when acquisitions wait too long"""
+        monitor = PoolMonitor(None, limit=8, min_limit=2, max_limit=20)
+        for _ in range(10):
+            monitor._record_wait(50)
+        assert monitor.next_limit() == 10
+
+    def test_shrinks_when_idle(self):
+        """Test that the limit shrinks when connections go unused"""
+        monitor = PoolMonitor(None, limit=8, min_limit=2, max_limit=20)
+        monitor._interval_peak = 3
+        for _ in range(10):
+            monitor._record_wait(0.1)
+        assert monitor.next_limit() == 7
+
+    def test_holds_when_busy_without_waits(self):
+        """Test that the limit is kept when the pool is used but nobody waits"""
+        monitor = PoolMonitor(None, limit=8, min_limit=2, max_limit=20)
+        monitor._interval_peak = 8
+        monitor._record_wait(0.1)
+        assert monitor.next_limit() == 8
+
+    @pytest.mark.asyncio
+    async def test_set_limit_is_clamped(self):
+        """Test that resizing stays within the configured bounds"""
+        monitor = PoolMonitor(None, limit=8, min_limit=2, max_limit=10)
+        await monitor.set_limit(50)
+        assert monitor.limit == 10
+        await monitor.set_limit(0)
+        assert monitor.limit == 2
+        assert monitor.resizes == 2
+
+    def test_histogram_buckets(self):
+        """Test that waits land in cumulative histogram buckets"""
+        monitor = PoolMonitor(None, limit=8, min_limit=2, max_limit=20)
+        monitor._record_wait(0.5)
+        monitor._record_wait(7)
+        monitor._record_wait(5000)
+        counts = monitor.buckets
+        assert counts[0] == 1
+        assert counts[-1] == 1
+        assert sum(counts) == 3
+
+
+class TestPoolMonitorAcquire:
+    @pytest.mark.asyncio
+    async def test_limit_blocks_until_release(self, client):
+        """Test that acquisitions over the limit wait and count as exhausted"""
+        monitor = PoolMonitor(client.app["db_pool"], limit=1, min_limit=1, max_limit=1)
+        released = asyncio.Event()
+
+        async def hold():
+            async with monitor.acquire():
+                await released.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(_acquire_once(monitor))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        assert monitor.exhausted == 1
+
+        released.set()
+        await asyncio.gather(holder, waiter)
+        stats = monitor.stats()
+        assert stats["acquisitions"] == 2
+        assert stats["in_use"] == 0
+        assert stats["wait_histogram"]["le_inf"] == 2
+
+    @pytest.mark.asyncio
+    async def test_metrics_report_pool(self, auth_client, monkeypatch):
+        """Test that request acquisitions show up in the metrics endpoint"""
+        monkeypatch.setattr(settings, "metrics_enabled", True)
+        await auth_client.get("/api/v1/todos")
+
+        response = await auth_client.get("/metrics")
+        data = await response.json()
+        pool = data["db_pool"]
+        assert pool["acquisitions"] >= 1
+        assert pool["limit"] >= 1
+        assert pool["size"] >= 1
+
+
+async def _acquire_once(monitor: PoolMonitor):
+    async with monitor.acquire() as conn:
+        return await conn.fetchval("SELECT 1")
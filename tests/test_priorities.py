@@ -1,11 +1,39 @@
 import pytest
 import logging
-from tests.factories import PriorityFactory
+from tests.factories import PriorityFactory, StatusFactory, TodoFactory
 from app.schemas.priority import PriorityCreate, PriorityUpdate, PriorityPatch
 
 logger = logging.getLogger(__name__)
 
 
+async def _create_priorities(auth_client, names):
+    """Create priorities in the order of names and return their keys"""
+    keys = []
+    for order, name in enumerate(names, start=1):
+        priority = PriorityCreate(
+            name=name,
+            color="#FF0000",
+            icon="fa-chevron-up",
+            order=order,
+            user_key=auth_client.session.headers["User-Key"],
+        )
+        response = await auth_client.post(
+            "/api/v1/priorities", json=priority.model_dump()
+        )
+        assert response.status == 201
+        keys.append((await response.json())["key"])
+    return keys
+
+
+async def _priority_names(auth_client):
+    response = await auth_client.get("/api/v1/priorities")
+    data = await response.json()
+    assert [row["order"] for row in data["priorities"]] == list(
+        range(1, len(data["priorities"]) + 1)
+    )
+    return [row["name"] for row in data["priorities"]]
+
+
 class TestGetPriorities:
     """Test cases for priorities API endpoints"""
 
@@ -55,6 +83,59 @@ class TestGetPriorities:
         data = await response.json()
         assert data["detail"] == "Missing or invalid token"
 
+    @pytest.mark.asyncio
+    async def test_get_priorities_with_fields(self, auth_client, db_conn):
+        """Test that fields= narrows each priority to the requested fields"""
+        await PriorityFactory.create_priorities_recursively(
+            db_conn, auth_client.session.headers["User-Key"], 3
+        )
+        response = await auth_client.get("/api/v1/priorities?fields=name,order")
+        assert response.status == 200
+        data = await response.json()
+        assert data["total"] == 3
+        assert [set(p) for p in data["priorities"]] == [{"key", "name", "order"}] * 3
+        assert [p["order"] for p in data["priorities"]] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_get_priorities_with_unknown_field(self, auth_client):
+        """Test that fields outside the whitelist are rejected"""
+        response = await auth_client.get("/api/v1/priorities?fields=name,id")
+        assert response.status == 422
+        data = await response.json()
+        assert data["error"]["message"] == "Unknown field: id"
+
+    @pytest.mark.asyncio
+    async def test_get_priorities_with_counts(self, auth_client, db_conn):
+        """Test that include=counts adds total and open todo counts per priority"""
+        user_key = auth_client.session.headers["User-Key"]
+        high = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+        low = await PriorityFactory.create_priority(db_conn, user_key, order=2)
+        status = await StatusFactory.create_status(db_conn, user_key, order=1)
+        for completed in (False, False, True):
+            await TodoFactory.create_todo(
+                db_conn, user_key, high["key"], status["key"], completed=completed
+            )
+        todo = await TodoFactory.create_todo(
+            db_conn, user_key, low["key"], status["key"]
+        )
+        await db_conn.execute(
+            "UPDATE todos SET completed = true WHERE key = $1", todo["key"]
+        )
+
+        response = await auth_client.get(
+            "/api/v1/priorities?include=counts&fields=name"
+        )
+        assert response.status == 200
+        data = await response.json()
+        assert [p["todo_counts"] for p in data["priorities"]] == [
+            {"total": 3, "open": 2},
+            {"total": 1, "open": 0},
+        ]
+        assert set(data["priorities"][0]) == {"key", "name", "todo_counts"}
+
+        response = await auth_client.get("/api/v1/priorities?include=tags")
+        assert response.status == 422
+
 
 class TestCreatePriority:
     @pytest.mark.asyncio
@@ -85,21 +166,29 @@ class TestCreatePriority:
         assert data["icon"] == sample_priority_data.icon
         assert data["user_key"] == sample_priority_data.user_key
 
+    @pytest.mark.asyncio
+    async def test_create_priority_duplicate_order(self, auth_client):
+        """Test that an order in use inserts the priority at that position"""
+        await _create_priorities(auth_client, ["First", "Second"])
+
+        keys = await _create_priorities(auth_client, ["New"])
+        response = await auth_client.get(f"/api/v1/priority/{keys[0]}")
+        assert (await response.json())["order"] == 1
+        assert await _priority_names(auth_client) == ["New", "First", "Second"]
+
 
 class TestCreateValidatePriority:
     @pytest.mark.asyncio
     async def test_create_priority_empty_name(self, auth_client):
         """Test creating a priority with invalid data"""
-        invalid_data = PriorityCreate(
-            name=" ",
-            color="#FF0000",
-            icon="fa-chevron-up",
-            order=1,
-            user_key=auth_client.session.headers["User-Key"],
-        )  # Empty name
-        response = await auth_client.post(
-            "/api/v1/priorities", json=invalid_data.model_dump()
-        )
+        invalid_data = {
+            "name": " ",
+            "color": "#FF0000",
+            "icon": "fa-chevron-up",
+            "order": 1,
+            "user_key": auth_client.session.headers["User-Key"],
+        }  # Empty name
+        response = await auth_client.post("/api/v1/priorities", json=invalid_data)
         assert response.status == 422  # Validation error
         data = await response.json()
         assert data["error"]["code"] == "validation_error"
@@ -108,16 +197,14 @@ class TestCreateValidatePriority:
     @pytest.mark.asyncio
     async def test_create_priority_long_name(self, auth_client):
         """Test creating a priority with invalid data"""
-        invalid_data = PriorityCreate(
-            name="This is a long name that is greater than 100 characters for this it must be more than 100 characters so we type a very long string so it will fail",
-            color="#FF0000",
-            icon="fa-chevron-up",
-            order=1,
-            user_key=auth_client.session.headers["User-Key"],
-        )  # Empty name
-        response = await auth_client.post(
-            "/api/v1/priorities", json=invalid_data.model_dump()
-        )
+        invalid_data = {
+            "name": "This is a long name that is greater than 100 characters for this it must be more than 100 characters so we type a very long string so it will fail",
+            "color": "#FF0000",
+            "icon": "fa-chevron-up",
+            "order": 1,
+            "user_key": auth_client.session.headers["User-Key"],
+        }  # Empty name
+        response = await auth_client.post("/api/v1/priorities", json=invalid_data)
         assert response.status == 422  # Validation error
         data = await response.json()
         logger.info(data)
@@ -127,16 +214,14 @@ class TestCreateValidatePriority:
     @pytest.mark.asyncio
     async def test_create_priority_invalid_color_hex(self, auth_client):
         """Test creating a priority with invalid data"""
-        invalid_data = PriorityCreate(
-            name="High",
-            color="#00FM",
-            icon="fa-chevron-up",
-            order=1,
-            user_key=auth_client.session.headers["User-Key"],
-        )  # Empty color
-        response = await auth_client.post(
-            "/api/v1/priorities", json=invalid_data.model_dump()
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#00FM",
+            "icon": "fa-chevron-up",
+            "order": 1,
+            "user_key": auth_client.session.headers["User-Key"],
+        }  # Empty color
+        response = await auth_client.post("/api/v1/priorities", json=invalid_data)
         assert response.status == 422  # Validation error
         data = await response.json()
         assert data["error"]["code"] == "validation_error"
@@ -145,16 +230,14 @@ class TestCreateValidatePriority:
     @pytest.mark.asyncio
     async def test_create_priority_invalid_color_value(self, auth_client):
         """Test creating a priority with invalid data"""
-        invalid_data = PriorityCreate(
-            name="High",
-            color="TESTING",
-            icon="fa-chevron-up",
-            order=1,
-            user_key=auth_client.session.headers["User-Key"],
-        )  # Empty color
-        response = await auth_client.post(
-            "/api/v1/priorities", json=invalid_data.model_dump()
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "TESTING",
+            "icon": "fa-chevron-up",
+            "order": 1,
+            "user_key": auth_client.session.headers["User-Key"],
+        }  # Empty color
+        response = await auth_client.post("/api/v1/priorities", json=invalid_data)
         assert response.status == 422  # Validation error
         data = await response.json()
         assert data["error"]["code"] == "validation_error"
@@ -267,9 +350,25 @@ class TestUpdatePriority:
         data = await response.json()
         assert data["name"] == sample_priority_update_data.name
         assert data["color"] == sample_priority_update_data.color
-        assert data["order"] == sample_priority_update_data.order
+        # order is a position: 88 puts the only row first
+        assert data["order"] == 1
         assert data["icon"] == sample_priority_update_data.icon
 
+    @pytest.mark.asyncio
+    async def test_update_priority_duplicate_order(self, auth_client):
+        """Test that updating to an order in use moves the priority there"""
+        keys = await _create_priorities(auth_client, ["A", "B", "C"])
+
+        response = await auth_client.put(
+            f"/api/v1/priority/{keys[2]}",
+            json=PriorityUpdate(
+                name="C", color="#FF0000", icon="fa-chevron-up", order=1
+            ).model_dump(),
+        )
+        assert response.status == 200
+        assert (await response.json())["order"] == 1
+        assert await _priority_names(auth_client) == ["C", "A", "B"]
+
     @pytest.mark.asyncio
     async def test_update_priority_not_found(self, auth_client):
         """Test updating a non-existent priority"""
@@ -309,15 +408,15 @@ class TestUpdateValidatePriority:
         assert create_response.status == 201
         created_priority = await create_response.json()
         priority_key = created_priority["key"]
-        invalid_data = PriorityUpdate(
-            name=" ",
-            color="#FF0000",
-            icon="fa-chevron-up",
-            order=1,
-        )
+        invalid_data = {
+            "name": " ",
+            "color": "#FF0000",
+            "icon": "fa-chevron-up",
+            "order": 1,
+        }
         response = await auth_client.put(
             f"/api/v1/priority/{priority_key}",
-            json=invalid_data.model_dump(),
+            json=invalid_data,
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -341,15 +440,15 @@ class TestUpdateValidatePriority:
         assert create_response.status == 201
         created_priority = await create_response.json()
         priority_key = created_priority["key"]
-        invalid_data = PriorityUpdate(
-            name="This is a long name that is greater than 100 characters for this it must be more than 100 characters so we type a very long string so it will fail",
-            color="#FF0000",
-            icon="fa-chevron-up",
-            order=1,
-        )
+        invalid_data = {
+            "name": "This is a long name that is greater than 100 characters for this it must be more than 100 characters so we type a very long string so it will fail",
+            "color": "#FF0000",
+            "icon": "fa-chevron-up",
+            "order": 1,
+        }
         response = await auth_client.put(
             f"/api/v1/priority/{priority_key}",
-            json=invalid_data.model_dump(),
+            json=invalid_data,
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -373,15 +472,15 @@ class TestUpdateValidatePriority:
         assert create_response.status == 201
         created_priority = await create_response.json()
         priority_key = created_priority["key"]
-        invalid_data = PriorityUpdate(
-            name="High",
-            color="#00FM",
-            icon="fa-chevron-up",
-            order=1,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#00FM",
+            "icon": "fa-chevron-up",
+            "order": 1,
+        }
         response = await auth_client.put(
             f"/api/v1/priority/{priority_key}",
-            json=invalid_data.model_dump(),
+            json=invalid_data,
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -405,15 +504,15 @@ class TestUpdateValidatePriority:
         assert create_response.status == 201
         created_priority = await create_response.json()
         priority_key = created_priority["key"]
-        invalid_data = PriorityUpdate(
-            name="High",
-            color="#0000000",
-            icon="fa-chevron-up",
-            order=1,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#0000000",
+            "icon": "fa-chevron-up",
+            "order": 1,
+        }
         response = await auth_client.put(
             f"/api/v1/priority/{priority_key}",
-            json=invalid_data.model_dump(),
+            json=invalid_data,
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -437,15 +536,15 @@ class TestUpdateValidatePriority:
         assert create_response.status == 201
         created_priority = await create_response.json()
         priority_key = created_priority["key"]
-        invalid_data = PriorityUpdate(
-            name="High",
-            color="TESTING",
-            icon="fa-chevron-up",
-            order=1,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "TESTING",
+            "icon": "fa-chevron-up",
+            "order": 1,
+        }
         response = await auth_client.put(
             f"/api/v1/priority/{priority_key}",
-            json=invalid_data.model_dump(),
+            json=invalid_data,
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -469,15 +568,15 @@ class TestUpdateValidatePriority:
         assert create_response.status == 201
         created_priority = await create_response.json()
         priority_key = created_priority["key"]
-        invalid_data = PriorityUpdate(
-            name="High",
-            color="#FF0000",
-            icon=" ",
-            order=1,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#FF0000",
+            "icon": " ",
+            "order": 1,
+        }
         response = await auth_client.put(
             f"/api/v1/priority/{priority_key}",
-            json=invalid_data.model_dump(),
+            json=invalid_data,
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -501,15 +600,15 @@ class TestUpdateValidatePriority:
         assert create_response.status == 201
         created_priority = await create_response.json()
         priority_key = created_priority["key"]
-        invalid_data = PriorityUpdate(
-            name="High",
-            color="#FF0000",
-            icon="fa-chevron-up",
-            order=0,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#FF0000",
+            "icon": "fa-chevron-up",
+            "order": 0,
+        }
         response = await auth_client.put(
             f"/api/v1/priority/{priority_key}",
-            json=invalid_data.model_dump(),
+            json=invalid_data,
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -544,12 +643,25 @@ class TestPatchPriority:
         assert response.status == 200
         data = await response.json()
         assert data["name"] == "Patched Name"
-        assert data["order"] == 3
+        # order is a position: 3 puts the only row first
+        assert data["order"] == 1
         # Other fields should remain unchanged
         assert data["color"] == sample_priority_data.color
         assert data["icon"] == sample_priority_data.icon
         assert data["user_key"] == sample_priority_data.user_key
 
+    @pytest.mark.asyncio
+    async def test_patch_priority_duplicate_order(self, auth_client):
+        """Test that patching to an order in use moves the priority there"""
+        keys = await _create_priorities(auth_client, ["A", "B", "C"])
+
+        response = await auth_client.patch(
+            f"/api/v1/priority/{keys[0]}", json=PriorityPatch(order=2).model_dump()
+        )
+        assert response.status == 200
+        assert (await response.json())["order"] == 2
+        assert await _priority_names(auth_client) == ["B", "A", "C"]
+
     @pytest.mark.asyncio
     async def test_patch_priority_not_found(self, auth_client):
         """Test patching a non-existent priority"""
@@ -583,9 +695,11 @@ class TestPatchValidatePriority:
         assert create_response.status == 201
         created_priority = await create_response.json()
         priority_key = created_priority["key"]
-        invalid_data = PriorityPatch(name=" ")
+        invalid_data = {
+            "name": " ",
+        }
         response = await auth_client.patch(
-            f"/api/v1/priority/{priority_key}", json=invalid_data.model_dump()
+            f"/api/v1/priority/{priority_key}", json=invalid_data
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -609,14 +723,14 @@ class TestPatchValidatePriority:
         assert create_response.status == 201
         created_priority = await create_response.json()
         priority_key = created_priority["key"]
-        invalid_data = PriorityPatch(
-            name="This is a long name that is greater than 100 characters for this it must be more than 100 characters so we type a very long string so it will fail",
-            color="#FF0000",
-            icon="fa-chevron-up",
-            order=1,
-        )
+        invalid_data = {
+            "name": "This is a long name that is greater than 100 characters for this it must be more than 100 characters so we type a very long string so it will fail",
+            "color": "#FF0000",
+            "icon": "fa-chevron-up",
+            "order": 1,
+        }
         response = await auth_client.patch(
-            f"/api/v1/priority/{priority_key}", json=invalid_data.model_dump()
+            f"/api/v1/priority/{priority_key}", json=invalid_data
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -640,14 +754,14 @@ class TestPatchValidatePriority:
         assert create_response.status == 201
         created_priority = await create_response.json()
         priority_key = created_priority["key"]
-        invalid_data = PriorityPatch(
-            name="High",
-            color="#00FM",
-            icon="fa-chevron-up",
-            order=1,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#00FM",
+            "icon": "fa-chevron-up",
+            "order": 1,
+        }
         response = await auth_client.patch(
-            f"/api/v1/priority/{priority_key}", json=invalid_data.model_dump()
+            f"/api/v1/priority/{priority_key}", json=invalid_data
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -671,14 +785,14 @@ class TestPatchValidatePriority:
         assert create_response.status == 201
         created_priority = await create_response.json()
         priority_key = created_priority["key"]
-        invalid_data = PriorityPatch(
-            name="High",
-            color="#0000000",
-            icon="fa-chevron-up",
-            order=1,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#0000000",
+            "icon": "fa-chevron-up",
+            "order": 1,
+        }
         response = await auth_client.patch(
-            f"/api/v1/priority/{priority_key}", json=invalid_data.model_dump()
+            f"/api/v1/priority/{priority_key}", json=invalid_data
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -702,14 +816,14 @@ class TestPatchValidatePriority:
         assert create_response.status == 201
         created_priority = await create_response.json()
         priority_key = created_priority["key"]
-        invalid_data = PriorityPatch(
-            name="High",
-            color="TESTING",
-            icon="fa-chevron-up",
-            order=1,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "TESTING",
+            "icon": "fa-chevron-up",
+            "order": 1,
+        }
         response = await auth_client.patch(
-            f"/api/v1/priority/{priority_key}", json=invalid_data.model_dump()
+            f"/api/v1/priority/{priority_key}", json=invalid_data
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -733,14 +847,14 @@ class TestPatchValidatePriority:
         assert create_response.status == 201
         created_priority = await create_response.json()
         priority_key = created_priority["key"]
-        invalid_data = PriorityPatch(
-            name="High",
-            color="#FF0000",
-            icon=" ",
-            order=1,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#FF0000",
+            "icon": " ",
+            "order": 1,
+        }
         response = await auth_client.patch(
-            f"/api/v1/priority/{priority_key}", json=invalid_data.model_dump()
+            f"/api/v1/priority/{priority_key}", json=invalid_data
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -764,14 +878,14 @@ class TestPatchValidatePriority:
         assert create_response.status == 201
         created_priority = await create_response.json()
         priority_key = created_priority["key"]
-        invalid_data = PriorityPatch(
-            name="High",
-            color="#FF0000",
-            icon="fa-chevron-up",
-            order=0,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#FF0000",
+            "icon": "fa-chevron-up",
+            "order": 0,
+        }
         response = await auth_client.patch(
-            f"/api/v1/priority/{priority_key}", json=invalid_data.model_dump()
+            f"/api/v1/priority/{priority_key}", json=invalid_data
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -817,6 +931,42 @@ class TestDeletePriority:
             data["error"]["message"] == "Priority with key non-existent-key not found"
         )
 
+    @pytest.mark.asyncio
+    async def test_delete_priority_reassigns_todos(self, auth_client, db_conn):
+        """Test that reassign_to moves the todos before deleting the priority"""
+        user_key = auth_client.session.headers["User-Key"]
+        old = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+        new = await PriorityFactory.create_priority(db_conn, user_key, order=2)
+        status = await StatusFactory.create_status(db_conn, user_key, order=1)
+        for _ in range(3):
+            await TodoFactory.create_todo(db_conn, user_key, old["key"], status["key"])
+
+        response = await auth_client.delete(f"/api/v1/priority/{old['key']}")
+        assert response.status == 422
+
+        response = await auth_client.delete(
+            f"/api/v1/priority/{old['key']}?reassign_to={new['key']}"
+        )
+        assert response.status == 204
+        rows = await db_conn.fetch(
+            "SELECT priority, priority_order FROM todos WHERE user_key = $1", user_key
+        )
+        assert [tuple(r) for r in rows] == [(new["key"], new["rank"])] * 3
+
+    @pytest.mark.asyncio
+    async def test_delete_priority_invalid_reassign_to(self, auth_client, db_conn):
+        """Test that the target must be another priority of the user"""
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+
+        for target in (priority["key"], "non-existent-key"):
+            response = await auth_client.delete(
+                f"/api/v1/priority/{priority['key']}?reassign_to={target}"
+            )
+            assert response.status == 422
+        response = await auth_client.get(f"/api/v1/priority/{priority['key']}")
+        assert response.status == 200
+
 
 class TestGetPrioritiesWithData:
     @pytest.mark.asyncio
@@ -1038,3 +1188,55 @@ class TestReorderPriorities:
         assert response.status == 422
         data = await response.json()
         assert data["error"]["code"] == "validation_error"
+
+    @pytest.mark.asyncio
+    async def test_reorder_priorities_writes_one_row(self, auth_client, db_conn):
+        """Test that a move only changes the rank of the moved priority"""
+        user_key = auth_client.session.headers["User-Key"]
+        await PriorityFactory.create_priorities_recursively(db_conn, user_key, 4)
+        before = dict(
+            await db_conn.fetch(
+                "SELECT name, rank FROM priorities WHERE user_key = $1", user_key
+            )
+        )
+
+        response = await auth_client.patch(
+            "/api/v1/priority/any/reorder", json={"fromOrder": 4, "toOrder": 2}
+        )
+        assert response.status == 200
+        data = await response.json()
+        assert [(p["name"], p["order"]) for p in data["priorities"]] == [
+            ("Priority 1", 1),
+            ("Priority 4", 2),
+            ("Priority 2", 3),
+            ("Priority 3", 4),
+        ]
+        after = dict(
+            await db_conn.fetch(
+                "SELECT name, rank FROM priorities WHERE user_key = $1", user_key
+            )
+        )
+        assert [name for name in before if before[name] != after[name]] == [
+            "Priority 4"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_reorder_priorities_respaces_ranks(self, auth_client, db_conn):
+        """Test that moves keep working once the gap between two ranks runs out"""
+        user_key = auth_client.session.headers["User-Key"]
+        await PriorityFactory.create_priorities_recursively(db_conn, user_key, 3)
+
+        # Every move halves the gap behind the first priority
+        for _ in range(20):
+            response = await auth_client.patch(
+                "/api/v1/priority/any/reorder", json={"fromOrder": 3, "toOrder": 2}
+            )
+            assert response.status == 200
+        data = await response.json()
+        # 20 moves of the last priority to second place: an even number of swaps
+        assert [p["name"] for p in data["priorities"]] == [
+            "Priority 1",
+            "Priority 2",
+            "Priority 3",
+        ]
+        assert [p["order"] for p in data["priorities"]] == [1, 2, 3]
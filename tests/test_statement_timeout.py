@@ -0,0 +1,100 @@
+"""
+Tests for per-route statement timeouts and query cancellation on disconnect.
+"""
+
+import asyncio
+import pytest
+from aiohttp import web
+from app.core.config import settings
+from app.middleware import database
+
+
+async def _show_timeout(request: web.Request):
+    value = await request["conn"].fetchval("SHOW statement_timeout")
+    return web.json_response({"statement_timeout": value})
+
+
+async def _sleep(request: web.Request):
+    seconds = float(request.query.get("seconds", "5"))
+    await request["conn"].execute("SELECT pg_sleep($1)", seconds)
+    return web.json_response({"slept": seconds})
+
+
+@pytest.fixture
+def timeout_app(app, monkeypatch):
+    """App with extra routes for inspecting and exceeding statement timeouts"""
+    app.router.add_get("/test/timeout", _show_timeout)
+    app.router.add_get("/test/timeout-override", _show_timeout)
+    app.router.add_get("/test/sleep", _sleep)
+    monkeypatch.setitem(
+        database.STATEMENT_TIMEOUTS, ("GET", "/test/timeout-override"), 1500
+    )
+    monkeypatch.setitem(database.STATEMENT_TIMEOUTS, ("GET", "/test/sleep"), 200)
+    return app
+
+
+class TestStatementTimeouts:
+    @pytest.mark.asyncio
+    async def test_default_and_override(self, timeout_app, aiohttp_client):
+        """Test that overrides apply to their route only and are reset afterwards"""
+        client = await aiohttp_client(timeout_app)
+        default = f"{settings.db_statement_timeout_ms // 1000}s"
+
+        response = await client.get("/test/timeout")
+        assert (await response.json())["statement_timeout"] == default
+
+        response = await client.get("/test/timeout-override")
+        assert (await response.json())["statement_timeout"] == "1500ms"
+
+        # The connection goes back to the pool with the default restored
+        response = await client.get("/test/timeout")
+        assert (await response.json())["statement_timeout"] == default
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_503(self, timeout_app, aiohttp_client):
+        """Test that a statement exceeding the route timeout is reported"""
+        client = await aiohttp_client(timeout_app)
+        response = await client.get("/test/sleep?seconds=2")
+        assert response.status == 503
+        data = await response.json()
+        assert data["error"]["code"] == "query_timeout"
+
+    @pytest.mark.asyncio
+    async def test_single_todo_read_uses_tight_timeout(self):
+        """Test that single-todo reads are configured tighter than exports"""
+        single = database.STATEMENT_TIMEOUTS[("GET", "/api/v1/todo/{key}")]
+        export = database.STATEMENT_TIMEOUTS[("GET", "/api/v1/todos/export")]
+        assert single < settings.db_statement_timeout_ms < export
+
+
+class TestDisconnectCancellation:
+    @pytest.mark.asyncio
+    async def test_client_disconnect_cancels_query(
+        self, timeout_app, aiohttp_client, monkeypatch
+    ):
+        """Test that the backend stops working once the client goes away"""
+        monkeypatch.setitem(database.STATEMENT_TIMEOUTS, ("GET", "/test/sleep"), 30000)
+        client = await aiohttp_client(timeout_app)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.get("/test/sleep?seconds=20"), 0.5)
+
+        async with timeout_app["db_pool"].acquire() as conn:
+            for _ in range(40):
+                running = await conn.fetchval(
+                    """
+                    SELECT COUNT(*) FROM pg_stat_activity
+                    WHERE state = 'active' AND query LIKE 'SELECT pg_sleep(%'
+                    """
+                )
+                if running == 0:
+                    break
+                await asyncio.sleep(0.05)
+        assert running == 0
+
+        monitor = timeout_app["db_pool_monitor"]
+        for _ in range(40):
+            if monitor.stats()["in_use"] == 0:
+                break
+            await asyncio.sleep(0.05)
+        assert monitor.stats()["in_use"] == 0
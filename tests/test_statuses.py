@@ -1,11 +1,38 @@
 import pytest
 import logging
-from tests.factories import StatusFactory
+from tests.factories import PriorityFactory, StatusFactory, TodoFactory
 from app.schemas.status import StatusCreate, StatusUpdate, StatusPatch
 
 logger = logging.getLogger(__name__)
 
 
+async def _create_statuses(auth_client, names):
+    """Create statuses in the order of names and return their keys"""
+    keys = []
+    for order, name in enumerate(names, start=1):
+        status = StatusCreate(
+            name=name,
+            color="#FF0000",
+            icon="fa-chevron-up",
+            order=order,
+            user_key=auth_client.session.headers["User-Key"],
+            is_default=False,
+        )
+        response = await auth_client.post("/api/v1/statuses", json=status.model_dump())
+        assert response.status == 201
+        keys.append((await response.json())["key"])
+    return keys
+
+
+async def _status_names(auth_client):
+    response = await auth_client.get("/api/v1/statuses")
+    data = await response.json()
+    assert [row["order"] for row in data["statuses"]] == list(
+        range(1, len(data["statuses"]) + 1)
+    )
+    return [row["name"] for row in data["statuses"]]
+
+
 class TestGetStatuses:
     """Test cases for statuses API endpoints"""
 
@@ -55,6 +82,45 @@ class TestGetStatuses:
         data = await response.json()
         assert data["detail"] == "Missing or invalid token"
 
+    @pytest.mark.asyncio
+    async def test_get_statuses_with_fields(self, auth_client, db_conn):
+        """Test that fields= narrows list and detail responses"""
+        status = await StatusFactory.create_status(
+            db_conn, auth_client.session.headers["User-Key"], order=1
+        )
+        response = await auth_client.get("/api/v1/statuses?fields=name,is_default")
+        assert response.status == 200
+        data = await response.json()
+        assert data["statuses"] == [
+            {"key": status["key"], "name": status["name"], "is_default": False}
+        ]
+
+        response = await auth_client.get(
+            f"/api/v1/status/{status['key']}?fields=updated_at"
+        )
+        assert response.status == 200
+        assert await response.json() == {"key": status["key"], "updated_at": None}
+
+    @pytest.mark.asyncio
+    async def test_get_statuses_with_counts(self, auth_client, db_conn):
+        """Test that include=counts adds total and open todo counts per status"""
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+        busy = await StatusFactory.create_status(db_conn, user_key, order=1)
+        await StatusFactory.create_status(db_conn, user_key, order=2)
+        for completed in (False, True):
+            await TodoFactory.create_todo(
+                db_conn, user_key, priority["key"], busy["key"], completed=completed
+            )
+
+        response = await auth_client.get("/api/v1/statuses?include=counts")
+        assert response.status == 200
+        data = await response.json()
+        assert [s["todo_counts"] for s in data["statuses"]] == [
+            {"total": 2, "open": 1},
+            {"total": 0, "open": 0},
+        ]
+
 
 class TestCreateStatus:
     @pytest.mark.asyncio
@@ -85,6 +151,16 @@ class TestCreateStatus:
         assert data["icon"] == sample_status_data.icon
         assert data["user_key"] == sample_status_data.user_key
 
+    @pytest.mark.asyncio
+    async def test_create_status_duplicate_order(self, auth_client):
+        """Test that an order in use inserts the status at that position"""
+        await _create_statuses(auth_client, ["First", "Second"])
+
+        keys = await _create_statuses(auth_client, ["New"])
+        response = await auth_client.get(f"/api/v1/status/{keys[0]}")
+        assert (await response.json())["order"] == 1
+        assert await _status_names(auth_client) == ["New", "First", "Second"]
+
 
 class TestCreateValidateStatus:
     @pytest.mark.asyncio
@@ -265,9 +341,29 @@ class TestUpdateStatus:
         data = await response.json()
         assert data["name"] == sample_status_update_data.name
         assert data["color"] == sample_status_update_data.color
-        assert data["order"] == sample_status_update_data.order
+        # order is a position: 88 puts the only row first
+        assert data["order"] == 1
         assert data["icon"] == sample_status_update_data.icon
 
+    @pytest.mark.asyncio
+    async def test_update_status_duplicate_order(self, auth_client):
+        """Test that updating to an order in use moves the status there"""
+        keys = await _create_statuses(auth_client, ["A", "B", "C"])
+
+        response = await auth_client.put(
+            f"/api/v1/status/{keys[2]}",
+            json=StatusUpdate(
+                name="C",
+                color="#FF0000",
+                icon="fa-chevron-up",
+                order=1,
+                is_default=False,
+            ).model_dump(),
+        )
+        assert response.status == 200
+        assert (await response.json())["order"] == 1
+        assert await _status_names(auth_client) == ["C", "A", "B"]
+
     @pytest.mark.asyncio
     async def test_update_status_not_found(self, auth_client):
         """Test updating a non-existent status"""
@@ -307,16 +403,16 @@ class TestUpdateValidateStatus:
         assert create_response.status == 201
         created_status = await create_response.json()
         status_key = created_status["key"]
-        invalid_data = StatusUpdate(
-            name=" ",
-            color="#FF0000",
-            icon="fa-chevron-up",
-            order=1,
-            is_default=True,
-        )
+        invalid_data = {
+            "name": " ",
+            "color": "#FF0000",
+            "icon": "fa-chevron-up",
+            "order": 1,
+            "is_default": True,
+        }
         response = await auth_client.put(
             f"/api/v1/status/{status_key}",
-            json=invalid_data.model_dump(),
+            json=invalid_data,
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -341,16 +437,16 @@ class TestUpdateValidateStatus:
         assert create_response.status == 201
         created_status = await create_response.json()
         status_key = created_status["key"]
-        invalid_data = StatusUpdate(
-            name="This is a long name that is greater than 100 characters for this it must be more than 100 characters so we type a very long string so it will fail",
-            color="#FF0000",
-            icon="fa-chevron-up",
-            order=1,
-            is_default=True,
-        )
+        invalid_data = {
+            "name": "This is a long name that is greater than 100 characters for this it must be more than 100 characters so we type a very long string so it will fail",
+            "color": "#FF0000",
+            "icon": "fa-chevron-up",
+            "order": 1,
+            "is_default": True,
+        }
         response = await auth_client.put(
             f"/api/v1/status/{status_key}",
-            json=invalid_data.model_dump(),
+            json=invalid_data,
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -375,16 +471,16 @@ class TestUpdateValidateStatus:
         assert create_response.status == 201
         created_status = await create_response.json()
         status_key = created_status["key"]
-        invalid_data = StatusUpdate(
-            name="High",
-            color="#00FM",
-            icon="fa-chevron-up",
-            order=1,
-            is_default=True,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#00FM",
+            "icon": "fa-chevron-up",
+            "order": 1,
+            "is_default": True,
+        }
         response = await auth_client.put(
             f"/api/v1/status/{status_key}",
-            json=invalid_data.model_dump(),
+            json=invalid_data,
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -409,16 +505,16 @@ class TestUpdateValidateStatus:
         assert create_response.status == 201
         created_status = await create_response.json()
         status_key = created_status["key"]
-        invalid_data = StatusUpdate(
-            name="High",
-            color="#0000000",
-            icon="fa-chevron-up",
-            order=1,
-            is_default=True,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#0000000",
+            "icon": "fa-chevron-up",
+            "order": 1,
+            "is_default": True,
+        }
         response = await auth_client.put(
             f"/api/v1/status/{status_key}",
-            json=invalid_data.model_dump(),
+            json=invalid_data,
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -444,16 +540,16 @@ class TestUpdateValidateStatus:
         assert create_response.status == 201
         created_status = await create_response.json()
         status_key = created_status["key"]
-        invalid_data = StatusUpdate(
-            name="High",
-            color="TESTING",
-            icon="fa-chevron-up",
-            order=1,
-            is_default=True,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "TESTING",
+            "icon": "fa-chevron-up",
+            "order": 1,
+            "is_default": True,
+        }
         response = await auth_client.put(
             f"/api/v1/status/{status_key}",
-            json=invalid_data.model_dump(),
+            json=invalid_data,
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -479,17 +575,17 @@ class TestUpdateValidateStatus:
         assert create_response.status == 201
         created_status = await create_response.json()
         status_key = created_status["key"]
-        invalid_data = StatusUpdate(
-            name="High",
-            color="#FF0000",
-            icon=" ",
-            order=1,
-            is_default=True,
-            description="Test description",
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#FF0000",
+            "icon": " ",
+            "order": 1,
+            "is_default": True,
+            "description": "Test description",
+        }
         response = await auth_client.put(
             f"/api/v1/status/{status_key}",
-            json=invalid_data.model_dump(),
+            json=invalid_data,
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -515,17 +611,17 @@ class TestUpdateValidateStatus:
         assert create_response.status == 201
         created_status = await create_response.json()
         status_key = created_status["key"]
-        invalid_data = StatusUpdate(
-            name="High",
-            color="#FF0000",
-            icon="fa-chevron-up",
-            order=0,
-            is_default=True,
-            description="Test description",
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#FF0000",
+            "icon": "fa-chevron-up",
+            "order": 0,
+            "is_default": True,
+            "description": "Test description",
+        }
         response = await auth_client.put(
             f"/api/v1/status/{status_key}",
-            json=invalid_data.model_dump(),
+            json=invalid_data,
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -561,12 +657,25 @@ class TestPatchStatus:
         assert response.status == 200
         data = await response.json()
         assert data["name"] == "Patched Name"
-        assert data["order"] == 3
+        # order is a position: 3 puts the only row first
+        assert data["order"] == 1
         # Other fields should remain unchanged
         assert data["color"] == sample_status_data.color
         assert data["icon"] == sample_status_data.icon
         assert data["user_key"] == sample_status_data.user_key
 
+    @pytest.mark.asyncio
+    async def test_patch_status_duplicate_order(self, auth_client):
+        """Test that patching to an order in use moves the status there"""
+        keys = await _create_statuses(auth_client, ["A", "B", "C"])
+
+        response = await auth_client.patch(
+            f"/api/v1/status/{keys[0]}", json=StatusPatch(order=2).model_dump()
+        )
+        assert response.status == 200
+        assert (await response.json())["order"] == 2
+        assert await _status_names(auth_client) == ["B", "A", "C"]
+
     @pytest.mark.asyncio
     async def test_patch_status_not_found(self, auth_client):
         """Test patching a non-existent status"""
@@ -600,9 +709,11 @@ class TestPatchValidateStatus:
         assert create_response.status == 201
         created_status = await create_response.json()
         status_key = created_status["key"]
-        invalid_data = StatusPatch(name=" ")
+        invalid_data = {
+            "name": " ",
+        }
         response = await auth_client.patch(
-            f"/api/v1/status/{status_key}", json=invalid_data.model_dump()
+            f"/api/v1/status/{status_key}", json=invalid_data
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -628,14 +739,14 @@ class TestPatchValidateStatus:
         assert create_response.status == 201
         created_status = await create_response.json()
         status_key = created_status["key"]
-        invalid_data = StatusPatch(
-            name="This is a long name that is greater than 100 characters for this it must be more than 100 characters so we type a very long string so it will fail",
-            color="#FF0000",
-            icon="fa-chevron-up",
-            order=1,
-        )
+        invalid_data = {
+            "name": "This is a long name that is greater than 100 characters for this it must be more than 100 characters so we type a very long string so it will fail",
+            "color": "#FF0000",
+            "icon": "fa-chevron-up",
+            "order": 1,
+        }
         response = await auth_client.patch(
-            f"/api/v1/status/{status_key}", json=invalid_data.model_dump()
+            f"/api/v1/status/{status_key}", json=invalid_data
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -661,14 +772,14 @@ class TestPatchValidateStatus:
         assert create_response.status == 201
         created_status = await create_response.json()
         status_key = created_status["key"]
-        invalid_data = StatusPatch(
-            name="High",
-            color="#00FM",
-            icon="fa-chevron-up",
-            order=1,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#00FM",
+            "icon": "fa-chevron-up",
+            "order": 1,
+        }
         response = await auth_client.patch(
-            f"/api/v1/status/{status_key}", json=invalid_data.model_dump()
+            f"/api/v1/status/{status_key}", json=invalid_data
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -694,14 +805,14 @@ class TestPatchValidateStatus:
         assert create_response.status == 201
         created_status = await create_response.json()
         status_key = created_status["key"]
-        invalid_data = StatusPatch(
-            name="High",
-            color="#0000000",
-            icon="fa-chevron-up",
-            order=1,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#0000000",
+            "icon": "fa-chevron-up",
+            "order": 1,
+        }
         response = await auth_client.patch(
-            f"/api/v1/status/{status_key}", json=invalid_data.model_dump()
+            f"/api/v1/status/{status_key}", json=invalid_data
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -727,14 +838,14 @@ class TestPatchValidateStatus:
         assert create_response.status == 201
         created_status = await create_response.json()
         status_key = created_status["key"]
-        invalid_data = StatusPatch(
-            name="High",
-            color="TESTING",
-            icon="fa-chevron-up",
-            order=1,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "TESTING",
+            "icon": "fa-chevron-up",
+            "order": 1,
+        }
         response = await auth_client.patch(
-            f"/api/v1/status/{status_key}", json=invalid_data.model_dump()
+            f"/api/v1/status/{status_key}", json=invalid_data
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -760,14 +871,14 @@ class TestPatchValidateStatus:
         assert create_response.status == 201
         created_status = await create_response.json()
         status_key = created_status["key"]
-        invalid_data = StatusPatch(
-            name="High",
-            color="#FF0000",
-            icon=" ",
-            order=1,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#FF0000",
+            "icon": " ",
+            "order": 1,
+        }
         response = await auth_client.patch(
-            f"/api/v1/status/{status_key}", json=invalid_data.model_dump()
+            f"/api/v1/status/{status_key}", json=invalid_data
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -793,14 +904,14 @@ class TestPatchValidateStatus:
         assert create_response.status == 201
         created_status = await create_response.json()
         status_key = created_status["key"]
-        invalid_data = StatusPatch(
-            name="High",
-            color="#FF0000",
-            icon="fa-chevron-up",
-            order=0,
-        )
+        invalid_data = {
+            "name": "High",
+            "color": "#FF0000",
+            "icon": "fa-chevron-up",
+            "order": 0,
+        }
         response = await auth_client.patch(
-            f"/api/v1/status/{status_key}", json=invalid_data.model_dump()
+            f"/api/v1/status/{status_key}", json=invalid_data
         )
         assert response.status == 422  # Validation error
         data = await response.json()
@@ -846,6 +957,44 @@ class TestDeleteStatus:
         assert data["error"]["code"] == "not_found"
         assert data["error"]["message"] == "Status with key non-existent-key not found"
 
+    @pytest.mark.asyncio
+    async def test_delete_status_reassigns_todos(self, auth_client, db_conn):
+        """Test that reassign_to moves the todos and their counts"""
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+        old = await StatusFactory.create_status(db_conn, user_key, order=1)
+        new = await StatusFactory.create_status(db_conn, user_key, order=2)
+        for _ in range(2):
+            await TodoFactory.create_todo(
+                db_conn, user_key, priority["key"], old["key"]
+            )
+
+        response = await auth_client.delete(
+            f"/api/v1/status/{old['key']}?reassign_to={new['key']}"
+        )
+        assert response.status == 204
+        response = await auth_client.get("/api/v1/statuses?include=counts")
+        data = await response.json()
+        assert [s["key"] for s in data["statuses"]] == [new["key"]]
+        assert data["statuses"][0]["todo_counts"] == {"total": 2, "open": 2}
+
+    @pytest.mark.asyncio
+    async def test_delete_status_in_use(self, auth_client, db_conn):
+        """Test that a status todos still use needs reassign_to"""
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+        status = await StatusFactory.create_status(db_conn, user_key, order=1)
+        await TodoFactory.create_todo(db_conn, user_key, priority["key"], status["key"])
+
+        response = await auth_client.delete(f"/api/v1/status/{status['key']}")
+        assert response.status == 422
+        data = await response.json()
+        assert data["error"]["message"] == (
+            "Status is used by todos; pass reassign_to to move them to another status"
+        )
+        response = await auth_client.get(f"/api/v1/status/{status['key']}")
+        assert response.status == 200
+
 
 class TestGetStatusesWithData:
     @pytest.mark.asyncio
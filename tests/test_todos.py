@@ -1,5 +1,10 @@
+import csv
+import io
+import json
+import re
 import pytest
-from tests.factories import TodoFactory, PriorityFactory, StatusFactory
+from tests.factories import TodoFactory, PriorityFactory, StatusFactory, UserFactory
+from app.core.config import settings
 from app.schemas.todo import TodoCreate, TodoPatch, TodoUpdate
 
 
@@ -158,6 +163,36 @@ class TestCreateValidateTodo:
         assert data["error"]["code"] == "validation_error"
         assert data["error"]["message"] == "Title must be less than 100 characters"
 
+    @pytest.mark.asyncio
+    async def test_create_todo_checks_fields_in_order(self, auth_client, db_conn):
+        """Test that the first failing field in check order is reported"""
+        user_key = auth_client.session.headers["User-Key"]
+        invalid_data = {
+            "title": "Test Todo",
+            "description": "A" * 1001,
+            "priority": " ",
+            "completed": False,
+            "user_key": user_key,
+            "status": "status",
+        }
+        response = await auth_client.post("/api/v1/todos", json=invalid_data)
+        assert response.status == 422
+        data = await response.json()
+        assert data["error"]["code"] == "validation_error"
+        assert data["error"]["message"] == "Priority is required"
+
+    @pytest.mark.asyncio
+    async def test_create_todo_invalid_json(self, auth_client):
+        """Test creating a todo with a body that is not JSON"""
+        response = await auth_client.post(
+            "/api/v1/todos",
+            data=b"{not json",
+            headers={"Content-Type": "application/json"},
+        )
+        assert response.status == 422
+        data = await response.json()
+        assert data["error"]["code"] == "validation_error"
+
     @pytest.mark.asyncio
     async def test_create_todo_missing_required_fields(self, auth_client, db_conn):
         """Test creating a todo with missing required fields"""
@@ -647,3 +682,882 @@ class TestDeleteTodo:
         assert "error" in data
         assert data["error"]["code"] == "not_found"
         assert data["error"]["message"] == "Todo with key non-existent-key not found"
+
+    @pytest.mark.asyncio
+    async def test_delete_todo_of_other_user(self, auth_client, db_conn):
+        """Test that a todo owned by another user cannot be deleted"""
+        other = await UserFactory.create_user(db_conn, username="other_user")
+        priority = await PriorityFactory.create_priority(
+            db_conn, other["key"], name="High", order=1
+        )
+        status = await StatusFactory.create_status(
+            db_conn, other["key"], name="Status 1", order=1
+        )
+        todo = await TodoFactory.create_todo(
+            db_conn, other["key"], priority["key"], status["key"]
+        )
+
+        response = await auth_client.delete(f"/api/v1/todo/{todo['key']}")
+        assert response.status == 404
+
+        # The row must still be there for its owner
+        remaining = await db_conn.fetchval(
+            "SELECT COUNT(*) FROM todos WHERE key = $1", todo["key"]
+        )
+        assert remaining == 1
+
+
+class TestBulkTodos:
+    @pytest.mark.asyncio
+    async def test_bulk_patch_todos_with_filter(self, auth_client, db_conn):
+        """Test marking every incomplete todo as done in one request"""
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(
+            db_conn, user_key, name="High", order=1
+        )
+        status = await StatusFactory.create_status(
+            db_conn, user_key, name="Status 1", order=1
+        )
+        for i in range(3):
+            await TodoFactory.create_todo(
+                db_conn, user_key, priority["key"], status["key"], completed=False
+            )
+        await TodoFactory.create_todo(
+            db_conn, user_key, priority["key"], status["key"], completed=True
+        )
+
+        response = await auth_client.patch(
+            "/api/v1/todos?completed=false", json={"completed": True}
+        )
+        assert response.status == 200
+        data = await response.json()
+        assert data == {"affected": 3, "success": True}
+
+        open_count = await db_conn.fetchval(
+            "SELECT COUNT(*) FROM todos WHERE user_key = $1 AND NOT completed",
+            user_key,
+        )
+        assert open_count == 0
+
+    @pytest.mark.asyncio
+    async def test_bulk_patch_todos_move_status(self, auth_client, db_conn):
+        """Test moving all todos from one status to another"""
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(
+            db_conn, user_key, name="High", order=1
+        )
+        status_a = await StatusFactory.create_status(
+            db_conn, user_key, name="Status A", order=1
+        )
+        status_b = await StatusFactory.create_status(
+            db_conn, user_key, name="Status B", order=2
+        )
+        for i in range(2):
+            await TodoFactory.create_todo(
+                db_conn, user_key, priority["key"], status_a["key"]
+            )
+        await TodoFactory.create_todo(
+            db_conn, user_key, priority["key"], status_b["key"]
+        )
+
+        response = await auth_client.patch(
+            f"/api/v1/todos?status={status_a['key']}",
+            json={"status": status_b["key"]},
+        )
+        assert response.status == 200
+        data = await response.json()
+        assert data["affected"] == 2
+
+    @pytest.mark.asyncio
+    async def test_bulk_patch_todos_empty_body(self, auth_client):
+        """Test that a bulk patch without fields is rejected"""
+        response = await auth_client.patch("/api/v1/todos", json={})
+        assert response.status == 422
+        data = await response.json()
+        assert data["error"]["message"] == "No valid fields to update"
+
+    @pytest.mark.asyncio
+    async def test_bulk_delete_completed_todos(self, auth_client, db_conn):
+        """Test deleting all completed todos in one request"""
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(
+            db_conn, user_key, name="High", order=1
+        )
+        status = await StatusFactory.create_status(
+            db_conn, user_key, name="Status 1", order=1
+        )
+        for completed in (True, True, False):
+            await TodoFactory.create_todo(
+                db_conn, user_key, priority["key"], status["key"], completed=completed
+            )
+
+        response = await auth_client.delete("/api/v1/todos?completed=true")
+        assert response.status == 200
+        data = await response.json()
+        assert data == {"affected": 2, "success": True}
+
+        remaining = await db_conn.fetchval(
+            "SELECT COUNT(*) FROM todos WHERE user_key = $1", user_key
+        )
+        assert remaining == 1
+
+    @pytest.mark.asyncio
+    async def test_bulk_delete_todos_requires_filter(self, auth_client):
+        """Test that an unfiltered bulk delete must be explicit"""
+        response = await auth_client.delete("/api/v1/todos")
+        assert response.status == 422
+
+        response = await auth_client.delete("/api/v1/todos?all=true")
+        assert response.status == 200
+        data = await response.json()
+        assert data["affected"] == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "query", ["search=", "priority=", "status=", "completed=", "search=&status="]
+    )
+    async def test_bulk_delete_empty_filter_is_no_filter(
+        self, auth_client, db_conn, query
+    ):
+        """Test that empty filter values don't count as a filter"""
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+        status = await StatusFactory.create_status(db_conn, user_key, order=1)
+        await TodoFactory.create_todo(db_conn, user_key, priority["key"], status["key"])
+
+        response = await auth_client.delete(f"/api/v1/todos?{query}")
+        assert response.status == 422
+        remaining = await db_conn.fetchval(
+            "SELECT COUNT(*) FROM todos WHERE user_key = $1", user_key
+        )
+        assert remaining == 1
+
+
+class TestExportTodos:
+    @pytest.mark.asyncio
+    async def test_export_todos_ndjson(self, auth_client, db_conn):
+        """Test streaming all todos as NDJSON"""
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(
+            db_conn, user_key, name="High", order=1
+        )
+        status = await StatusFactory.create_status(
+            db_conn, user_key, name="Status 1", order=1
+        )
+        for i in range(120):
+            await TodoFactory.create_todo(
+                db_conn, user_key, priority["key"], status["key"], title=f"Todo {i}"
+            )
+
+        response = await auth_client.get("/api/v1/todos/export")
+        assert response.status == 200
+        assert response.headers["Content-Type"].startswith("application/x-ndjson")
+        body = await response.text()
+        lines = [json.loads(line) for line in body.splitlines()]
+        assert len(lines) == 120
+        assert {line["user_key"] for line in lines} == {user_key}
+
+    @pytest.mark.asyncio
+    async def test_export_todos_csv_with_filter(self, auth_client, db_conn):
+        """Test streaming filtered todos as CSV"""
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(
+            db_conn, user_key, name="High", order=1
+        )
+        status = await StatusFactory.create_status(
+            db_conn, user_key, name="Status 1", order=1
+        )
+        for completed in (True, False, False):
+            await TodoFactory.create_todo(
+                db_conn, user_key, priority["key"], status["key"], completed=completed
+            )
+
+        response = await auth_client.get(
+            "/api/v1/todos/export?format=csv&completed=false"
+        )
+        assert response.status == 200
+        assert response.headers["Content-Type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(await response.text())))
+        assert len(rows) == 2
+        assert all(row["completed"] == "False" for row in rows)
+
+    @pytest.mark.asyncio
+    async def test_export_todos_empty_csv_has_header(self, auth_client):
+        """Test that an empty CSV export still contains the header"""
+        response = await auth_client.get("/api/v1/todos/export?format=csv")
+        assert response.status == 200
+        body = await response.text()
+        assert body.splitlines() == [
+            "key,title,description,completed,priority,status,user_key,created_at,updated_at"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_export_todos_cors_headers(self, auth_client):
+        """Test that allowed origins get the CORS headers on the export"""
+        origin = settings.backend_cors_origins[0]
+        response = await auth_client.get(
+            "/api/v1/todos/export", headers={"Origin": origin}
+        )
+        assert response.status == 200
+        assert response.headers["Access-Control-Allow-Origin"] == origin
+        assert response.headers["Vary"] == "Origin"
+        assert response.headers["Access-Control-Expose-Headers"] == "X-Request-Id"
+
+    @pytest.mark.asyncio
+    async def test_export_todos_invalid_format(self, auth_client):
+        """Test that an unknown export format is rejected"""
+        response = await auth_client.get("/api/v1/todos/export?format=xml")
+        assert response.status == 422
+
+
+class TestImportTodos:
+    @pytest.mark.asyncio
+    async def test_import_todos_ndjson(self, auth_client, db_conn):
+        """Test importing todos from NDJSON, resolving names and keys"""
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(
+            db_conn, user_key, name="High", order=1
+        )
+        status = await StatusFactory.create_status(
+            db_conn, user_key, name="Todo", order=1
+        )
+        lines = [
+            {"title": f"Imported {i}", "priority": "High", "status": status["key"]}
+            for i in range(1500)
+        ]
+        lines.append(
+            {
+                "title": "Done already",
+                "priority": priority["key"],
+                "status": "Todo",
+                "completed": True,
+            }
+        )
+        body = "\n".join(json.dumps(line) for line in lines) + "\n"
+
+        response = await auth_client.post(
+            "/api/v1/todos/import",
+            data=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status == 201
+        data = await response.json()
+        assert data == {"imported": 1501, "success": True}
+
+        completed = await db_conn.fetchval(
+            "SELECT COUNT(*) FROM todos WHERE user_key = $1 AND completed", user_key
+        )
+        assert completed == 1
+
+    @pytest.mark.asyncio
+    async def test_import_todos_csv(self, auth_client, db_conn):
+        """Test importing todos from CSV including a multi-line field"""
+        user_key = auth_client.session.headers["User-Key"]
+        await PriorityFactory.create_priority(db_conn, user_key, name="High", order=1)
+        await StatusFactory.create_status(db_conn, user_key, name="Todo", order=1)
+        body = (
+            "title,description,priority,status,completed\n"
+            "Buy milk,,High,Todo,false\n"
+            'Write report,"first line\nsecond line",High,Todo,true\n'
+        )
+
+        response = await auth_client.post(
+            "/api/v1/todos/import", data=body, headers={"Content-Type": "text/csv"}
+        )
+        assert response.status == 201
+        data = await response.json()
+        assert data["imported"] == 2
+
+        description = await db_conn.fetchval(
+            "SELECT description FROM todos WHERE title = 'Write report'"
+        )
+        assert description == "first line\nsecond line"
+
+    @pytest.mark.asyncio
+    async def test_import_todos_invalid_line_rolls_back(self, auth_client, db_conn):
+        """Test that one invalid line aborts the whole import"""
+        user_key = auth_client.session.headers["User-Key"]
+        await PriorityFactory.create_priority(db_conn, user_key, name="High", order=1)
+        await StatusFactory.create_status(db_conn, user_key, name="Todo", order=1)
+        body = (
+            json.dumps({"title": "Fine", "priority": "High", "status": "Todo"})
+            + "\n"
+            + json.dumps({"title": "Bad", "priority": "Missing", "status": "Todo"})
+            + "\n"
+        )
+
+        response = await auth_client.post(
+            "/api/v1/todos/import",
+            data=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status == 422
+        data = await response.json()
+        assert data["error"]["message"] == "Line 2: Priority not found"
+
+        count = await db_conn.fetchval(
+            "SELECT COUNT(*) FROM todos WHERE user_key = $1", user_key
+        )
+        assert count == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "row, message",
+        [
+            ({"title": " "}, "Line 1: Title is required"),
+            ({"title": None}, "Line 1: Title is required"),
+            ({"title": "x" * 101}, "Line 1: Title must be less than 100 characters"),
+            (
+                {"title": "Fine", "description": "x" * 1001},
+                "Line 1: Description must be less than 1000 characters",
+            ),
+        ],
+    )
+    async def test_import_todos_field_rules(self, auth_client, db_conn, row, message):
+        """Test that imported rows follow the same rules as created todos"""
+        user_key = auth_client.session.headers["User-Key"]
+        await PriorityFactory.create_priority(db_conn, user_key, name="High", order=1)
+        await StatusFactory.create_status(db_conn, user_key, name="Todo", order=1)
+        body = json.dumps({**row, "priority": "High", "status": "Todo"}) + "\n"
+
+        response = await auth_client.post(
+            "/api/v1/todos/import",
+            data=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status == 422
+        data = await response.json()
+        assert data["error"]["message"] == message
+
+    @pytest.mark.asyncio
+    async def test_import_todos_unsupported_content_type(self, auth_client):
+        """Test that a JSON body is rejected for imports"""
+        response = await auth_client.post("/api/v1/todos/import", json=[])
+        assert response.status == 422
+
+
+class TestTodoSortKeys:
+    @pytest.mark.asyncio
+    async def test_priority_sort_follows_reorder(self, auth_client, db_conn):
+        """Test that priority sorting follows priority reorders and reassignment"""
+        user_key = auth_client.session.headers["User-Key"]
+        high = await PriorityFactory.create_priority(
+            db_conn, user_key, name="High", order=1
+        )
+        low = await PriorityFactory.create_priority(
+            db_conn, user_key, name="Low", order=2
+        )
+        status = await StatusFactory.create_status(
+            db_conn, user_key, name="Status 1", order=1
+        )
+        await TodoFactory.create_todo(
+            db_conn, user_key, high["key"], status["key"], title="High task"
+        )
+        low_todo = await TodoFactory.create_todo(
+            db_conn, user_key, low["key"], status["key"], title="Low task"
+        )
+
+        response = await auth_client.get("/api/v1/todos?sort=priority-desc")
+        data = await response.json()
+        assert [t["title"] for t in data["todos"]] == ["High task", "Low task"]
+
+        # Moving "Low" to the top must be reflected in the todo sort
+        response = await auth_client.patch(
+            f"/api/v1/priority/{low['key']}/reorder",
+            json={"fromOrder": 2, "toOrder": 1},
+        )
+        assert response.status == 200
+        response = await auth_client.get("/api/v1/todos?sort=priority-desc")
+        data = await response.json()
+        assert [t["title"] for t in data["todos"]] == ["Low task", "High task"]
+
+        # Reassigning the todo must pick up the new priority's rank
+        response = await auth_client.patch(
+            f"/api/v1/todo/{low_todo['key']}", json={"priority": high["key"]}
+        )
+        assert response.status == 200
+        priority_order = await db_conn.fetchval(
+            "SELECT priority_order FROM todos WHERE key = $1", low_todo["key"]
+        )
+        assert priority_order == await db_conn.fetchval(
+            "SELECT rank FROM priorities WHERE key = $1", high["key"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_status_sort_without_status_filter(self, auth_client, db_conn):
+        """Test sorting by status order without filtering on a status"""
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(
+            db_conn, user_key, name="High", order=1
+        )
+        first = await StatusFactory.create_status(
+            db_conn, user_key, name="First", order=1
+        )
+        second = await StatusFactory.create_status(
+            db_conn, user_key, name="Second", order=2
+        )
+        await TodoFactory.create_todo(
+            db_conn, user_key, priority["key"], second["key"], title="Second"
+        )
+        await TodoFactory.create_todo(
+            db_conn, user_key, priority["key"], first["key"], title="First"
+        )
+
+        response = await auth_client.get("/api/v1/todos?sort=status-desc")
+        assert response.status == 200
+        data = await response.json()
+        assert [t["title"] for t in data["todos"]] == ["First", "Second"]
+
+        response = await auth_client.get("/api/v1/todos?sort=status-asc")
+        data = await response.json()
+        assert [t["title"] for t in data["todos"]] == ["Second", "First"]
+
+
+class TestTodoStats:
+    async def _setup(self, auth_client, db_conn):
+        user_key = auth_client.session.headers["User-Key"]
+        high = await PriorityFactory.create_priority(
+            db_conn, user_key, name="High", order=1
+        )
+        low = await PriorityFactory.create_priority(
+            db_conn, user_key, name="Low", order=2
+        )
+        todo = await StatusFactory.create_status(
+            db_conn, user_key, name="Todo", order=1
+        )
+        done = await StatusFactory.create_status(
+            db_conn, user_key, name="Done", order=2
+        )
+        await StatusFactory.create_status(db_conn, user_key, name="Empty", order=3)
+        for completed in (False, False, True):
+            await TodoFactory.create_todo(
+                db_conn, user_key, high["key"], todo["key"], completed=completed
+            )
+        await TodoFactory.create_todo(
+            db_conn, user_key, low["key"], done["key"], completed=True
+        )
+        return high, low, todo, done
+
+    @staticmethod
+    def _counts(buckets):
+        return {b["name"]: b["count"] for b in buckets}
+
+    @pytest.mark.asyncio
+    async def test_get_todo_stats(self, auth_client, db_conn):
+        """Test counts by status, priority and completion"""
+        await self._setup(auth_client, db_conn)
+
+        response = await auth_client.get("/api/v1/todos/stats")
+        assert response.status == 200
+        data = await response.json()
+        assert data["total"] == 4
+        assert data["completed"] == 2
+        assert data["open"] == 2
+        assert self._counts(data["by_status"]) == {"Todo": 3, "Done": 1, "Empty": 0}
+        assert [b["name"] for b in data["by_status"]] == ["Todo", "Done", "Empty"]
+        assert self._counts(data["by_priority"]) == {"High": 3, "Low": 1}
+
+    @pytest.mark.asyncio
+    async def test_stats_follow_writes(self, auth_client, db_conn):
+        """Test that counters follow single, bulk and imported writes"""
+        high, low, todo, done = await self._setup(auth_client, db_conn)
+
+        # Reassign every "Todo" todo to "Done" and mark them completed
+        response = await auth_client.patch(
+            f"/api/v1/todos?status={todo['key']}",
+            json={"status": done["key"], "completed": True},
+        )
+        assert response.status == 200
+
+        # Import one open todo and delete all "Low" todos
+        response = await auth_client.post(
+            "/api/v1/todos/import",
+            data=json.dumps({"title": "Imported", "priority": "Low", "status": "Todo"}),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status == 201
+        response = await auth_client.delete(f"/api/v1/todos?priority={low['key']}")
+        assert response.status == 200
+
+        response = await auth_client.get("/api/v1/todos/stats")
+        data = await response.json()
+        assert data["total"] == 3
+        assert data["completed"] == 3
+        assert data["open"] == 0
+        assert self._counts(data["by_status"]) == {"Todo": 0, "Done": 3, "Empty": 0}
+        assert self._counts(data["by_priority"]) == {"High": 3, "Low": 0}
+
+        response = await auth_client.get("/api/v1/todos")
+        assert (await response.json())["total"] == 3
+
+    @pytest.mark.asyncio
+    async def test_stats_without_todos(self, auth_client):
+        """Test stats for a user without any todos"""
+        response = await auth_client.get("/api/v1/todos/stats")
+        assert response.status == 200
+        data = await response.json()
+        assert data["total"] == 0
+        assert data["by_status"] == []
+        assert data["by_priority"] == []
+
+
+class TestTodoChanges:
+    async def _setup(self, auth_client, db_conn):
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+        status = await StatusFactory.create_status(db_conn, user_key, order=1)
+        todos = [
+            await TodoFactory.create_todo(
+                db_conn, user_key, priority["key"], status["key"], title=f"Todo {i}"
+            )
+            for i in range(3)
+        ]
+        return priority, status, todos
+
+    @pytest.mark.asyncio
+    async def test_full_sync_without_token(self, auth_client, db_conn):
+        """Test that a missing token returns every todo in change order"""
+        _, _, todos = await self._setup(auth_client, db_conn)
+
+        response = await auth_client.get("/api/v1/todos/changes")
+        assert response.status == 200
+        data = await response.json()
+        assert [t["key"] for t in data["changed"]] == [t["key"] for t in todos]
+        assert data["deleted"] == []
+        assert data["has_more"] is False
+        assert data["next_token"].isdigit()
+
+    @pytest.mark.asyncio
+    async def test_changes_since_token(self, auth_client, db_conn):
+        """Test that only rows changed or deleted after the token are returned"""
+        _, _, todos = await self._setup(auth_client, db_conn)
+        response = await auth_client.get("/api/v1/todos/changes")
+        token = (await response.json())["next_token"]
+
+        response = await auth_client.patch(
+            f"/api/v1/todo/{todos[1]['key']}", json={"completed": True}
+        )
+        assert response.status == 200
+        response = await auth_client.delete(f"/api/v1/todo/{todos[2]['key']}")
+        assert response.status == 204
+
+        response = await auth_client.get(f"/api/v1/todos/changes?since={token}")
+        data = await response.json()
+        assert [t["key"] for t in data["changed"]] == [todos[1]["key"]]
+        assert data["changed"][0]["completed"] is True
+        assert data["changed"][0]["updated_at"] is not None
+        assert [d["key"] for d in data["deleted"]] == [todos[2]["key"]]
+
+        # Nothing new since the last token
+        response = await auth_client.get(
+            f"/api/v1/todos/changes?since={data['next_token']}"
+        )
+        data = await response.json()
+        assert data["changed"] == []
+        assert data["deleted"] == []
+
+    @pytest.mark.asyncio
+    async def test_changes_are_paged_by_sequence(self, auth_client, db_conn):
+        """Test that following next_token walks every change exactly once"""
+        _, _, todos = await self._setup(auth_client, db_conn)
+        await auth_client.delete(f"/api/v1/todo/{todos[0]['key']}")
+
+        seen, token, pages = [], "", 0
+        while True:
+            response = await auth_client.get(
+                f"/api/v1/todos/changes?since={token}&size=1"
+            )
+            data = await response.json()
+            assert len(data["changed"]) + len(data["deleted"]) == 1
+            seen += [("changed", t["key"]) for t in data["changed"]]
+            seen += [("deleted", d["key"]) for d in data["deleted"]]
+            token, pages = data["next_token"], pages + 1
+            if not data["has_more"]:
+                break
+
+        assert pages == 3
+        assert seen == [
+            ("changed", todos[1]["key"]),
+            ("changed", todos[2]["key"]),
+            ("deleted", todos[0]["key"]),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_changes_are_scoped_to_user(self, auth_client, db_conn):
+        """Test that other users' changes and deletes are not returned"""
+        other = await UserFactory.create_user(db_conn, username="other_user")
+        priority = await PriorityFactory.create_priority(db_conn, other["key"], order=1)
+        status = await StatusFactory.create_status(db_conn, other["key"], order=1)
+        todo = await TodoFactory.create_todo(
+            db_conn, other["key"], priority["key"], status["key"]
+        )
+        await db_conn.execute("DELETE FROM todos WHERE key = $1", todo["key"])
+
+        response = await auth_client.get("/api/v1/todos/changes")
+        data = await response.json()
+        assert data["changed"] == []
+        assert data["deleted"] == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("token", ["abc", "-1", "\u00b2", str(2**63)])
+    async def test_invalid_token(self, auth_client, token):
+        """Test that a malformed token is rejected"""
+        response = await auth_client.get(
+            "/api/v1/todos/changes", params={"since": token}
+        )
+        assert response.status == 422
+        data = await response.json()
+        assert data["error"]["message"] == "Invalid sync token"
+
+    @pytest.mark.asyncio
+    async def test_update_sets_updated_at(self, auth_client, db_conn):
+        """Test that raw UPDATEs set updated_at on todos"""
+        _, _, todos = await self._setup(auth_client, db_conn)
+        assert todos[0]["updated_at"] is None
+
+        response = await auth_client.patch(
+            f"/api/v1/todo/{todos[0]['key']}", json={"title": "Renamed"}
+        )
+        data = await response.json()
+        assert data["updated_at"] is not None
+
+
+class TestTodoFields:
+    @pytest.mark.asyncio
+    async def test_list_with_fields(self, auth_client, db_conn):
+        """Test that fields= narrows the list to the requested fields"""
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+        status = await StatusFactory.create_status(db_conn, user_key, order=1)
+        todo = await TodoFactory.create_todo(
+            db_conn, user_key, priority["key"], status["key"], completed=True
+        )
+
+        response = await auth_client.get("/api/v1/todos?fields=title,completed")
+        assert response.status == 200
+        data = await response.json()
+        assert data["todos"] == [
+            {"key": todo["key"], "title": todo["title"], "completed": True}
+        ]
+        assert data["total"] == 1
+
+        # Sorting and filtering still work on columns that aren't selected
+        response = await auth_client.get(
+            f"/api/v1/todos?fields=title&sort=priority-desc&status={status['key']}"
+        )
+        assert (await response.json())["todos"][0]["key"] == todo["key"]
+
+    @pytest.mark.asyncio
+    async def test_detail_with_fields(self, auth_client, db_conn):
+        """Test that fields= narrows a single todo and formats dates"""
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+        status = await StatusFactory.create_status(db_conn, user_key, order=1)
+        todo = await TodoFactory.create_todo(
+            db_conn, user_key, priority["key"], status["key"]
+        )
+
+        response = await auth_client.get(
+            f"/api/v1/todo/{todo['key']}?fields=created_at, priority"
+        )
+        assert response.status == 200
+        data = await response.json()
+        assert data == {
+            "key": todo["key"],
+            "created_at": todo["created_at"].isoformat(),
+            "priority": priority["key"],
+        }
+
+    @pytest.mark.asyncio
+    async def test_fields_are_whitelisted(self, auth_client):
+        """Test that internal columns and SQL cannot be requested"""
+        for fields in ("priority_order", 'title" FROM users --'):
+            response = await auth_client.get(f"/api/v1/todos?fields={fields}")
+            assert response.status == 422
+
+
+class TestTodoLookup:
+    async def _setup(self, auth_client, db_conn, count=3):
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+        status = await StatusFactory.create_status(db_conn, user_key, order=1)
+        return [
+            await TodoFactory.create_todo(
+                db_conn, user_key, priority["key"], status["key"], title=f"Todo {i}"
+            )
+            for i in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_by_keys_in_input_order(self, auth_client, db_conn):
+        """Test that ?keys= returns todos in the requested order"""
+        todos = await self._setup(auth_client, db_conn)
+        keys = [todos[2]["key"], "missing-key", todos[0]["key"], todos[2]["key"]]
+
+        response = await auth_client.get(f"/api/v1/todos?keys={','.join(keys)}")
+        assert response.status == 200
+        data = await response.json()
+        assert [t["key"] for t in data["todos"]] == [todos[2]["key"], todos[0]["key"]]
+        assert data["todos"][0]["title"] == "Todo 2"
+        assert data["missing"] == ["missing-key"]
+
+    @pytest.mark.asyncio
+    async def test_get_by_keys_with_fields(self, auth_client, db_conn):
+        """Test that ?keys= combines with fields="""
+        todos = await self._setup(auth_client, db_conn, count=1)
+        response = await auth_client.get(
+            f"/api/v1/todos?keys={todos[0]['key']}&fields=title"
+        )
+        data = await response.json()
+        assert data["todos"] == [{"key": todos[0]["key"], "title": "Todo 0"}]
+
+    @pytest.mark.asyncio
+    async def test_other_users_todos_are_missing(self, auth_client, db_conn):
+        """Test that keys of other users' todos are reported as missing"""
+        other = await UserFactory.create_user(db_conn, username="other_user")
+        priority = await PriorityFactory.create_priority(db_conn, other["key"], order=1)
+        status = await StatusFactory.create_status(db_conn, other["key"], order=1)
+        todo = await TodoFactory.create_todo(
+            db_conn, other["key"], priority["key"], status["key"]
+        )
+
+        response = await auth_client.get(f"/api/v1/todos?keys={todo['key']}")
+        data = await response.json()
+        assert data["todos"] == []
+        assert data["missing"] == [todo["key"]]
+
+    @pytest.mark.asyncio
+    async def test_post_lookup(self, auth_client, db_conn):
+        """Test the POST variant for long key lists"""
+        todos = await self._setup(auth_client, db_conn)
+        keys = [t["key"] for t in reversed(todos)]
+
+        response = await auth_client.post("/api/v1/todos/lookup", json={"keys": keys})
+        assert response.status == 200
+        data = await response.json()
+        assert [t["key"] for t in data["todos"]] == keys
+        assert data["missing"] == []
+
+    @pytest.mark.asyncio
+    async def test_lookup_validation(self, auth_client):
+        """Test that empty and oversized key lists are rejected"""
+        response = await auth_client.get("/api/v1/todos?keys=,")
+        assert response.status == 422
+
+        response = await auth_client.post("/api/v1/todos/lookup", json={"keys": []})
+        assert response.status == 422
+
+        keys = [f"key-{i}" for i in range(1001)]
+        response = await auth_client.post("/api/v1/todos/lookup", json={"keys": keys})
+        assert response.status == 422
+
+
+class TestTodoBoard:
+    async def _setup(self, auth_client, db_conn):
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+        todo_status = await StatusFactory.create_status(
+            db_conn, user_key, name="To do", order=1
+        )
+        done_status = await StatusFactory.create_status(
+            db_conn, user_key, name="Done", order=2
+        )
+        empty_status = await StatusFactory.create_status(
+            db_conn, user_key, name="Later", order=3
+        )
+        for i in range(3):
+            await TodoFactory.create_todo(
+                db_conn, user_key, priority["key"], todo_status["key"], title=f"T{i}"
+            )
+        await TodoFactory.create_todo(
+            db_conn, user_key, priority["key"], done_status["key"], title="D0"
+        )
+        return todo_status, done_status, empty_status
+
+    @pytest.mark.asyncio
+    async def test_board_groups_by_status(self, auth_client, db_conn):
+        """Test that every status is a column with its todos and count"""
+        todo_status, done_status, empty_status = await self._setup(auth_client, db_conn)
+
+        response = await auth_client.get("/api/v1/todos/board?sort=text-asc&size=2")
+        assert response.status == 200
+        columns = (await response.json())["columns"]
+        assert [c["status"]["key"] for c in columns] == [
+            todo_status["key"],
+            done_status["key"],
+            empty_status["key"],
+        ]
+        assert [t["title"] for t in columns[0]["todos"]] == ["T0", "T1"]
+        assert [c["count"] for c in columns] == [3, 1, 0]
+        assert columns[0]["next_cursor"] is not None
+        assert columns[1]["next_cursor"] is None
+        assert columns[2]["todos"] == []
+
+    @pytest.mark.asyncio
+    async def test_board_cursor_loads_more(self, auth_client, db_conn):
+        """Test that a column's cursor continues after its last todo"""
+        todo_status, _, _ = await self._setup(auth_client, db_conn)
+        url = f"/api/v1/todos/board?sort=text-asc&size=2&status={todo_status['key']}"
+
+        first = (await (await auth_client.get(url)).json())["columns"]
+        assert len(first) == 1
+        response = await auth_client.get(f"{url}&cursor={first[0]['next_cursor']}")
+        assert response.status == 200
+        column = (await response.json())["columns"][0]
+        assert [t["title"] for t in column["todos"]] == ["T2"]
+        assert column["count"] == 3
+        assert column["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_board_fields(self, auth_client, db_conn):
+        """Test that fields= narrows the todos but not the cursor"""
+        await self._setup(auth_client, db_conn)
+
+        response = await auth_client.get("/api/v1/todos/board?size=1&fields=title")
+        column = (await response.json())["columns"][0]
+        assert list(column["todos"][0]) == ["key", "title"]
+        assert column["next_cursor"] is not None
+
+    @pytest.mark.asyncio
+    async def test_board_invalid_cursor(self, auth_client, db_conn):
+        """Test that cursors must decode and need a status"""
+        todo_status, _, _ = await self._setup(auth_client, db_conn)
+
+        response = await auth_client.get("/api/v1/todos/board?cursor=abc")
+        assert response.status == 422
+
+        response = await auth_client.get(
+            f"/api/v1/todos/board?status={todo_status['key']}&cursor=WyJ4Il0"
+        )
+        assert response.status == 422
+        data = await response.json()
+        assert data["error"]["message"] == "Invalid cursor"
+
+
+class TestTodoPartitions:
+    @pytest.mark.asyncio
+    async def test_user_queries_scan_one_partition(self, auth_client, db_conn):
+        """Test that a user's todos share a partition and queries prune to it"""
+        user_key = auth_client.session.headers["User-Key"]
+        priority = await PriorityFactory.create_priority(db_conn, user_key, order=1)
+        status = await StatusFactory.create_status(db_conn, user_key, order=1)
+        for i in range(3):
+            await TodoFactory.create_todo(
+                db_conn, user_key, priority["key"], status["key"], title=f"Todo {i}"
+            )
+
+        partitions = await db_conn.fetch(
+            "SELECT DISTINCT t.tableoid::regclass::text AS name FROM todos t"
+        )
+        assert len(partitions) == 1
+        plan = await db_conn.fetchval(
+            """
+            EXPLAIN (FORMAT JSON)
+            SELECT t.* FROM todos t
+            WHERE t.user_key = $1
+            ORDER BY t.priority_order, t.id DESC
+            """,
+            user_key,
+        )
+        scanned = set(re.findall(r'"Relation Name": "(todos_p\d+)"', plan))
+        assert scanned == {partitions[0]["name"]}
@@ -53,6 +53,21 @@ class TestGetUsers:
         data = await response.json()
         assert data["detail"] == "Missing or invalid token"
 
+    @pytest.mark.asyncio
+    async def test_get_users_with_fields(self, auth_client):
+        """Test that fields= narrows users to the requested fields"""
+        response = await auth_client.get("/api/v1/users?fields=username,created_at")
+        assert response.status == 200
+        data = await response.json()
+        assert set(data["users"][0]) == {"key", "username", "created_at"}
+        assert data["users"][0]["username"] == "authenticated_user"
+
+    @pytest.mark.asyncio
+    async def test_get_users_cannot_select_password(self, auth_client):
+        """Test that columns outside the whitelist cannot be selected"""
+        response = await auth_client.get("/api/v1/users?fields=hashed_password")
+        assert response.status == 422
+
 
 class TestCreateUser:
     @pytest.mark.asyncio
@@ -146,6 +161,22 @@ class TestCreateValidateUser:
         data = await response.json()
         assert data["error"]["code"] == "validation_error"
 
+    @pytest.mark.asyncio
+    async def test_create_user_password_without_number(self, auth_client):
+        """Test creating a user with a password without a number"""
+        invalid_data = {
+            "name": "Test User",
+            "username": "testuser",
+            "email": "test@example.com",
+            "password": "Securepassword",
+            "is_active": True,
+        }
+        response = await auth_client.post("/api/v1/users", json=invalid_data)
+        assert response.status == 422
+        data = await response.json()
+        assert data["error"]["code"] == "validation_error"
+        assert data["error"]["message"] == "Password must contain at least one number"
+
     @pytest.mark.asyncio
     async def test_create_user_duplicate_username(self, auth_client, db_conn):
         """Test creating a user with duplicate username"""